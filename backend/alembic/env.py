@@ -11,7 +11,10 @@ import app.models  # noqa: F401
 
 config = context.config
 
-if config.config_file_name is not None:
+# Tests hand over an already open connection and keep their own logging setup.
+provided_connection = config.attributes.get("connection")
+
+if config.config_file_name is not None and provided_connection is None:
     fileConfig(config.config_file_name)
 
 config.set_main_option("sqlalchemy.url", get_settings().database_url)
@@ -34,6 +37,12 @@ def run_migrations_offline() -> None:
 
 
 def run_migrations_online() -> None:
+    if provided_connection is not None:
+        context.configure(connection=provided_connection, target_metadata=target_metadata, compare_type=True)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
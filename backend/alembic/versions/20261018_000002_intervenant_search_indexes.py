@@ -0,0 +1,61 @@
+"""Trigram indexes for intervenant search and competence filters."""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_000002"
+down_revision: Union[str, Sequence[str], None] = "20260224_000001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # array_to_string/concat_ws are only STABLE, so they are wrapped in IMMUTABLE
+    # functions to be usable in expression indexes.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION intervenant_search_text(
+            nom varchar,
+            disponibilite disponibilite_enum,
+            competences varchar[]
+        ) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$
+            SELECT lower(concat_ws(' ', nom, disponibilite::text, NULLIF(array_to_string(competences, ' '), '')))
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION intervenant_competences_text(competences varchar[]) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$
+            SELECT lower(array_to_string(competences, E'\\x1f'))
+        $$
+        """
+    )
+
+    op.create_index(
+        "ix_intervenants_search_trgm",
+        "intervenants",
+        [sa.text("intervenant_search_text(nom, disponibilite, competences) gin_trgm_ops")],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_intervenants_competences_trgm",
+        "intervenants",
+        [sa.text("intervenant_competences_text(competences) gin_trgm_ops")],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_intervenants_competences_trgm", table_name="intervenants")
+    op.drop_index("ix_intervenants_search_trgm", table_name="intervenants")
+    op.execute("DROP FUNCTION IF EXISTS intervenant_competences_text(varchar[])")
+    op.execute("DROP FUNCTION IF EXISTS intervenant_search_text(varchar, disponibilite_enum, varchar[])")
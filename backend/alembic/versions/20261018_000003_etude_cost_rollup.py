@@ -0,0 +1,39 @@
+"""Materialized per-etude cost rollup."""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_000003"
+down_revision: Union[str, Sequence[str], None] = "20261018_000002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "etude_cost_rollup",
+        sa.Column("etude_id", sa.Integer(), primary_key=True),
+        sa.Column("total_jeh", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("cout_total", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["etude_id"], ["etudes.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_affectations_etude_id", "affectations", ["etude_id"], unique=False)
+
+    op.execute(
+        """
+        INSERT INTO etude_cost_rollup (etude_id, total_jeh, cout_total)
+        SELECT a.etude_id, SUM(a.jeh), SUM(a.jeh * i.tjm)
+        FROM affectations a
+        JOIN intervenants i ON i.id = a.intervenant_id
+        GROUP BY a.etude_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_affectations_etude_id", table_name="affectations")
+    op.drop_table("etude_cost_rollup")
@@ -0,0 +1,35 @@
+"""Unique intervenant email, case-insensitive, used as the upsert key of CSV imports."""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_000004"
+down_revision: Union[str, Sequence[str], None] = "20261018_000003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT lower(email) AS email, array_agg(id ORDER BY id) AS ids
+            FROM intervenants
+            WHERE email IS NOT NULL
+            GROUP BY lower(email)
+            HAVING count(*) > 1
+            ORDER BY lower(email)
+            """
+        )
+    ).all()
+    if duplicates:
+        listing = "; ".join(f"{row.email} (ids {', '.join(map(str, row.ids))})" for row in duplicates)
+        raise RuntimeError(f"Emails d'intervenants en double, a fusionner avant la migration: {listing}")
+    op.create_index("uq_intervenants_email", "intervenants", [sa.text("lower(email)")], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("uq_intervenants_email", table_name="intervenants")
@@ -0,0 +1,70 @@
+"""Ranked full-text and fuzzy intervenant search."""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_000005"
+down_revision: Union[str, Sequence[str], None] = "20261018_000004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE TEXT SEARCH CONFIGURATION french_unaccent (COPY = french)")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION french_unaccent "
+        "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem"
+    )
+
+    # Generated columns and expression indexes only accept IMMUTABLE expressions;
+    # unaccent(), array_to_string() and the enum cast are STABLE, hence the wrappers.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION intervenant_name_key(nom varchar) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$
+            SELECT lower(public.unaccent('public.unaccent'::regdictionary, nom))
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION intervenant_search_document(
+            nom varchar,
+            competences varchar[],
+            disponibilite disponibilite_enum
+        ) RETURNS tsvector
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$
+            SELECT setweight(to_tsvector('french_unaccent'::regconfig, coalesce(nom, '')), 'A')
+                || setweight(to_tsvector('french_unaccent'::regconfig, array_to_string(competences, ' ')), 'B')
+                || setweight(to_tsvector('french_unaccent'::regconfig, disponibilite::text), 'C')
+        $$
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE intervenants ADD COLUMN search_document tsvector
+        GENERATED ALWAYS AS (intervenant_search_document(nom, competences, disponibilite)) STORED
+        """
+    )
+    op.create_index("ix_intervenants_search_document", "intervenants", ["search_document"], postgresql_using="gin")
+    op.create_index(
+        "ix_intervenants_name_key_trgm",
+        "intervenants",
+        [sa.text("intervenant_name_key(nom) gin_trgm_ops")],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_intervenants_name_key_trgm", table_name="intervenants")
+    op.drop_index("ix_intervenants_search_document", table_name="intervenants")
+    op.drop_column("intervenants", "search_document")
+    op.execute("DROP FUNCTION IF EXISTS intervenant_search_document(varchar, varchar[], disponibilite_enum)")
+    op.execute("DROP FUNCTION IF EXISTS intervenant_name_key(varchar)")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS french_unaccent")
@@ -0,0 +1,41 @@
+"""Availability calendar: non-overlapping date ranges per intervenant."""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_000006"
+down_revision: Union[str, Sequence[str], None] = "20261018_000005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # btree_gist provides the GiST "=" operator on integers used by the exclusion constraint.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_table(
+        "periodes_disponibilite",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("intervenant_id", sa.Integer(), nullable=False),
+        sa.Column("periode", postgresql.DATERANGE(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["intervenant_id"], ["intervenants.id"], ondelete="CASCADE"),
+        postgresql.ExcludeConstraint(
+            (sa.column("intervenant_id"), "="),
+            (sa.column("periode"), "&&"),
+            name="ex_periodes_disponibilite_overlap",
+            using="gist",
+        ),
+    )
+    op.create_index(
+        "ix_periodes_disponibilite_periode", "periodes_disponibilite", ["periode"], postgresql_using="gist"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_periodes_disponibilite_periode", table_name="periodes_disponibilite")
+    op.drop_table("periodes_disponibilite")
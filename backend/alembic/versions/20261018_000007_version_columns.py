@@ -0,0 +1,24 @@
+"""Version counters for optimistic locking of intervenants, etudes and affectations."""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_000007"
+down_revision: Union[str, Sequence[str], None] = "20261018_000006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("intervenants", "etudes", "affectations")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column("version_id", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_column(table, "version_id")
@@ -0,0 +1,32 @@
+"""Append-only change log feeding GET /changes."""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_000008"
+down_revision: Union[str, Sequence[str], None] = "20261018_000007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "change_log",
+        sa.Column("seq", sa.BigInteger(), sa.Identity(always=True), primary_key=True),
+        sa.Column("entity", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("operation", sa.String(length=16), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint(
+            "entity IN ('intervenant', 'etude', 'affectation', 'periode_disponibilite')",
+            name="ck_change_log_entity",
+        ),
+        sa.CheckConstraint("operation IN ('insert', 'update', 'delete')", name="ck_change_log_operation"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("change_log")
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+
+from app.api.fast_json import dump_model_json
+from app.core import cache as cache_module
+from app.core.config import get_settings
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def version_etag(version_id: int) -> str:
+    return f'"{version_id}"'
+
+
+def if_match_versions(request: Request) -> set[int] | None:
+    header = request.headers.get("if-match")
+    if not header or header.strip() == "*":
+        return None
+    # If-Match uses the strong comparison, so weak validators never match.
+    versions = set()
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if len(candidate) > 2 and candidate[0] == candidate[-1] == '"' and candidate[1:-1].isdigit():
+            versions.add(int(candidate[1:-1]))
+    return versions
+
+
+def json_response_with_etag(request: Request, body: bytes) -> Response:
+    etag = compute_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def cached_json_response(
+    request: Request,
+    key: str,
+    adapter: TypeAdapter,
+    load: Callable[[], Awaitable[Any]],
+) -> Response:
+    body = cache_module.cache.get(key)
+    if body is None:
+        generation = cache_module.generation()
+        body = await run_in_threadpool(dump_model_json, adapter, await load())
+        cache_module.set_unless_invalidated(key, body, get_settings().cache_ttl_seconds, generation)
+    return json_response_with_etag(request, body)
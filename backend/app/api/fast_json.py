@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Sequence
+from datetime import date
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Row
+from sqlalchemy.orm import DeclarativeBase
+from starlette.concurrency import run_in_threadpool
+
+from app.core.pagination import Page
+
+
+def _default(value: object) -> str:
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Type non serialisable: {type(value).__name__}")
+
+
+def dumps(content: object) -> bytes:
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default).encode()
+
+
+def dump_model_json(adapter: TypeAdapter, content: object) -> bytes:
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+
+
+async def json_response(adapter: TypeAdapter, build: Callable[[], object], *, status_code: int = 200) -> Response:
+    # FastAPI validates the response_model of coroutine endpoints on the event
+    # loop; large payloads are built, validated and dumped in the threadpool instead.
+    body = await run_in_threadpool(lambda: dump_model_json(adapter, build()))
+    return Response(content=body, media_type="application/json", status_code=status_code)
+
+
+async def _dumps_response(build: Callable[[], object]) -> Response:
+    return Response(content=await run_in_threadpool(lambda: dumps(build())), media_type="application/json")
+
+
+class RowSerializer:
+    # Values read back from the database were normalized by the schemas on write, so
+    # list endpoints select exactly the columns of the read schema and dump the rows
+    # as they are, in the schema's field order and with its camelCase aliases.
+    def __init__(self, schema: type[BaseModel], model: type[DeclarativeBase]):
+        names = list(schema.model_fields)
+        self.keys = [schema.model_fields[name].alias or name for name in names]
+        self.columns = [getattr(model, name) for name in names]
+
+    def to_dicts(self, rows: Sequence[Row]) -> list[dict]:
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
+
+    async def response(self, rows: Sequence[Row]) -> Response:
+        return await _dumps_response(lambda: self.to_dicts(rows))
+
+    async def page_response(self, page: Page[Row]) -> Response:
+        return await _dumps_response(lambda: {"items": self.to_dicts(page.items), "nextCursor": page.next_cursor})
@@ -2,42 +2,94 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Response, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from pydantic import TypeAdapter
 
-from app.core.database import get_db
-from app.schemas.affectation import AffectationCreate, AffectationRead, AffectationUpdate
+from app.api.caching import if_match_versions, version_etag
+from app.api.fast_json import RowSerializer, json_response
+from app.core.database import Database, get_database
+from app.core.pagination import MAX_PAGE_SIZE
+from app.models import Affectation
+from app.schemas.affectation import (
+    AffectationBulkCreate,
+    AffectationBulkError,
+    AffectationBulkResult,
+    AffectationCreate,
+    AffectationRead,
+    AffectationUpdate,
+)
+from app.schemas.common import CursorPage
 from app.services import affectations as affectation_service
 
 router = APIRouter(prefix="/affectations", tags=["affectations"])
-DbSession = Annotated[Session, Depends(get_db)]
+Db = Annotated[Database, Depends(get_database)]
+AffectationRows = RowSerializer(AffectationRead, Affectation)
+BulkResult = TypeAdapter(AffectationBulkResult)
 
 
-@router.get("", response_model=list[AffectationRead])
-def list_affectations(db: DbSession):
-    return affectation_service.list_affectations(db)
+@router.get("", response_model=list[AffectationRead] | CursorPage[AffectationRead])
+async def list_affectations(
+    db: Db,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Annotated[str | None, Query()] = None,
+):
+    if limit is None:
+        rows = await db.run(affectation_service.list_affectations, columns=AffectationRows.columns)
+        return await AffectationRows.response(rows)
+    page = await db.run(
+        affectation_service.list_affectations_page, limit=limit, cursor=cursor, columns=AffectationRows.columns
+    )
+    return await AffectationRows.page_response(page)
 
 
 @router.get("/{affectation_id}", response_model=AffectationRead)
-def get_affectation(affectation_id: int, db: DbSession):
-    return affectation_service.get_affectation_or_404(db, affectation_id)
+async def get_affectation(affectation_id: int, response: Response, db: Db):
+    affectation = await db.run(affectation_service.get_affectation_or_404, affectation_id)
+    response.headers["ETag"] = version_etag(affectation.version_id)
+    return affectation
 
 
 @router.post("", response_model=AffectationRead, status_code=status.HTTP_201_CREATED)
-def create_affectation(payload: AffectationCreate, db: DbSession):
-    return affectation_service.create_affectation(db, payload.model_dump(by_alias=False))
+async def create_affectation(payload: AffectationCreate, db: Db):
+    return await db.run(affectation_service.create_affectation, payload.model_dump(by_alias=False))
+
+
+@router.post("/bulk", response_model=AffectationBulkResult)
+async def create_affectations_bulk(payload: AffectationBulkCreate, db: Db):
+    created, errors = await db.run(
+        affectation_service.create_affectations_bulk,
+        [item.model_dump(by_alias=False) for item in payload.items],
+    )
+    return await json_response(
+        BulkResult,
+        lambda: AffectationBulkResult(
+            created=created,
+            errors=[
+                AffectationBulkError(index=index, code=error.code, message=error.message) for index, error in errors
+            ],
+        ),
+    )
 
 
 @router.put("/{affectation_id}", response_model=AffectationRead)
-def update_affectation(affectation_id: int, payload: AffectationUpdate, db: DbSession):
-    return affectation_service.update_affectation(
-        db,
+async def update_affectation(
+    affectation_id: int,
+    payload: AffectationUpdate,
+    request: Request,
+    response: Response,
+    db: Db,
+):
+    affectation = await db.run(
+        affectation_service.update_affectation,
         affectation_id,
         payload.model_dump(exclude_unset=True, by_alias=False),
+        if_match=if_match_versions(request),
     )
+    response.headers["ETag"] = version_etag(affectation.version_id)
+    return affectation
 
 
 @router.delete("/{affectation_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_affectation(affectation_id: int, db: DbSession) -> Response:
-    affectation_service.delete_affectation(db, affectation_id)
+async def delete_affectation(affectation_id: int, db: Db) -> Response:
+    await db.run(affectation_service.delete_affectation, affectation_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
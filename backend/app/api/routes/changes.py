@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import TypeAdapter
+
+from app.api.fast_json import json_response
+from app.core.config import get_settings
+from app.core.database import Database, get_database
+from app.core.pagination import MAX_PAGE_SIZE
+from app.schemas.change import ChangeFeed, ChangeRead
+from app.services import changes as change_service
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+Db = Annotated[Database, Depends(get_database)]
+Feed = TypeAdapter(ChangeFeed)
+MAX_WAIT_SECONDS = 30.0
+
+
+@router.get("", response_model=ChangeFeed)
+async def list_changes(
+    db: Db,
+    since: Annotated[int | None, Query(ge=0)] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 100,
+    wait: Annotated[float, Query(ge=0, le=MAX_WAIT_SECONDS)] = 0,
+):
+    deadline = time.monotonic() + wait
+    while True:
+        changes, next_since = await db.run(change_service.list_changes, since=since, limit=limit)
+        remaining = deadline - time.monotonic()
+        if changes or since is None or remaining <= 0:
+            break
+        await asyncio.sleep(min(get_settings().changes_poll_interval_seconds, remaining))
+    return await json_response(
+        Feed,
+        lambda: ChangeFeed(
+            changes=[ChangeRead.model_validate(change, from_attributes=True) for change in changes],
+            next_since=next_since,
+        ),
+    )
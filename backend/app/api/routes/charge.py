@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import TypeAdapter
+
+from app.api.fast_json import json_response
+from app.core.database import Database, get_database
+from app.schemas.charge import IntervenantChargeRead
+from app.services import charge as charge_service
+
+router = APIRouter(prefix="/charge", tags=["charge"])
+Db = Annotated[Database, Depends(get_database)]
+ChargeList = TypeAdapter(list[IntervenantChargeRead])
+
+
+@router.get("/conflicts", response_model=list[IntervenantChargeRead])
+async def list_charge_conflicts(
+    db: Db,
+    date_debut: Annotated[date | None, Query(alias="dateDebut")] = None,
+    date_fin: Annotated[date | None, Query(alias="dateFin")] = None,
+):
+    conflicts = await db.run(charge_service.list_charge_conflicts, date_debut=date_debut, date_fin=date_fin)
+    return await json_response(ChargeList, lambda: conflicts)
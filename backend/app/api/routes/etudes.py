@@ -1,69 +1,247 @@
 from __future__ import annotations
 
+from datetime import date
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Response, status
-from sqlalchemy.orm import Session
-
-from app.core.database import get_db
-from app.schemas.affectation import AffectationLinkCreate, AffectationRead
-from app.schemas.etude import EtudeCoutTotalResponse, EtudeCreate, EtudeRead, EtudeUpdate
-from app.schemas.intervenant import IntervenantRead
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from pydantic import TypeAdapter
+
+from app.api.caching import cached_json_response, if_match_versions, version_etag
+from app.api.fast_json import RowSerializer, json_response
+from app.core.cache import etude_cout_total_key, etude_intervenants_key
+from app.core.database import Database, get_database
+from app.core.pagination import MAX_PAGE_SIZE
+from app.models import Etude
+from app.schemas.affectation import (
+    AffectationBulkError,
+    AffectationBulkLinkCreate,
+    AffectationBulkResult,
+    AffectationLinkCreate,
+    AffectationRead,
+)
+from app.schemas.common import CursorPage
+from app.schemas.disponibilite import EtudeIntervenantsLibres, IntervenantJoursLibres, IntervenantLibre
+from app.schemas.etude import (
+    EtudeCoutTotalResponse,
+    EtudeCreate,
+    EtudeDetail,
+    EtudeRead,
+    EtudeUpdate,
+)
+from app.schemas.intervenant import IntervenantRead, IntervenantRecommendation
 from app.services import affectations as affectation_service
+from app.services import disponibilites as disponibilite_service
 from app.services import etudes as etude_service
+from app.services import recommendations as recommendation_service
 
 router = APIRouter(prefix="/etudes", tags=["etudes"])
-DbSession = Annotated[Session, Depends(get_db)]
+Db = Annotated[Database, Depends(get_database)]
+IntervenantList = TypeAdapter(list[IntervenantRead])
+CoutTotal = TypeAdapter(EtudeCoutTotalResponse)
+CoutTotalList = TypeAdapter(list[EtudeCoutTotalResponse])
+IntervenantsLibresByEtude = TypeAdapter(list[EtudeIntervenantsLibres])
+IntervenantLibreList = TypeAdapter(list[IntervenantLibre])
+RecommendationList = TypeAdapter(list[IntervenantRecommendation])
+Detail = TypeAdapter(EtudeDetail)
+BulkResult = TypeAdapter(AffectationBulkResult)
+EtudeRows = RowSerializer(EtudeRead, Etude)
+
+
+@router.get("", response_model=list[EtudeRead] | CursorPage[EtudeRead])
+async def list_etudes(
+    db: Db,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Annotated[str | None, Query()] = None,
+):
+    if limit is None:
+        return await EtudeRows.response(await db.run(etude_service.list_etudes, columns=EtudeRows.columns))
+    page = await db.run(etude_service.list_etudes_page, limit=limit, cursor=cursor, columns=EtudeRows.columns)
+    return await EtudeRows.page_response(page)
+
+
+@router.get("/couts", response_model=list[EtudeCoutTotalResponse])
+async def etudes_couts(
+    db: Db,
+    ids: Annotated[list[int] | None, Query()] = None,
+    date_debut: Annotated[date | None, Query(alias="dateDebut")] = None,
+    date_fin: Annotated[date | None, Query(alias="dateFin")] = None,
+):
+    totals = await db.run(
+        etude_service.compute_portfolio_costs,
+        etude_ids=ids,
+        date_debut=date_debut,
+        date_fin=date_fin,
+    )
+    return await json_response(
+        CoutTotalList,
+        lambda: [
+            EtudeCoutTotalResponse(etude_id=etude_id, total_jeh=round(total_jeh, 2), cout_total=round(cout_total, 2))
+            for etude_id, total_jeh, cout_total in totals
+        ],
+    )
 
 
-@router.get("", response_model=list[EtudeRead])
-def list_etudes(db: DbSession):
-    return etude_service.list_etudes(db)
+@router.get("/intervenants-libres", response_model=list[EtudeIntervenantsLibres])
+async def etudes_intervenants_libres(
+    db: Db,
+    ids: Annotated[list[int] | None, Query()] = None,
+    min_jours: Annotated[int, Query(alias="minJours", ge=1)] = 1,
+):
+    grouped = await db.run(disponibilite_service.free_intervenants_by_etude, min_jours=min_jours, etude_ids=ids)
+    return await json_response(
+        IntervenantsLibresByEtude,
+        lambda: [
+            EtudeIntervenantsLibres(
+                etude_id=etude_id,
+                intervenants=[
+                    IntervenantJoursLibres(intervenant_id=intervenant_id, jours_libres=jours)
+                    for intervenant_id, jours in rows
+                ],
+            )
+            for etude_id, rows in grouped.items()
+        ],
+    )
 
 
 @router.get("/{etude_id}", response_model=EtudeRead)
-def get_etude(etude_id: int, db: DbSession):
-    return etude_service.get_etude_or_404(db, etude_id)
+async def get_etude(etude_id: int, response: Response, db: Db):
+    etude = await db.run(etude_service.get_etude_or_404, etude_id)
+    response.headers["ETag"] = version_etag(etude.version_id)
+    return etude
+
+
+@router.get("/{etude_id}/detail", response_model=EtudeDetail)
+async def get_etude_detail(etude_id: int, db: Db):
+    etude = await db.run(etude_service.get_etude_detail, etude_id)
+    return await json_response(Detail, lambda: etude)
 
 
 @router.post("", response_model=EtudeRead, status_code=status.HTTP_201_CREATED)
-def create_etude(payload: EtudeCreate, db: DbSession):
-    return etude_service.create_etude(db, payload.model_dump(by_alias=False))
+async def create_etude(payload: EtudeCreate, db: Db):
+    return await db.run(etude_service.create_etude, payload.model_dump(by_alias=False))
 
 
 @router.put("/{etude_id}", response_model=EtudeRead)
-def update_etude(etude_id: int, payload: EtudeUpdate, db: DbSession):
-    return etude_service.update_etude(db, etude_id, payload.model_dump(exclude_unset=True, by_alias=False))
+async def update_etude(etude_id: int, payload: EtudeUpdate, request: Request, response: Response, db: Db):
+    etude = await db.run(
+        etude_service.update_etude,
+        etude_id,
+        payload.model_dump(exclude_unset=True, by_alias=False),
+        if_match=if_match_versions(request),
+    )
+    response.headers["ETag"] = version_etag(etude.version_id)
+    return etude
 
 
 @router.delete("/{etude_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_etude(etude_id: int, db: DbSession) -> Response:
-    etude_service.delete_etude(db, etude_id)
+async def delete_etude(etude_id: int, db: Db) -> Response:
+    await db.run(etude_service.delete_etude, etude_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/{etude_id}/intervenants", response_model=list[IntervenantRead])
-def get_intervenants_by_etude(etude_id: int, db: DbSession):
-    return etude_service.list_intervenants_for_etude(db, etude_id)
+async def get_intervenants_by_etude(etude_id: int, request: Request, db: Db):
+    return await cached_json_response(
+        request,
+        etude_intervenants_key(etude_id),
+        IntervenantList,
+        lambda: db.run(etude_service.list_intervenants_for_etude, etude_id),
+    )
+
+
+@router.post("/{etude_id}/intervenants/bulk", response_model=AffectationBulkResult)
+async def link_intervenants_to_etude_bulk(etude_id: int, payload: AffectationBulkLinkCreate, db: Db):
+    created, errors = await db.run(
+        affectation_service.create_affectation_links_bulk,
+        etude_id=etude_id,
+        payloads=[item.model_dump(by_alias=False) for item in payload.items],
+    )
+    return await json_response(
+        BulkResult,
+        lambda: AffectationBulkResult(
+            created=created,
+            errors=[
+                AffectationBulkError(index=index, code=error.code, message=error.message) for index, error in errors
+            ],
+        ),
+    )
 
 
 @router.post("/{etude_id}/intervenants/{intervenant_id}", response_model=AffectationRead, status_code=status.HTTP_201_CREATED)
-def link_intervenant_to_etude(etude_id: int, intervenant_id: int, payload: AffectationLinkCreate, db: DbSession):
-    return affectation_service.create_affectation_link(
-        db,
+async def link_intervenant_to_etude(etude_id: int, intervenant_id: int, payload: AffectationLinkCreate, db: Db):
+    return await db.run(
+        affectation_service.create_affectation_link,
+        etude_id=etude_id,
+        intervenant_id=intervenant_id,
+        payload=payload.model_dump(by_alias=False),
+    )
+
+
+@router.put("/{etude_id}/intervenants/{intervenant_id}", response_model=AffectationRead)
+async def upsert_intervenant_link(
+    etude_id: int,
+    intervenant_id: int,
+    payload: AffectationLinkCreate,
+    request: Request,
+    response: Response,
+    db: Db,
+):
+    affectation, inserted = await db.run(
+        affectation_service.upsert_affectation_link,
         etude_id=etude_id,
         intervenant_id=intervenant_id,
         payload=payload.model_dump(by_alias=False),
+        if_match=if_match_versions(request),
     )
+    response.status_code = status.HTTP_201_CREATED if inserted else status.HTTP_200_OK
+    response.headers["ETag"] = version_etag(affectation.version_id)
+    return affectation
 
 
 @router.delete("/{etude_id}/intervenants/{intervenant_id}", status_code=status.HTTP_204_NO_CONTENT)
-def unlink_intervenant_from_etude(etude_id: int, intervenant_id: int, db: DbSession) -> Response:
-    affectation_service.delete_affectation_link(db, etude_id=etude_id, intervenant_id=intervenant_id)
+async def unlink_intervenant_from_etude(etude_id: int, intervenant_id: int, db: Db) -> Response:
+    await db.run(affectation_service.delete_affectation_link, etude_id=etude_id, intervenant_id=intervenant_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/{etude_id}/cout-total", response_model=EtudeCoutTotalResponse)
-def etude_cout_total(etude_id: int, db: DbSession):
-    total_jeh, cout_total = etude_service.compute_etude_cost(db, etude_id)
-    return EtudeCoutTotalResponse(etude_id=etude_id, total_jeh=round(total_jeh, 2), cout_total=round(cout_total, 2))
+async def etude_cout_total(etude_id: int, request: Request, db: Db):
+    async def load() -> EtudeCoutTotalResponse:
+        total_jeh, cout_total = await db.run(etude_service.compute_etude_cost, etude_id)
+        return EtudeCoutTotalResponse(etude_id=etude_id, total_jeh=round(total_jeh, 2), cout_total=round(cout_total, 2))
+
+    return await cached_json_response(request, etude_cout_total_key(etude_id), CoutTotal, load)
+
+
+@router.get("/{etude_id}/recommendations", response_model=list[IntervenantRecommendation])
+async def recommend_intervenants(
+    etude_id: int,
+    db: Db,
+    competences: Annotated[list[str] | None, Query()] = None,
+    budget: Annotated[float | None, Query(gt=0)] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 10,
+):
+    recommendations = await db.run(
+        recommendation_service.recommend_intervenants,
+        etude_id,
+        competences=competences or [],
+        budget=budget,
+        limit=limit,
+    )
+    return await json_response(RecommendationList, lambda: recommendations)
+
+
+@router.get("/{etude_id}/intervenants-libres", response_model=list[IntervenantLibre])
+async def etude_intervenants_libres(
+    etude_id: int,
+    db: Db,
+    min_jours: Annotated[int, Query(alias="minJours", ge=1)] = 1,
+):
+    results = await db.run(disponibilite_service.list_free_intervenants, etude_id, min_jours=min_jours)
+    return await json_response(
+        IntervenantLibreList,
+        lambda: [
+            IntervenantLibre(**IntervenantRead.model_validate(intervenant).model_dump(), jours_libres=jours)
+            for intervenant, jours in results
+        ],
+    )
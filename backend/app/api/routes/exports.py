@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.services import exports as export_service
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+@router.get("/{resource}.{export_format}")
+async def export_resource(
+    resource: export_service.ExportResource,
+    export_format: export_service.ExportFormat,
+    search: Annotated[str | None, Query()] = None,
+    competence: Annotated[str | None, Query()] = None,
+    disponibilite: Annotated[str | None, Query()] = None,
+) -> StreamingResponse:
+    filters = export_service.export_filters(resource, search=search, competence=competence, disponibilite=disponibilite)
+    return StreamingResponse(
+        export_service.stream_export(resource, export_format, filters),
+        media_type=export_service.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{export_format}"'},
+    )
@@ -2,9 +2,16 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
+from app.core.pool import pool_metrics
+
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
 def healthcheck() -> dict[str, str]:
     return {"message": "ok"}
+
+
+@router.get("/health/pool")
+def pool_status() -> list[dict]:
+    return [metrics.snapshot() for metrics in pool_metrics.values()]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Request, Response
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+
+from app.api.fast_json import dump_model_json
+from app.core.database import SessionLocal
+from app.schemas.intervenant import IntervenantImportResult
+from app.services import imports as import_service
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+ImportResult = TypeAdapter(IntervenantImportResult)
+
+
+def _import_intervenants(content: bytes) -> bytes:
+    # COPY goes through the sync psycopg connection, also when DATABASE_ASYNC is enabled.
+    with SessionLocal() as db:
+        return dump_model_json(ImportResult, import_service.import_intervenants(db, content))
+
+
+@router.post(
+    "/intervenants",
+    response_model=IntervenantImportResult,
+    openapi_extra={"requestBody": {"required": True, "content": {"text/csv": {"schema": {"type": "string"}}}}},
+)
+async def import_intervenants(request: Request):
+    body = await run_in_threadpool(_import_intervenants, await request.body())
+    return Response(content=body, media_type="application/json")
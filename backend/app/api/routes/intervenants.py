@@ -2,58 +2,149 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, Response, status
-from sqlalchemy.orm import Session
-
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from pydantic import TypeAdapter
+
+from app.api.caching import cached_json_response, if_match_versions, version_etag
+from app.api.fast_json import RowSerializer, json_response
+from app.core.cache import intervenant_etudes_key
+from app.core.database import Database, get_database
+from app.core.pagination import MAX_PAGE_SIZE
+from app.models import Intervenant
+from app.schemas.charge import IntervenantChargeRead
+from app.schemas.common import CursorPage
+from app.schemas.disponibilite import PeriodeDisponibiliteCreate, PeriodeDisponibiliteRead
 from app.schemas.etude import EtudeRead
-from app.schemas.intervenant import IntervenantCreate, IntervenantRead, IntervenantUpdate
+from app.schemas.intervenant import IntervenantCreate, IntervenantRead, IntervenantSearchResult, IntervenantUpdate
+from app.services import charge as charge_service
+from app.services import disponibilites as disponibilite_service
 from app.services import intervenants as intervenant_service
 
 router = APIRouter(prefix="/intervenants", tags=["intervenants"])
-DbSession = Annotated[Session, Depends(get_db)]
+Db = Annotated[Database, Depends(get_database)]
+EtudeList = TypeAdapter(list[EtudeRead])
+SearchResultList = TypeAdapter(list[IntervenantSearchResult])
+Charge = TypeAdapter(IntervenantChargeRead)
+PeriodeList = TypeAdapter(list[PeriodeDisponibiliteRead])
+IntervenantRows = RowSerializer(IntervenantRead, Intervenant)
 
 
-@router.get("", response_model=list[IntervenantRead])
-def list_intervenants(
-    db: DbSession,
+@router.get("", response_model=list[IntervenantRead] | CursorPage[IntervenantRead])
+async def list_intervenants(
+    db: Db,
     search: Annotated[str | None, Query()] = None,
     competence: Annotated[str | None, Query()] = None,
     disponibilite: Annotated[str | None, Query()] = None,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Annotated[str | None, Query()] = None,
 ):
-    return intervenant_service.list_intervenants(
-        db,
+    if limit is None:
+        rows = await db.run(
+            intervenant_service.list_intervenants,
+            search=search,
+            competence=competence,
+            disponibilite=disponibilite,
+            columns=IntervenantRows.columns,
+        )
+        return await IntervenantRows.response(rows)
+    page = await db.run(
+        intervenant_service.list_intervenants_page,
+        limit=limit,
+        cursor=cursor,
         search=search,
         competence=competence,
         disponibilite=disponibilite,
+        columns=IntervenantRows.columns,
     )
+    return await IntervenantRows.page_response(page)
+
+
+@router.get("/search", response_model=list[IntervenantSearchResult])
+async def search_intervenants(
+    db: Db,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    results = await db.run(intervenant_service.search_intervenants, q, limit=limit)
+
+    def build() -> list[IntervenantSearchResult]:
+        items = []
+        for intervenant, score, highlight in results:
+            fields = IntervenantRead.model_validate(intervenant).model_dump()
+            items.append(IntervenantSearchResult(**fields, score=round(score, 4), highlight=highlight))
+        return items
+
+    return await json_response(SearchResultList, build)
 
 
 @router.get("/{intervenant_id}", response_model=IntervenantRead)
-def get_intervenant(intervenant_id: int, db: DbSession):
-    return intervenant_service.get_intervenant_or_404(db, intervenant_id)
+async def get_intervenant(intervenant_id: int, response: Response, db: Db):
+    intervenant = await db.run(intervenant_service.get_intervenant_or_404, intervenant_id)
+    response.headers["ETag"] = version_etag(intervenant.version_id)
+    return intervenant
 
 
 @router.post("", response_model=IntervenantRead, status_code=status.HTTP_201_CREATED)
-def create_intervenant(payload: IntervenantCreate, db: DbSession):
-    return intervenant_service.create_intervenant(db, payload.model_dump(by_alias=False))
+async def create_intervenant(payload: IntervenantCreate, db: Db):
+    return await db.run(intervenant_service.create_intervenant, payload.model_dump(by_alias=False))
 
 
 @router.put("/{intervenant_id}", response_model=IntervenantRead)
-def update_intervenant(intervenant_id: int, payload: IntervenantUpdate, db: DbSession):
-    return intervenant_service.update_intervenant(
-        db,
+async def update_intervenant(
+    intervenant_id: int,
+    payload: IntervenantUpdate,
+    request: Request,
+    response: Response,
+    db: Db,
+):
+    intervenant = await db.run(
+        intervenant_service.update_intervenant,
         intervenant_id,
         payload.model_dump(exclude_unset=True, by_alias=False),
+        if_match=if_match_versions(request),
     )
+    response.headers["ETag"] = version_etag(intervenant.version_id)
+    return intervenant
 
 
 @router.delete("/{intervenant_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_intervenant(intervenant_id: int, db: DbSession) -> Response:
-    intervenant_service.delete_intervenant(db, intervenant_id)
+async def delete_intervenant(intervenant_id: int, db: Db) -> Response:
+    await db.run(intervenant_service.delete_intervenant, intervenant_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/{intervenant_id}/etudes", response_model=list[EtudeRead])
-def get_etudes_by_intervenant(intervenant_id: int, db: DbSession):
-    return intervenant_service.list_etudes_for_intervenant(db, intervenant_id)
+async def get_etudes_by_intervenant(intervenant_id: int, request: Request, db: Db):
+    return await cached_json_response(
+        request,
+        intervenant_etudes_key(intervenant_id),
+        EtudeList,
+        lambda: db.run(intervenant_service.list_etudes_for_intervenant, intervenant_id),
+    )
+
+
+@router.get("/{intervenant_id}/charge", response_model=IntervenantChargeRead)
+async def get_intervenant_charge(intervenant_id: int, db: Db):
+    charge = await db.run(charge_service.get_intervenant_charge, intervenant_id)
+    return await json_response(Charge, lambda: charge)
+
+
+@router.get("/{intervenant_id}/disponibilites", response_model=list[PeriodeDisponibiliteRead])
+async def list_disponibilites(intervenant_id: int, db: Db):
+    periodes = await db.run(disponibilite_service.list_periodes, intervenant_id)
+    return await json_response(PeriodeList, lambda: periodes)
+
+
+@router.post(
+    "/{intervenant_id}/disponibilites",
+    response_model=PeriodeDisponibiliteRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_disponibilite(intervenant_id: int, payload: PeriodeDisponibiliteCreate, db: Db):
+    return await db.run(disponibilite_service.create_periode, intervenant_id, payload.model_dump(by_alias=False))
+
+
+@router.delete("/{intervenant_id}/disponibilites/{periode_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_disponibilite(intervenant_id: int, periode_id: int, db: Db) -> Response:
+    await db.run(disponibilite_service.delete_periode, intervenant_id, periode_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Protocol
+
+from app.core.config import get_settings
+
+
+class CacheBackend(Protocol):
+    hits: int
+    misses: int
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+
+class InMemoryCache:
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class NullCache:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> bytes | None:
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+
+def build_cache() -> CacheBackend:
+    settings = get_settings()
+    if settings.cache_backend == "none":
+        return NullCache()
+    return InMemoryCache(max_entries=settings.cache_max_entries)
+
+
+cache: CacheBackend = build_cache()
+
+# Bumped by every invalidation so a response loaded while its key was being
+# invalidated is not written back over the fresh state.
+_generation = 0
+_generation_lock = Lock()
+
+
+def generation() -> int:
+    return _generation
+
+
+def set_unless_invalidated(key: str, value: bytes, ttl: float, since: int) -> None:
+    with _generation_lock:
+        if _generation == since:
+            cache.set(key, value, ttl)
+
+
+def _invalidate(keys: list[str]) -> None:
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        cache.delete(*keys)
+
+
+def etude_intervenants_key(etude_id: int) -> str:
+    return f"etude:{etude_id}:intervenants"
+
+
+def etude_cout_total_key(etude_id: int) -> str:
+    return f"etude:{etude_id}:cout-total"
+
+
+def intervenant_etudes_key(intervenant_id: int) -> str:
+    return f"intervenant:{intervenant_id}:etudes"
+
+
+def invalidate_etudes(*etude_ids: int) -> None:
+    keys = [key for etude_id in etude_ids for key in (etude_intervenants_key(etude_id), etude_cout_total_key(etude_id))]
+    _invalidate(keys)
+
+
+def invalidate_intervenants(*intervenant_ids: int) -> None:
+    _invalidate([intervenant_etudes_key(intervenant_id) for intervenant_id in intervenant_ids])
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+
+from app.core.errors import PreconditionFailedError
+
+STALE_MESSAGE = "La ressource a ete modifiee entre-temps, rechargez-la avant de la modifier"
+
+
+def ensure_version(version_id: int, if_match: Collection[int] | None) -> None:
+    if if_match is not None and version_id not in if_match:
+        raise PreconditionFailedError(STALE_MESSAGE)
@@ -1,21 +1,66 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Callable
+from typing import Concatenate, ParamSpec, TypeVar
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import get_settings
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_pool
+from app.core.query_stats import instrument_queries
+
+P = ParamSpec("P")
+T = TypeVar("T")
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, future=True, pool_pre_ping=True)
+pool_options = {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_recycle": settings.db_pool_recycle,
+    "pool_pre_ping": settings.db_pool_pre_ping,
+}
+
+engine = create_engine(settings.database_url, future=True, poolclass=InstrumentedQueuePool, **pool_options)
+instrument_pool(engine.pool, "sync")
+instrument_queries(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
+async_engine: AsyncEngine | None = None
+if settings.database_async:
+    async_engine = create_async_engine(settings.database_url, poolclass=InstrumentedAsyncQueuePool, **pool_options)
+    instrument_pool(async_engine.pool, "async")
+    instrument_queries(async_engine.sync_engine)
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False) if async_engine is not None else None
+)
+
+
+class Database:
+    # Services and repositories are written against a sync Session. With the async
+    # engine they run through AsyncSession.run_sync, so the driver I/O is awaited on
+    # the event loop instead of pinning a threadpool worker.
+    def __init__(self, session: Session | AsyncSession):
+        self.session = session
+
+    async def run(self, fn: Callable[Concatenate[Session, P], T], *args: P.args, **kwargs: P.kwargs) -> T:
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+async def get_database() -> AsyncGenerator[Database, None]:
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield Database(session)
+        return
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+    session = SessionLocal()
     try:
-        yield db
+        yield Database(session)
     finally:
-        db.close()
+        await run_in_threadpool(session.close)
@@ -3,6 +3,8 @@ from __future__ import annotations
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from app.core.metrics import request_metrics
+
 
 class AppError(Exception):
     status_code = 400
@@ -23,12 +25,18 @@ class ConflictError(AppError):
     code = "conflict"
 
 
+class PreconditionFailedError(AppError):
+    status_code = 412
+    code = "precondition_failed"
+
+
 class BusinessRuleError(AppError):
     status_code = 400
     code = "business_rule"
 
 
 async def app_error_handler(_: Request, exc: AppError) -> JSONResponse:
+    request_metrics.count_error(exc.code)
     return JSONResponse(
         status_code=exc.status_code,
         content={"message": exc.message, "code": exc.code},
@@ -36,6 +44,7 @@ async def app_error_handler(_: Request, exc: AppError) -> JSONResponse:
 
 
 async def unexpected_error_handler(_: Request, exc: Exception) -> JSONResponse:
+    request_metrics.count_error("internal_error")
     return JSONResponse(status_code=500, content={"message": "Erreur interne du serveur"})
 
 
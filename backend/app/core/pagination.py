@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Generic, Protocol, TypeVar
+
+from app.core.errors import BusinessRuleError
+
+MAX_PAGE_SIZE = 500
+
+
+class _Identified(Protocol):
+    id: int
+
+
+ItemT = TypeVar("ItemT", bound=_Identified)
+
+
+@dataclass(slots=True)
+class Page(Generic[ItemT]):
+    items: list[ItemT]
+    next_cursor: str | None = None
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, _, value = raw.partition(":")
+        last_id = int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BusinessRuleError("Curseur de pagination invalide") from None
+    if prefix != "id" or last_id <= 0:
+        raise BusinessRuleError("Curseur de pagination invalide")
+    return last_id
+
+
+def build_page(rows: Sequence[ItemT], limit: int) -> Page[ItemT]:
+    items = list(rows[:limit])
+    next_cursor = encode_cursor(items[-1].id) if len(rows) > limit else None
+    return Page(items=items, next_cursor=next_cursor)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import time
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.metrics import Histogram
+
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Pool | None = None
+        self.wait_seconds = Histogram(POOL_WAIT_BUCKETS)
+        self.connections_created = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self._lock = Lock()
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        size = checked_out = checked_in = overflow = 0
+        if isinstance(pool, QueuePool):
+            size = pool.size()
+            checked_out = pool.checkedout()
+            checked_in = pool.checkedin()
+            overflow = max(pool.overflow(), 0)
+        return {
+            "name": self.name,
+            "size": size,
+            "checked_out": checked_out,
+            "checked_in": checked_in,
+            "overflow": overflow,
+            "connections_created": self.connections_created,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "invalidations": self.invalidations,
+            "wait_seconds": self.wait_seconds.snapshot(),
+        }
+
+
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+class _TimedCheckoutMixin:
+    # The pool events only fire once a connection is handed out, so the time spent
+    # waiting for a free slot is measured around QueuePool._do_get.
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.increment("timeouts")
+            raise
+        finally:
+            self.metrics.wait_seconds.observe(time.perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(pool: Pool, name: str) -> PoolMetrics:
+    metrics = PoolMetrics(name)
+    metrics.pool = pool
+    pool.metrics = metrics
+    pool_metrics[name] = metrics
+
+    event.listen(pool, "connect", lambda *_: metrics.increment("connections_created"))
+    event.listen(pool, "checkout", lambda *_: metrics.increment("checkouts"))
+    event.listen(pool, "invalidate", lambda *_: metrics.increment("invalidations"))
+    return metrics
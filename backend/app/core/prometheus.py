@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from app.core.cache import CacheBackend, cache
+from app.core.metrics import RequestMetrics, request_metrics
+from app.core.pool import PoolMetrics, pool_metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: object) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _header(name: str, kind: str, help_text: str) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def _histogram(name: str, snapshot: dict, **labels: object) -> Iterable[str]:
+    for bound, count in snapshot["buckets"]:
+        yield f"{name}_bucket{_labels(**labels, le=_number(float(bound)))} {count}"
+    yield f'{name}_bucket{_labels(**labels, le="+Inf")} {snapshot["count"]}'
+    yield f"{name}_sum{_labels(**labels)} {_number(snapshot['sum'])}"
+    yield f"{name}_count{_labels(**labels)} {snapshot['count']}"
+
+
+def render_requests(metrics: RequestMetrics) -> list[str]:
+    lines = _header("http_requests_total", "counter", "Requetes HTTP traitees.")
+    for (method, route, status), count in sorted(metrics.requests.items()):
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+    lines += _header("http_request_duration_seconds", "histogram", "Duree des requetes HTTP par route.")
+    for (method, route), histogram in sorted(metrics.latency.items()):
+        lines.extend(_histogram("http_request_duration_seconds", histogram.snapshot(), method=method, route=route))
+
+    lines += _header("http_requests_in_flight", "gauge", "Requetes HTTP en cours.")
+    lines.append(f"http_requests_in_flight {metrics.in_flight}")
+
+    lines += _header("app_errors_total", "counter", "Erreurs renvoyees par code.")
+    for code, count in sorted(metrics.errors.items()):
+        lines.append(f"app_errors_total{_labels(code=code)} {count}")
+    return lines
+
+
+def render_pools(pools: Iterable[PoolMetrics]) -> list[str]:
+    snapshots = [pool.snapshot() for pool in pools]
+    lines: list[str] = []
+    gauges = {
+        "size": "Connexions permanentes du pool.",
+        "checked_out": "Connexions empruntees.",
+        "checked_in": "Connexions libres.",
+        "overflow": "Connexions en overflow.",
+    }
+    for field, help_text in gauges.items():
+        lines += _header(f"db_pool_{field}", "gauge", help_text)
+        lines.extend(f"db_pool_{field}{_labels(pool=snapshot['name'])} {snapshot[field]}" for snapshot in snapshots)
+    counters = {
+        "connections_created": "Connexions ouvertes.",
+        "checkouts": "Emprunts de connexion.",
+        "timeouts": "Emprunts abandonnes sur timeout.",
+        "invalidations": "Connexions invalidees.",
+    }
+    for field, help_text in counters.items():
+        lines += _header(f"db_pool_{field}_total", "counter", help_text)
+        lines.extend(
+            f"db_pool_{field}_total{_labels(pool=snapshot['name'])} {snapshot[field]}" for snapshot in snapshots
+        )
+    lines += _header("db_pool_wait_seconds", "histogram", "Attente d'une connexion libre.")
+    for snapshot in snapshots:
+        lines.extend(_histogram("db_pool_wait_seconds", snapshot["wait_seconds"], pool=snapshot["name"]))
+    return lines
+
+
+def render_cache(backend: CacheBackend) -> list[str]:
+    lookups = backend.hits + backend.misses
+    lines = _header("cache_hits_total", "counter", "Lectures servies par le cache.")
+    lines.append(f"cache_hits_total {backend.hits}")
+    lines += _header("cache_misses_total", "counter", "Lectures absentes du cache.")
+    lines.append(f"cache_misses_total {backend.misses}")
+    lines += _header("cache_hit_ratio", "gauge", "Part des lectures servies par le cache.")
+    lines.append(f"cache_hit_ratio {_number(backend.hits / lookups if lookups else 0.0)}")
+    return lines
+
+
+def render_metrics() -> str:
+    lines = render_requests(request_metrics) + render_pools(pool_metrics.values()) + render_cache(cache)
+    return "\n".join(lines) + "\n"
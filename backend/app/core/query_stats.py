@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+logger = logging.getLogger("app.sql")
+
+
+@dataclass(slots=True)
+class QueryStats:
+    scope: Scope = field(default_factory=dict)
+    count: int = 0
+    duration: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "")
+
+
+# Holds a mutable QueryStats so that increments made from threadpool workers or
+# AsyncSession.run_sync greenlets (which run in a copy of the context) are seen
+# by the middleware.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+    if elapsed * 1000 >= get_settings().slow_query_threshold_ms:
+        route = stats.route if stats is not None else None
+        logger.warning(
+            "slow_query route=%s duration_ms=%.1f statement=%s",
+            route,
+            elapsed * 1000,
+            " ".join(statement.split()),
+            extra={"route": route, "duration_ms": round(elapsed * 1000, 1), "statement": statement},
+        )
+
+
+def _handle_error(context) -> None:
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_queries(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def server_timing(stats: QueryStats) -> str:
+    total_ms = (time.perf_counter() - stats.started) * 1000
+    return f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", app;dur={total_ms:.2f}'
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope=scope)
+        token = current_query_stats.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(stats))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            total_ms = (time.perf_counter() - stats.started) * 1000
+            logger.info(
+                "request method=%s route=%s status=%d queries=%d db_ms=%.1f total_ms=%.1f",
+                scope["method"],
+                stats.route,
+                status_code,
+                stats.count,
+                stats.duration * 1000,
+                total_ms,
+                extra={
+                    "method": scope["method"],
+                    "route": stats.route,
+                    "status": status_code,
+                    "queries": stats.count,
+                    "db_ms": round(stats.duration * 1000, 1),
+                    "total_ms": round(total_ms, 1),
+                },
+            )
@@ -1,29 +1,42 @@
 from __future__ import annotations
 
+import logging
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes import affectations, etudes, health, intervenants
+from app.api.routes import affectations, changes, charge, etudes, exports, health, imports, intervenants, metrics
 from app.core.config import get_settings
 from app.core.errors import register_error_handlers
+from app.core.metrics import MetricsMiddleware
+from app.core.query_stats import QueryStatsMiddleware
 
 settings = get_settings()
+logging.basicConfig(level=settings.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s %(message)s")
 
 app = FastAPI(title=settings.app_name)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 register_error_handlers(app)
 
 app.include_router(health.router)
+app.include_router(metrics.router)
 app.include_router(intervenants.router)
 app.include_router(etudes.router)
 app.include_router(affectations.router)
+app.include_router(charge.router)
+app.include_router(changes.router)
+app.include_router(exports.router)
+app.include_router(imports.router)
 
 
 def run() -> None:
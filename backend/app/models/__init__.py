@@ -1,6 +1,18 @@
 from app.models.affectation import Affectation
 from app.models.base import Base
+from app.models.change_log import ChangeLog
 from app.models.etude import Etude
+from app.models.etude_cost_rollup import EtudeCostRollup
 from app.models.intervenant import DisponibiliteEnum, Intervenant
+from app.models.periode_disponibilite import PeriodeDisponibilite
 
-__all__ = ["Affectation", "Base", "DisponibiliteEnum", "Etude", "Intervenant"]
+__all__ = [
+    "Affectation",
+    "Base",
+    "ChangeLog",
+    "DisponibiliteEnum",
+    "Etude",
+    "EtudeCostRollup",
+    "Intervenant",
+    "PeriodeDisponibilite",
+]
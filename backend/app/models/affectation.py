@@ -1,22 +1,27 @@
 from __future__ import annotations
 
-from sqlalchemy import CheckConstraint, Float, ForeignKey, Integer, String, UniqueConstraint, text
+from sqlalchemy import CheckConstraint, Float, ForeignKey, Index, Integer, String, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin
+from app.models.base import Base, VersionedMixin
 
 
-class Affectation(Base, TimestampMixin):
+class Affectation(Base, VersionedMixin):
     __tablename__ = "affectations"
     __table_args__ = (
         UniqueConstraint("intervenant_id", "etude_id", name="uq_affectations_intervenant_etude"),
         CheckConstraint("jeh > 0", name="ck_affectations_jeh"),
+        Index("ix_affectations_etude_id", "etude_id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    intervenant_id: Mapped[int] = mapped_column(ForeignKey("intervenants.id", ondelete="CASCADE"), nullable=False)
-    etude_id: Mapped[int] = mapped_column(ForeignKey("etudes.id", ondelete="CASCADE"), nullable=False)
+    intervenant_id: Mapped[int] = mapped_column(
+        ForeignKey("intervenants.id", ondelete="CASCADE", name="affectations_intervenant_id_fkey"), nullable=False
+    )
+    etude_id: Mapped[int] = mapped_column(
+        ForeignKey("etudes.id", ondelete="CASCADE", name="affectations_etude_id_fkey"), nullable=False
+    )
     jeh: Mapped[float] = mapped_column(Float, nullable=False)
     phases: Mapped[list[str]] = mapped_column(
         ARRAY(String()),
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, func
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, func
+from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
 
 class Base(DeclarativeBase):
@@ -11,7 +13,21 @@ class Base(DeclarativeBase):
 
 
 class TimestampMixin:
+    # Server-side timestamps come back through INSERT/UPDATE ... RETURNING instead
+    # of a post-commit refresh.
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
+
+
+class VersionedMixin(TimestampMixin):
+    # Optimistic locking: UPDATE and DELETE are qualified with the version that was
+    # read and bump it, so a concurrent write makes the flush raise StaleDataError.
+    version_id: Mapped[int] = mapped_column(Integer, server_default="1", nullable=False)
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {"eager_defaults": True, "version_id_col": cls.version_id}
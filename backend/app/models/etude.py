@@ -6,13 +6,13 @@ from typing import TYPE_CHECKING
 from sqlalchemy import CheckConstraint, Date, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin
+from app.models.base import Base, VersionedMixin
 
 if TYPE_CHECKING:
     from app.models.affectation import Affectation
 
 
-class Etude(Base, TimestampMixin):
+class Etude(Base, VersionedMixin):
     __tablename__ = "etudes"
     __table_args__ = (CheckConstraint("date_fin >= date_debut", name="ck_etudes_date_range"),)
 
@@ -23,5 +23,5 @@ class Etude(Base, TimestampMixin):
     date_fin: Mapped[date] = mapped_column(Date, nullable=False)
 
     affectations: Mapped[list["Affectation"]] = relationship(
-        back_populates="etude", cascade="all, delete-orphan", passive_deletes=True
+        back_populates="etude", cascade="all, delete-orphan", passive_deletes=True, order_by="Affectation.id"
     )
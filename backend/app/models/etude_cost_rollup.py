@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class EtudeCostRollup(Base):
+    __tablename__ = "etude_cost_rollup"
+
+    etude_id: Mapped[int] = mapped_column(ForeignKey("etudes.id", ondelete="CASCADE"), primary_key=True)
+    total_jeh: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default=text("0"))
+    cout_total: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default=text("0"))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
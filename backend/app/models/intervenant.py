@@ -7,10 +7,11 @@ from sqlalchemy import CheckConstraint, Enum, Float, Index, Integer, String, tex
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin
+from app.models.base import Base, VersionedMixin
 
 if TYPE_CHECKING:
     from app.models.affectation import Affectation
+    from app.models.periode_disponibilite import PeriodeDisponibilite
 
 
 class DisponibiliteEnum(str, enum.Enum):
@@ -19,12 +20,13 @@ class DisponibiliteEnum(str, enum.Enum):
     occupe = "Occupé"
 
 
-class Intervenant(Base, TimestampMixin):
+class Intervenant(Base, VersionedMixin):
     __tablename__ = "intervenants"
     __table_args__ = (
         CheckConstraint("nb_jours_disponibles >= 0 AND nb_jours_disponibles <= 7", name="ck_intervenants_nb_jours"),
         CheckConstraint("tjm > 0", name="ck_intervenants_tjm"),
         Index("ix_intervenants_nom", "nom"),
+        Index("uq_intervenants_email", text("lower(email)"), unique=True),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -52,3 +54,6 @@ class Intervenant(Base, TimestampMixin):
     affectations: Mapped[list["Affectation"]] = relationship(
         back_populates="intervenant", cascade="all, delete-orphan", passive_deletes=True
     )
+    periodes_disponibilite: Mapped[list["PeriodeDisponibilite"]] = relationship(
+        back_populates="intervenant", cascade="all, delete-orphan", passive_deletes=True
+    )
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from sqlalchemy import ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import DATERANGE, ExcludeConstraint, Range
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base, TimestampMixin
+
+
+class PeriodeDisponibilite(Base, TimestampMixin):
+    __tablename__ = "periodes_disponibilite"
+    __table_args__ = (
+        ExcludeConstraint(
+            ("intervenant_id", "="),
+            ("periode", "&&"),
+            name="ex_periodes_disponibilite_overlap",
+            using="gist",
+        ),
+        Index("ix_periodes_disponibilite_periode", "periode", postgresql_using="gist"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    intervenant_id: Mapped[int] = mapped_column(ForeignKey("intervenants.id", ondelete="CASCADE"), nullable=False)
+    # Canonical daterange: inclusive lower bound, exclusive upper bound.
+    periode: Mapped[Range[date]] = mapped_column(DATERANGE, nullable=False)
+
+    intervenant = relationship("Intervenant", back_populates="periodes_disponibilite")
+
+    @property
+    def date_debut(self) -> date:
+        return self.periode.lower
+
+    @property
+    def date_fin(self) -> date:
+        return self.periode.upper - timedelta(days=1)
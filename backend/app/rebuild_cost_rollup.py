@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from app.core.database import SessionLocal
+from app.repositories import cost_rollups as cost_rollup_repo
+
+
+def main() -> None:
+    with SessionLocal() as db:
+        count = cost_rollup_repo.rebuild(db)
+        db.commit()
+    print(f"Rollup des couts reconstruit ({count} etudes).")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
-from sqlalchemy import func, select
+from collections.abc import Collection, Iterable, Sequence
+from datetime import date
+
+from sqlalchemy import ColumnElement, Row, func, insert, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.models import Affectation, Intervenant
+from app.models import Affectation, Etude, Intervenant
 
 
-def list_affectations(db: Session) -> list[Affectation]:
-    return list(db.scalars(select(Affectation).order_by(Affectation.id.desc())))
+def list_affectations(
+    db: Session,
+    *,
+    limit: int | None = None,
+    before_id: int | None = None,
+    columns: Sequence[ColumnElement] | None = None,
+) -> list[Affectation] | list[Row]:
+    stmt = select(*columns) if columns else select(Affectation)
+    if before_id is not None:
+        stmt = stmt.where(Affectation.id < before_id)
+    stmt = stmt.order_by(Affectation.id.desc()).limit(limit)
+    return list(db.execute(stmt)) if columns else list(db.scalars(stmt))
 
 
 def get_affectation(db: Session, affectation_id: int) -> Affectation | None:
@@ -22,25 +36,138 @@ def get_affectation_by_pair(db: Session, etude_id: int, intervenant_id: int) ->
     return db.scalar(stmt)
 
 
-def create_affectation(db: Session, payload: dict) -> Affectation:
-    affectation = Affectation(**payload)
-    db.add(affectation)
-    db.commit()
-    db.refresh(affectation)
-    return affectation
+def etude_ids_for_intervenant(db: Session, intervenant_id: int) -> list[int]:
+    return list(db.scalars(select(Affectation.etude_id).where(Affectation.intervenant_id == intervenant_id)))
+
+
+def etude_ids_for_intervenants(db: Session, intervenant_ids: Iterable[int]) -> set[int]:
+    intervenant_ids = list(intervenant_ids)
+    if not intervenant_ids:
+        return set()
+    return set(db.scalars(select(Affectation.etude_id).where(Affectation.intervenant_id.in_(intervenant_ids))))
+
+
+def intervenant_ids_for_etude(db: Session, etude_id: int) -> list[int]:
+    return list(db.scalars(select(Affectation.intervenant_id).where(Affectation.etude_id == etude_id)))
+
+
+def jeh_by_intervenant_between(db: Session, date_debut: date, date_fin: date) -> dict[int, float]:
+    stmt = (
+        select(Affectation.intervenant_id, func.sum(Affectation.jeh))
+        .join(Etude, Etude.id == Affectation.etude_id)
+        .where(Etude.date_debut <= date_fin, Etude.date_fin >= date_debut)
+        .group_by(Affectation.intervenant_id)
+    )
+    return {intervenant_id: float(jeh) for intervenant_id, jeh in db.execute(stmt)}
+
+
+def charge_rows(
+    db: Session,
+    *,
+    intervenant_id: int | None = None,
+    date_debut: date | None = None,
+    date_fin: date | None = None,
+) -> list[Row]:
+    stmt = (
+        select(
+            Affectation.intervenant_id,
+            Intervenant.nb_jours_disponibles,
+            Etude.id,
+            Etude.date_debut,
+            Etude.date_fin,
+            Affectation.jeh,
+        )
+        .join(Intervenant, Intervenant.id == Affectation.intervenant_id)
+        .join(Etude, Etude.id == Affectation.etude_id)
+        .order_by(Affectation.intervenant_id)
+    )
+    if intervenant_id is not None:
+        stmt = stmt.where(Affectation.intervenant_id == intervenant_id)
+    if date_debut is not None:
+        stmt = stmt.where(Etude.date_fin >= date_debut)
+    if date_fin is not None:
+        stmt = stmt.where(Etude.date_debut <= date_fin)
+    return list(db.execute(stmt))
+
+
+def existing_pairs(db: Session, pairs: Iterable[tuple[int, int]]) -> set[tuple[int, int]]:
+    pairs = list(pairs)
+    if not pairs:
+        return set()
+    stmt = select(Affectation.intervenant_id, Affectation.etude_id).where(
+        tuple_(Affectation.intervenant_id, Affectation.etude_id).in_(pairs)
+    )
+    return {(intervenant_id, etude_id) for intervenant_id, etude_id in db.execute(stmt)}
+
+
+def create_affectations(db: Session, payloads: list[dict]) -> list[Affectation]:
+    if not payloads:
+        return []
+    stmt = insert(Affectation).returning(Affectation, sort_by_parameter_order=True)
+    return list(db.scalars(stmt, payloads))
 
 
 def update_affectation(db: Session, affectation: Affectation, payload: dict) -> Affectation:
     for key, value in payload.items():
         setattr(affectation, key, value)
-    db.commit()
-    db.refresh(affectation)
+    db.flush()
     return affectation
 
 
+def insert_affectation_if_absent(db: Session, payload: dict) -> Affectation | None:
+    stmt = (
+        pg_insert(Affectation)
+        .values(**payload)
+        .on_conflict_do_nothing(constraint="uq_affectations_intervenant_etude")
+        .returning(Affectation)
+    )
+    return db.scalars(stmt).first()
+
+
+def upsert_affectation_link(
+    db: Session,
+    *,
+    etude_id: int,
+    intervenant_id: int,
+    payload: dict,
+    if_match: Collection[int] | None = None,
+) -> tuple[Affectation, bool, float | None, int | None] | None:
+    # The CTE reads the row as of the statement snapshot, which gives the previous
+    # jeh for the cost rollup delta in the same round-trip as the upsert.
+    previous = (
+        select(Affectation.jeh, Affectation.version_id)
+        .where(Affectation.intervenant_id == intervenant_id, Affectation.etude_id == etude_id)
+        .cte("previous")
+    )
+    stmt = pg_insert(Affectation).values(intervenant_id=intervenant_id, etude_id=etude_id, **payload)
+    stmt = (
+        stmt.on_conflict_do_update(
+            constraint="uq_affectations_intervenant_etude",
+            set_={
+                **{key: stmt.excluded[key] for key in payload},
+                "updated_at": func.now(),
+                "version_id": Affectation.version_id + 1,
+            },
+            where=Affectation.version_id.in_(list(if_match)) if if_match is not None else None,
+        )
+        .returning(
+            Affectation,
+            literal_column("xmax = 0").label("inserted"),
+            select(previous.c.jeh).scalar_subquery().label("previous_jeh"),
+            select(previous.c.version_id).scalar_subquery().label("previous_version_id"),
+        )
+        .add_cte(previous)
+    )
+    row = db.execute(stmt, execution_options={"populate_existing": True}).one_or_none()
+    if row is None:
+        return None
+    affectation, inserted, previous_jeh, previous_version_id = row
+    return affectation, inserted, previous_jeh, previous_version_id
+
+
 def delete_affectation(db: Session, affectation: Affectation) -> None:
     db.delete(affectation)
-    db.commit()
+    db.flush()
 
 
 def etude_cost_totals(db: Session, etude_id: int) -> tuple[float, float]:
@@ -54,3 +181,34 @@ def etude_cost_totals(db: Session, etude_id: int) -> tuple[float, float]:
     )
     total_jeh, cout_total = db.execute(stmt).one()
     return float(total_jeh or 0.0), float(cout_total or 0.0)
+
+
+def portfolio_cost_totals(
+    db: Session,
+    *,
+    etude_ids: list[int] | None = None,
+    date_debut: date | None = None,
+    date_fin: date | None = None,
+) -> list[tuple[int, float, float]]:
+    stmt = (
+        select(
+            Etude.id,
+            func.coalesce(func.sum(Affectation.jeh), 0.0),
+            func.coalesce(func.sum(Affectation.jeh * Intervenant.tjm), 0.0),
+        )
+        .select_from(Etude)
+        .outerjoin(Affectation, Affectation.etude_id == Etude.id)
+        .outerjoin(Intervenant, Intervenant.id == Affectation.intervenant_id)
+        .group_by(Etude.id)
+        .order_by(Etude.id.desc())
+    )
+    if etude_ids:
+        stmt = stmt.where(Etude.id.in_(etude_ids))
+    if date_debut is not None:
+        stmt = stmt.where(Etude.date_fin >= date_debut)
+    if date_fin is not None:
+        stmt = stmt.where(Etude.date_debut <= date_fin)
+    return [
+        (etude_id, float(total_jeh or 0.0), float(cout_total or 0.0))
+        for etude_id, total_jeh, cout_total in db.execute(stmt)
+    ]
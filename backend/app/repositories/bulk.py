@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def copy_rows(db: Session, table_name: str, columns: Sequence[str], rows: Iterable[Sequence]) -> None:
+    cursor = db.connection().connection.driver_connection.cursor()
+    with cursor, cursor.copy(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+
+
+def allocate_ids(db: Session, table_name: str, count: int) -> list[int]:
+    stmt = text("SELECT nextval(pg_get_serial_sequence(:table_name, 'id')) FROM generate_series(1, :count)")
+    return list(db.scalars(stmt, {"table_name": table_name, "count": count}))
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import Row, Select, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models import Affectation, ChangeLog, PeriodeDisponibilite
+
+# Held until commit by every transaction that appends to the log, so sequence
+# numbers become visible in order and a reader never skips a late commit. It is
+# taken by the last statement before commit, after the row locks of the write,
+# so that every writer acquires locks in the same order.
+CHANGE_LOG_LOCK_KEY = 7_262_930_001
+
+CHANGE_COLUMNS = (ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.operation, ChangeLog.changed_at)
+
+
+def _append(db: Session, rows: list[dict]) -> None:
+    if not rows:
+        return
+    db.execute(select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK_KEY)))
+    db.execute(insert(ChangeLog), rows)
+
+
+def record(db: Session, entity: str, operation: str, entity_ids: Iterable[int]) -> None:
+    _append(db, [{"entity": entity, "entity_id": entity_id, "operation": operation} for entity_id in entity_ids])
+
+
+def record_selected(db: Session, entity: str, operation: str, entity_ids: Select) -> None:
+    # Bulk counterpart of record for the seeds: the ids are read by the INSERT itself.
+    ids = entity_ids.subquery()
+    db.execute(select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK_KEY)))
+    db.execute(
+        insert(ChangeLog).from_select(
+            ["entity", "entity_id", "operation"],
+            select(literal(entity), *ids.c, literal(operation)).order_by(*ids.c),
+        )
+    )
+
+
+def record_deletes(db: Session, deleted: Iterable[tuple[str, int]]) -> None:
+    _append(db, [{"entity": entity, "entity_id": entity_id, "operation": "delete"} for entity, entity_id in deleted])
+
+
+def cascaded_deletes(
+    db: Session, *, intervenant_id: int | None = None, etude_id: int | None = None
+) -> list[tuple[str, int]]:
+    # Rows removed by ON DELETE CASCADE never go through the services: they are
+    # collected before the parent is deleted and logged with it. Callers lock the
+    # parent row first so no child can be inserted in between.
+    if intervenant_id is not None:
+        affectations = select(literal("affectation"), Affectation.id).where(
+            Affectation.intervenant_id == intervenant_id
+        )
+        periodes = select(literal("periode_disponibilite"), PeriodeDisponibilite.id).where(
+            PeriodeDisponibilite.intervenant_id == intervenant_id
+        )
+        stmt = affectations.union_all(periodes)
+    elif etude_id is not None:
+        stmt = select(literal("affectation"), Affectation.id).where(Affectation.etude_id == etude_id)
+    else:
+        return []
+    return [(entity, entity_id) for entity, entity_id in db.execute(stmt)]
+
+
+def list_changes(db: Session, *, since: int, limit: int) -> list[Row]:
+    stmt = select(*CHANGE_COLUMNS).where(ChangeLog.seq > since).order_by(ChangeLog.seq).limit(limit)
+    return list(db.execute(stmt))
+
+
+def head(db: Session) -> int:
+    return db.scalar(select(func.coalesce(func.max(ChangeLog.seq), 0)))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import ColumnElement, Select, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Affectation, Etude, EtudeCostRollup, Intervenant
+
+
+def get_totals(db: Session, etude_id: int) -> tuple[float, float]:
+    stmt = select(EtudeCostRollup.total_jeh, EtudeCostRollup.cout_total).where(EtudeCostRollup.etude_id == etude_id)
+    row = db.execute(stmt).one_or_none()
+    if row is None:
+        return 0.0, 0.0
+    return float(row.total_jeh), float(row.cout_total)
+
+
+def _apply(db: Session, condition: ColumnElement[bool], sign: int) -> list[int]:
+    # FOR SHARE on the intervenant waits for a concurrent tjm update to commit and
+    # then reads the new tjm, so apply_tjm_change and this delta never both miss
+    # each other. Postgres refuses a locking clause next to GROUP BY, hence the
+    # subquery.
+    rows = (
+        select(Affectation.etude_id, Affectation.jeh, Intervenant.tjm)
+        .join(Intervenant, Intervenant.id == Affectation.intervenant_id)
+        .where(condition)
+        .with_for_update(read=True, of=Intervenant)
+        .subquery()
+    )
+    contributions = select(
+        rows.c.etude_id,
+        func.sum(rows.c.jeh) * sign,
+        func.sum(rows.c.jeh * rows.c.tjm) * sign,
+    ).group_by(rows.c.etude_id)
+    return _increment(db, contributions)
+
+
+def _increment(db: Session, contributions: Select) -> list[int]:
+    stmt = insert(EtudeCostRollup).from_select(["etude_id", "total_jeh", "cout_total"], contributions)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EtudeCostRollup.etude_id],
+        set_={
+            "total_jeh": EtudeCostRollup.total_jeh + stmt.excluded.total_jeh,
+            "cout_total": EtudeCostRollup.cout_total + stmt.excluded.cout_total,
+            "updated_at": func.now(),
+        },
+    )
+    return list(db.scalars(stmt.returning(EtudeCostRollup.etude_id)))
+
+
+def add_affectations(db: Session, affectation_ids: Iterable[int]) -> None:
+    _apply(db, Affectation.id.in_(list(affectation_ids)), 1)
+
+
+def remove_affectations(db: Session, affectation_ids: Iterable[int]) -> None:
+    _apply(db, Affectation.id.in_(list(affectation_ids)), -1)
+
+
+def apply_jeh_change(db: Session, *, etude_id: int, intervenant_id: int, delta_jeh: float) -> None:
+    contributions = (
+        select(literal(etude_id), literal(delta_jeh), Intervenant.tjm * delta_jeh)
+        .where(Intervenant.id == intervenant_id)
+        .with_for_update(read=True)
+    )
+    _increment(db, contributions)
+
+
+def resync(db: Session, etude_id: int) -> None:
+    # Waiting on the rollup row lock first lets the rebuild below take a snapshot
+    # that includes every concurrent writer which already applied its delta.
+    db.execute(select(EtudeCostRollup.etude_id).where(EtudeCostRollup.etude_id == etude_id).with_for_update())
+    rebuild(db, etude_ids=[etude_id])
+
+
+def remove_intervenant(db: Session, intervenant_id: int) -> list[int]:
+    return _apply(db, Affectation.intervenant_id == intervenant_id, -1)
+
+
+def apply_tjm_change(db: Session, intervenant_id: int, old_tjm: float, new_tjm: float) -> None:
+    jeh_by_etude = (
+        select(Affectation.etude_id, func.sum(Affectation.jeh).label("jeh"))
+        .where(Affectation.intervenant_id == intervenant_id)
+        .group_by(Affectation.etude_id)
+        .subquery()
+    )
+    stmt = (
+        update(EtudeCostRollup)
+        .where(EtudeCostRollup.etude_id == jeh_by_etude.c.etude_id)
+        .values(
+            cout_total=EtudeCostRollup.cout_total + jeh_by_etude.c.jeh * (new_tjm - old_tjm),
+            updated_at=func.now(),
+        )
+    )
+    db.execute(stmt)
+
+
+def rebuild(db: Session, *, etude_ids: Iterable[int] | None = None) -> int:
+    totals = (
+        select(
+            Etude.id,
+            func.coalesce(func.sum(Affectation.jeh), 0.0),
+            func.coalesce(func.sum(Affectation.jeh * Intervenant.tjm), 0.0),
+        )
+        .select_from(Etude)
+        .outerjoin(Affectation, Affectation.etude_id == Etude.id)
+        .outerjoin(Intervenant, Intervenant.id == Affectation.intervenant_id)
+        .group_by(Etude.id)
+    )
+    if etude_ids is not None:
+        totals = totals.where(Etude.id.in_(list(etude_ids)))
+    stmt = insert(EtudeCostRollup).from_select(["etude_id", "total_jeh", "cout_total"], totals)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EtudeCostRollup.etude_id],
+        set_={
+            "total_jeh": stmt.excluded.total_jeh,
+            "cout_total": stmt.excluded.cout_total,
+            "updated_at": func.now(),
+        },
+    )
+    return db.execute(stmt).rowcount
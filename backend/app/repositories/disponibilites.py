@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import Range
+from sqlalchemy.orm import Session
+
+from app.models import Etude, Intervenant, PeriodeDisponibilite
+
+
+def list_periodes(db: Session, intervenant_id: int) -> list[PeriodeDisponibilite]:
+    stmt = (
+        select(PeriodeDisponibilite)
+        .where(PeriodeDisponibilite.intervenant_id == intervenant_id)
+        .order_by(PeriodeDisponibilite.periode)
+    )
+    return list(db.scalars(stmt))
+
+
+def get_periode(db: Session, intervenant_id: int, periode_id: int) -> PeriodeDisponibilite | None:
+    periode = db.get(PeriodeDisponibilite, periode_id)
+    if periode is None or periode.intervenant_id != intervenant_id:
+        return None
+    return periode
+
+
+def create_periode(db: Session, intervenant_id: int, date_debut: date, date_fin: date) -> PeriodeDisponibilite:
+    periode = PeriodeDisponibilite(
+        intervenant_id=intervenant_id,
+        periode=Range(date_debut, date_fin + timedelta(days=1), bounds="[)"),
+    )
+    db.add(periode)
+    db.flush()
+    return periode
+
+
+def delete_periode(db: Session, periode: PeriodeDisponibilite) -> None:
+    db.delete(periode)
+    db.flush()
+
+
+def _free_days():
+    window = func.daterange(Etude.date_debut, Etude.date_fin, literal("[]"))
+    overlap = PeriodeDisponibilite.periode.op("*")(window)
+    jours = func.sum(func.upper(overlap) - func.lower(overlap)).label("jours")
+    stmt = (
+        select(Etude.id, PeriodeDisponibilite.intervenant_id, jours)
+        .join(PeriodeDisponibilite, PeriodeDisponibilite.periode.op("&&")(window))
+        .group_by(Etude.id, PeriodeDisponibilite.intervenant_id)
+    )
+    return stmt, jours
+
+
+def free_days_by_etude(
+    db: Session,
+    *,
+    min_jours: int,
+    etude_ids: Iterable[int] | None = None,
+) -> list[tuple[int, int, int]]:
+    stmt, jours = _free_days()
+    stmt = stmt.having(jours >= min_jours).order_by(Etude.id, jours.desc(), PeriodeDisponibilite.intervenant_id)
+    if etude_ids is not None:
+        stmt = stmt.where(Etude.id.in_(list(etude_ids)))
+    return [(etude_id, intervenant_id, int(total)) for etude_id, intervenant_id, total in db.execute(stmt)]
+
+
+def free_intervenants_for_etude(db: Session, etude_id: int, *, min_jours: int) -> list[tuple[Intervenant, int]]:
+    free_days, jours = _free_days()
+    free_days = free_days.where(Etude.id == etude_id).having(jours >= min_jours).subquery()
+    stmt = (
+        select(Intervenant, free_days.c.jours)
+        .join(free_days, free_days.c.intervenant_id == Intervenant.id)
+        .order_by(free_days.c.jours.desc(), Intervenant.id)
+    )
+    return [(intervenant, int(total)) for intervenant, total in db.execute(stmt)]
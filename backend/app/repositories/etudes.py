@@ -1,38 +1,65 @@
 from __future__ import annotations
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import ColumnElement, Row, select
+from sqlalchemy.orm import Session, selectinload
 
 from app.models import Affectation, Etude, Intervenant
 
 
-def list_etudes(db: Session) -> list[Etude]:
-    return list(db.scalars(select(Etude).order_by(Etude.id.desc())))
+def list_etudes(
+    db: Session,
+    *,
+    limit: int | None = None,
+    before_id: int | None = None,
+    columns: Sequence[ColumnElement] | None = None,
+) -> list[Etude] | list[Row]:
+    stmt = select(*columns) if columns else select(Etude)
+    if before_id is not None:
+        stmt = stmt.where(Etude.id < before_id)
+    stmt = stmt.order_by(Etude.id.desc()).limit(limit)
+    return list(db.execute(stmt)) if columns else list(db.scalars(stmt))
+
+
+def get_etude(db: Session, etude_id: int, *, for_update: bool = False) -> Etude | None:
+    return db.get(Etude, etude_id, with_for_update=for_update)
+
+
+def get_etude_with_affectations(db: Session, etude_id: int) -> Etude | None:
+    stmt = (
+        select(Etude)
+        .where(Etude.id == etude_id)
+        .options(selectinload(Etude.affectations).joinedload(Affectation.intervenant, innerjoin=True))
+        .execution_options(populate_existing=True)
+    )
+    return db.scalars(stmt).one_or_none()
 
 
-def get_etude(db: Session, etude_id: int) -> Etude | None:
-    return db.get(Etude, etude_id)
+def existing_ids(db: Session, ids: Iterable[int]) -> set[int]:
+    ids = set(ids)
+    if not ids:
+        return set()
+    return set(db.scalars(select(Etude.id).where(Etude.id.in_(ids))))
 
 
 def create_etude(db: Session, payload: dict) -> Etude:
     etude = Etude(**payload)
     db.add(etude)
-    db.commit()
-    db.refresh(etude)
+    db.flush()
     return etude
 
 
 def update_etude(db: Session, etude: Etude, payload: dict) -> Etude:
     for key, value in payload.items():
         setattr(etude, key, value)
-    db.commit()
-    db.refresh(etude)
+    db.flush()
     return etude
 
 
 def delete_etude(db: Session, etude: Etude) -> None:
     db.delete(etude)
-    db.commit()
+    db.flush()
 
 
 def list_intervenants_for_etude(db: Session, etude_id: int) -> list[Intervenant]:
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from sqlalchemy import Select, select
+
+from app.models import Affectation, Etude, Intervenant
+from app.repositories.intervenants import filter_intervenants
+
+EXPORT_COLUMNS = {
+    "intervenants": (
+        Intervenant.id.label("id"),
+        Intervenant.nom.label("nom"),
+        Intervenant.email.label("email"),
+        Intervenant.telephone.label("telephone"),
+        Intervenant.competences.label("competences"),
+        Intervenant.tjm.label("tjm"),
+        Intervenant.disponibilite.label("disponibilite"),
+        Intervenant.nb_jours_disponibles.label("nbJoursDisponibles"),
+    ),
+    "etudes": (
+        Etude.id.label("id"),
+        Etude.nom.label("nom"),
+        Etude.description.label("description"),
+        Etude.date_debut.label("dateDebut"),
+        Etude.date_fin.label("dateFin"),
+    ),
+    "affectations": (
+        Affectation.id.label("id"),
+        Affectation.intervenant_id.label("intervenantId"),
+        Affectation.etude_id.label("etudeId"),
+        Affectation.jeh.label("jeh"),
+        Affectation.phases.label("phases"),
+    ),
+}
+
+
+def export_statement(resource: str, *, filters: dict | None = None) -> Select:
+    columns = EXPORT_COLUMNS[resource]
+    stmt = select(*columns)
+    if resource == "intervenants" and filters:
+        stmt = filter_intervenants(stmt, **filters)
+    return stmt.order_by(columns[0])
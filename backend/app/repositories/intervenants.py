@@ -1,38 +1,132 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import ColumnElement, Row, Select, Text, column, func, literal_column, or_, select, table, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from app.models import Affectation, Etude, Intervenant
+from app.models import Affectation, DisponibiliteEnum, Etude, Intervenant
+from app.repositories.bulk import copy_rows
+
+# SQL counterparts of the haystacks matched by the search filters, backed by the
+# trigram indexes of migration 20261018_000002.
+search_text = func.intervenant_search_text(
+    Intervenant.nom, Intervenant.disponibilite, Intervenant.competences, type_=Text
+)
+competences_text = func.intervenant_competences_text(Intervenant.competences, type_=Text)
+
+# Generated tsvector column and accent-insensitive name key of migration
+# 20261018_000005; the column is maintained by PostgreSQL and not mapped.
+search_document = literal_column("intervenants.search_document")
+name_key = func.intervenant_name_key(Intervenant.nom, type_=Text)
+SEARCH_CONFIG = literal_column("'french_unaccent'::regconfig")
+HIGHLIGHT_OPTIONS = "StartSel=<mark>, StopSel=</mark>, HighlightAll=true"
+
+IMPORT_COLUMNS = ("nom", "email", "telephone", "competences", "disponibilite", "nb_jours_disponibles", "tjm")
+import_staging = table("intervenants_import", *(column(name) for name in IMPORT_COLUMNS))
+
+
+def _contains_pattern(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
 
+def filter_intervenants(
+    stmt: Select,
+    *,
+    search: str | None = None,
+    competence: str | None = None,
+    disponibilite: str | None = None,
+) -> Select:
+    if disponibilite:
+        matching = [member for member in DisponibiliteEnum if member.value.lower() == disponibilite]
+        stmt = stmt.where(Intervenant.disponibilite.in_(matching))
 
-def list_intervenants(db: Session) -> list[Intervenant]:
-    return list(db.scalars(select(Intervenant).order_by(Intervenant.id.desc())))
+    if competence:
+        stmt = stmt.where(competences_text.like(_contains_pattern(competence), escape="\\"))
 
+    if search:
+        stmt = stmt.where(search_text.like(_contains_pattern(search), escape="\\"))
 
-def get_intervenant(db: Session, intervenant_id: int) -> Intervenant | None:
-    return db.get(Intervenant, intervenant_id)
+    return stmt
+
+
+def list_intervenants(
+    db: Session,
+    *,
+    search: str | None = None,
+    competence: str | None = None,
+    disponibilite: str | None = None,
+    limit: int | None = None,
+    before_id: int | None = None,
+    columns: Sequence[ColumnElement] | None = None,
+) -> list[Intervenant] | list[Row]:
+    stmt = select(*columns) if columns else select(Intervenant)
+    stmt = filter_intervenants(stmt, search=search, competence=competence, disponibilite=disponibilite)
+
+    if before_id is not None:
+        stmt = stmt.where(Intervenant.id < before_id)
+
+    stmt = stmt.order_by(Intervenant.id.desc()).limit(limit)
+    return list(db.execute(stmt)) if columns else list(db.scalars(stmt))
+
+
+def search_intervenants(db: Session, query: str, *, limit: int) -> list[tuple[Intervenant, float, str]]:
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    query_key = func.intervenant_name_key(query, type_=Text)
+    score = (func.ts_rank_cd(search_document, ts_query) + func.similarity(name_key, query_key)).label("score")
+    document = func.concat_ws(" - ", Intervenant.nom, func.array_to_string(Intervenant.competences, ", "))
+    highlight = func.ts_headline(SEARCH_CONFIG, document, ts_query, HIGHLIGHT_OPTIONS, type_=Text).label("highlight")
+    stmt = (
+        select(Intervenant, score, highlight)
+        .where(or_(search_document.op("@@")(ts_query), name_key.op("%")(query_key)))
+        .order_by(score.desc(), Intervenant.id)
+        .limit(limit)
+    )
+    return [(intervenant, float(rank), snippet) for intervenant, rank, snippet in db.execute(stmt)]
+
+
+def list_recommendation_rows(db: Session) -> list[tuple]:
+    stmt = select(
+        Intervenant.id,
+        Intervenant.nom,
+        Intervenant.competences,
+        Intervenant.disponibilite,
+        Intervenant.nb_jours_disponibles,
+        Intervenant.tjm,
+    ).order_by(Intervenant.id)
+    return [tuple(row) for row in db.execute(stmt)]
+
+
+def get_intervenant(db: Session, intervenant_id: int, *, for_update: bool = False) -> Intervenant | None:
+    return db.get(Intervenant, intervenant_id, with_for_update=for_update)
+
+
+def existing_ids(db: Session, ids: Iterable[int]) -> set[int]:
+    ids = set(ids)
+    if not ids:
+        return set()
+    return set(db.scalars(select(Intervenant.id).where(Intervenant.id.in_(ids))))
 
 
 def create_intervenant(db: Session, payload: dict) -> Intervenant:
     intervenant = Intervenant(**payload)
     db.add(intervenant)
-    db.commit()
-    db.refresh(intervenant)
+    db.flush()
     return intervenant
 
 
 def update_intervenant(db: Session, intervenant: Intervenant, payload: dict) -> Intervenant:
     for key, value in payload.items():
         setattr(intervenant, key, value)
-    db.commit()
-    db.refresh(intervenant)
+    db.flush()
     return intervenant
 
 
 def delete_intervenant(db: Session, intervenant: Intervenant) -> None:
     db.delete(intervenant)
-    db.commit()
+    db.flush()
 
 
 def list_etudes_for_intervenant(db: Session, intervenant_id: int) -> list[Etude]:
@@ -43,3 +137,38 @@ def list_etudes_for_intervenant(db: Session, intervenant_id: int) -> list[Etude]
         .order_by(Etude.id.desc())
     )
     return list(db.scalars(stmt))
+
+
+def stage_intervenants(db: Session, rows: Iterable[tuple]) -> None:
+    db.execute(
+        text(
+            """
+            CREATE TEMP TABLE intervenants_import (
+                nom varchar(255) NOT NULL,
+                email varchar(255),
+                telephone varchar(32),
+                competences varchar[] NOT NULL,
+                disponibilite disponibilite_enum NOT NULL,
+                nb_jours_disponibles integer NOT NULL,
+                tjm double precision NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+    )
+    copy_rows(db, "intervenants_import", IMPORT_COLUMNS, rows)
+
+
+def upsert_staged_intervenants(db: Session) -> list[tuple[int, bool]]:
+    stmt = insert(Intervenant).from_select(
+        list(IMPORT_COLUMNS), select(*(import_staging.c[name] for name in IMPORT_COLUMNS))
+    )
+    updated = {name: stmt.excluded[name] for name in IMPORT_COLUMNS if name != "email"}
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[func.lower(Intervenant.email)],
+        set_={**updated, "updated_at": func.now(), "version_id": Intervenant.version_id + 1},
+        # Rows identical to the stored intervenant are left untouched.
+        where=tuple_(*(Intervenant.__table__.c[name] for name in updated)).is_distinct_from(
+            tuple_(*updated.values())
+        ),
+    ).returning(Intervenant.id, literal_column("xmax = 0").label("inserted"))
+    return [(intervenant_id, inserted) for intervenant_id, inserted in db.execute(stmt)]
@@ -1,22 +1,71 @@
 from app.schemas.affectation import (
+    AffectationBulkCreate,
+    AffectationBulkError,
+    AffectationBulkLinkCreate,
+    AffectationBulkLinkItem,
+    AffectationBulkResult,
     AffectationCreate,
     AffectationLinkCreate,
     AffectationRead,
     AffectationUpdate,
 )
-from app.schemas.etude import EtudeCoutTotalResponse, EtudeCreate, EtudeRead, EtudeUpdate
-from app.schemas.intervenant import IntervenantCreate, IntervenantRead, IntervenantUpdate
+from app.schemas.change import ChangeFeed, ChangeRead
+from app.schemas.charge import ChargeSegmentRead, IntervenantChargeRead
+from app.schemas.disponibilite import (
+    EtudeIntervenantsLibres,
+    IntervenantJoursLibres,
+    IntervenantLibre,
+    PeriodeDisponibiliteCreate,
+    PeriodeDisponibiliteRead,
+)
+from app.schemas.etude import (
+    EtudeCoutTotalResponse,
+    EtudeCreate,
+    EtudeDetail,
+    EtudeDetailLigne,
+    EtudeRead,
+    EtudeUpdate,
+)
+from app.schemas.intervenant import (
+    IntervenantCreate,
+    IntervenantImportError,
+    IntervenantImportResult,
+    IntervenantRead,
+    IntervenantRecommendation,
+    IntervenantSearchResult,
+    IntervenantUpdate,
+)
 
 __all__ = [
+    "AffectationBulkCreate",
+    "AffectationBulkError",
+    "AffectationBulkLinkCreate",
+    "AffectationBulkLinkItem",
+    "AffectationBulkResult",
     "AffectationCreate",
     "AffectationLinkCreate",
     "AffectationRead",
     "AffectationUpdate",
+    "ChangeFeed",
+    "ChangeRead",
+    "ChargeSegmentRead",
     "EtudeCoutTotalResponse",
     "EtudeCreate",
+    "EtudeDetail",
+    "EtudeDetailLigne",
+    "EtudeIntervenantsLibres",
     "EtudeRead",
     "EtudeUpdate",
+    "IntervenantChargeRead",
     "IntervenantCreate",
+    "IntervenantImportError",
+    "IntervenantImportResult",
+    "IntervenantJoursLibres",
+    "IntervenantLibre",
     "IntervenantRead",
+    "IntervenantRecommendation",
+    "IntervenantSearchResult",
     "IntervenantUpdate",
+    "PeriodeDisponibiliteCreate",
+    "PeriodeDisponibiliteRead",
 ]
@@ -62,3 +62,27 @@ class AffectationLinkCreate(ApiSchema):
 
 class AffectationRead(AffectationBase):
     id: int
+    version_id: int
+
+
+class AffectationBulkCreate(ApiSchema):
+    items: list[AffectationCreate] = Field(min_length=1, max_length=500)
+
+
+class AffectationBulkLinkItem(AffectationLinkCreate):
+    intervenant_id: int = Field(gt=0)
+
+
+class AffectationBulkLinkCreate(ApiSchema):
+    items: list[AffectationBulkLinkItem] = Field(min_length=1, max_length=500)
+
+
+class AffectationBulkError(ApiSchema):
+    index: int
+    code: str
+    message: str
+
+
+class AffectationBulkResult(ApiSchema):
+    created: list[AffectationRead]
+    errors: list[AffectationBulkError]
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from app.schemas.common import ApiSchema
+
+
+class ChangeRead(ApiSchema):
+    seq: int
+    entity: Literal["intervenant", "etude", "affectation", "periode_disponibilite"]
+    entity_id: int
+    operation: Literal["insert", "update", "delete"]
+    changed_at: datetime
+
+
+class ChangeFeed(ApiSchema):
+    changes: list[ChangeRead]
+    next_since: int
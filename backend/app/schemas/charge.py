@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import date
+
+from app.schemas.common import ApiSchema
+
+
+class ChargeSegmentRead(ApiSchema):
+    date_debut: date
+    date_fin: date
+    jeh_par_semaine: float
+    etude_ids: list[int]
+    depassement: float
+
+
+class IntervenantChargeRead(ApiSchema):
+    intervenant_id: int
+    nb_jours_disponibles: int
+    segments: list[ChargeSegmentRead]
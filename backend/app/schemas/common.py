@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from typing import Generic, TypeVar
+
 from pydantic import BaseModel, ConfigDict
 
+ItemT = TypeVar("ItemT")
+
 
 def to_camel(value: str) -> str:
     parts = value.split("_")
@@ -16,3 +20,8 @@ class ApiSchema(BaseModel):
         use_enum_values=True,
         extra="forbid",
     )
+
+
+class CursorPage(ApiSchema, Generic[ItemT]):
+    items: list[ItemT]
+    next_cursor: str | None = None
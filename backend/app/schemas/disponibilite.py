@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import date
+
+from pydantic import model_validator
+
+from app.schemas.common import ApiSchema
+from app.schemas.intervenant import IntervenantRead
+
+
+class PeriodeDisponibiliteCreate(ApiSchema):
+    date_debut: date
+    date_fin: date
+
+    @model_validator(mode="after")
+    def validate_dates(self):
+        if self.date_fin < self.date_debut:
+            raise ValueError("dateFin doit etre superieure ou egale a dateDebut")
+        return self
+
+
+class PeriodeDisponibiliteRead(PeriodeDisponibiliteCreate):
+    id: int
+    intervenant_id: int
+
+
+class IntervenantLibre(IntervenantRead):
+    jours_libres: int
+
+
+class IntervenantJoursLibres(ApiSchema):
+    intervenant_id: int
+    jours_libres: int
+
+
+class EtudeIntervenantsLibres(ApiSchema):
+    etude_id: int
+    intervenants: list[IntervenantJoursLibres]
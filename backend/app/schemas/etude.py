@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from datetime import date
 
-from pydantic import Field, field_validator, model_validator
+from pydantic import Field, computed_field, field_validator, model_validator
 
+from app.schemas.affectation import AffectationRead
 from app.schemas.common import ApiSchema
+from app.schemas.intervenant import IntervenantRead
 
 
 class EtudeBase(ApiSchema):
@@ -67,6 +69,7 @@ class EtudeUpdate(ApiSchema):
 
 class EtudeRead(EtudeBase):
     id: int
+    version_id: int
 
 
 class EtudeCoutTotalResponse(ApiSchema):
@@ -74,3 +77,27 @@ class EtudeCoutTotalResponse(ApiSchema):
     total_jeh: float
     cout_total: float
     devise: str = "EUR"
+
+
+class EtudeDetailLigne(AffectationRead):
+    intervenant: IntervenantRead
+
+    @computed_field
+    @property
+    def cout(self) -> float:
+        return round(self.jeh * self.intervenant.tjm, 2)
+
+
+class EtudeDetail(EtudeRead):
+    affectations: list[EtudeDetailLigne]
+    devise: str = "EUR"
+
+    @computed_field
+    @property
+    def total_jeh(self) -> float:
+        return round(sum(ligne.jeh for ligne in self.affectations), 2)
+
+    @computed_field
+    @property
+    def cout_total(self) -> float:
+        return round(sum(ligne.jeh * ligne.intervenant.tjm for ligne in self.affectations), 2)
@@ -90,3 +90,35 @@ class IntervenantUpdate(ApiSchema):
 
 class IntervenantRead(IntervenantBase):
     id: int
+    version_id: int
+
+
+class IntervenantSearchResult(IntervenantRead):
+    score: float
+    highlight: str
+
+
+class IntervenantRecommendation(ApiSchema):
+    intervenant_id: int
+    nom: str
+    score: float
+    competences_matchees: list[str]
+    disponibilite: DisponibiliteEnum
+    nb_jours_disponibles: int
+    tjm: float
+    charge_jeh: float
+
+
+class IntervenantImportError(ApiSchema):
+    line: int
+    message: str
+
+
+class IntervenantImportResult(ApiSchema):
+    received: int
+    inserted: int
+    updated: int
+    unchanged: int
+    errors: list[IntervenantImportError]
+    duration_ms: float
+    rows_per_second: float
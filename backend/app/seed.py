@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import argparse
+import time
 from datetime import date
 
 from sqlalchemy import select
@@ -7,9 +9,12 @@ from sqlalchemy import select
 from app.core.database import SessionLocal
 from app.models import Affectation, Etude, Intervenant
 from app.models.intervenant import DisponibiliteEnum
+from app.repositories import changes as change_repo
+from app.repositories import cost_rollups as cost_rollup_repo
+from app.synthetic_data import seed_synthetic
 
 
-def main() -> None:
+def seed_demo() -> None:
     with SessionLocal() as db:
         has_etudes = db.scalar(select(Etude.id).limit(1)) is not None
         has_intervenants = db.scalar(select(Intervenant.id).limit(1)) is not None
@@ -228,9 +233,52 @@ def main() -> None:
                     ]
                 )
 
+        added = list(db.new)
+        db.flush()
+        cost_rollup_repo.rebuild(db)
+        for entity, model in (("intervenant", Intervenant), ("etude", Etude), ("affectation", Affectation)):
+            change_repo.record(db, entity, "insert", [row.id for row in added if isinstance(row, model)])
         db.commit()
         print("Seed terminee.")
 
 
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Sans option : jeu de demo. Avec --intervenants/--etudes : donnees synthetiques en volume."
+    )
+    parser.add_argument("--intervenants", type=int, help="nombre d'intervenants generes")
+    parser.add_argument("--etudes", type=int, help="nombre d'etudes generees")
+    parser.add_argument("--affectations-per-etude", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42, help="graine aleatoire (meme graine, memes donnees)")
+    parser.add_argument(
+        "--reset", action="store_true", help="vide les tables et le journal des modifications avant generation"
+    )
+    args = parser.parse_args(argv)
+    for name in ("intervenants", "etudes", "affectations_per_etude"):
+        if (getattr(args, name) or 0) < 0:
+            parser.error(f"--{name.replace('_', '-')} doit etre positif")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.intervenants is None and args.etudes is None:
+        seed_demo()
+        return
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        counts = seed_synthetic(
+            db,
+            intervenants=args.intervenants or 0,
+            etudes=args.etudes or 0,
+            affectations_per_etude=args.affectations_per_etude,
+            seed=args.seed,
+            reset=args.reset,
+        )
+    summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+    print(f"Seed synthetique terminee en {time.perf_counter() - started:.1f}s : {summary}.")
+
+
 if __name__ == "__main__":
     main()
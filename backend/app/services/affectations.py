@@ -1,17 +1,49 @@
 from __future__ import annotations
 
+from collections.abc import Collection, Sequence
+
+from sqlalchemy import ColumnElement, Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.core.errors import ConflictError, NotFoundError
+from app.core.cache import invalidate_etudes, invalidate_intervenants
+from app.core.concurrency import STALE_MESSAGE, ensure_version
+from app.core.errors import AppError, ConflictError, NotFoundError, PreconditionFailedError
+from app.core.pagination import Page, build_page, decode_cursor
 from app.models import Affectation
 from app.repositories import affectations as affectation_repo
+from app.repositories import changes as change_repo
+from app.repositories import cost_rollups as cost_rollup_repo
+from app.repositories import etudes as etude_repo
+from app.repositories import intervenants as intervenant_repo
 from app.services.etudes import get_etude_or_404
-from app.services.intervenants import get_intervenant_or_404
 
+DUPLICATE_LINK_MESSAGE = "Cet intervenant est deja affecte a cette etude"
+MISSING_REFERENCE_MESSAGES = {
+    "affectations_intervenant_id_fkey": "Intervenant introuvable",
+    "affectations_etude_id_fkey": "Etude introuvable",
+}
+
+
+def list_affectations(
+    db: Session, *, columns: Sequence[ColumnElement] | None = None
+) -> list[Affectation] | list[Row]:
+    return affectation_repo.list_affectations(db, columns=columns)
 
-def list_affectations(db: Session) -> list[Affectation]:
-    return affectation_repo.list_affectations(db)
+
+def list_affectations_page(
+    db: Session, *, limit: int, cursor: str | None = None, columns: Sequence[ColumnElement] | None = None
+) -> Page[Affectation] | Page[Row]:
+    rows = affectation_repo.list_affectations(
+        db, limit=limit + 1, before_id=decode_cursor(cursor) if cursor else None, columns=columns
+    )
+    return build_page(rows, limit)
+
+
+def _invalidate_links(*pairs: tuple[int, int]) -> None:
+    invalidate_intervenants(*{intervenant_id for intervenant_id, _ in pairs})
+    invalidate_etudes(*{etude_id for _, etude_id in pairs})
 
 
 def get_affectation_or_404(db: Session, affectation_id: int) -> Affectation:
@@ -21,46 +53,81 @@ def get_affectation_or_404(db: Session, affectation_id: int) -> Affectation:
     return affectation
 
 
-def _ensure_refs_exist(db: Session, *, intervenant_id: int, etude_id: int) -> None:
-    get_intervenant_or_404(db, intervenant_id)
-    get_etude_or_404(db, etude_id)
+def _integrity_error(exc: IntegrityError, message: str) -> AppError:
+    # Writes go straight to the database; the violated constraint tells which
+    # reference is missing, with the messages of get_intervenant/etude_or_404.
+    constraint = getattr(getattr(exc.orig, "diag", None), "constraint_name", None)
+    if constraint in MISSING_REFERENCE_MESSAGES:
+        return NotFoundError(MISSING_REFERENCE_MESSAGES[constraint])
+    if constraint == "uq_affectations_intervenant_etude":
+        return ConflictError(DUPLICATE_LINK_MESSAGE)
+    return ConflictError(message)
 
 
 def create_affectation(db: Session, payload: dict) -> Affectation:
-    _ensure_refs_exist(db, intervenant_id=payload["intervenant_id"], etude_id=payload["etude_id"])
-    existing = affectation_repo.get_affectation_by_pair(db, payload["etude_id"], payload["intervenant_id"])
-    if existing is not None:
-        raise ConflictError("Cet intervenant est deja affecte a cette etude")
-
     try:
-        return affectation_repo.create_affectation(db, payload)
+        affectation = affectation_repo.insert_affectation_if_absent(db, payload)
+        if affectation is None:
+            raise ConflictError(DUPLICATE_LINK_MESSAGE)
+        cost_rollup_repo.add_affectations(db, [affectation.id])
+        change_repo.record(db, "affectation", "insert", [affectation.id])
+        db.commit()
     except IntegrityError as exc:
         db.rollback()
-        raise ConflictError("Impossible de creer l'affectation (doublon ou contrainte)") from exc
+        raise _integrity_error(exc, "Impossible de creer l'affectation (doublon ou contrainte)") from exc
+    _invalidate_links((affectation.intervenant_id, affectation.etude_id))
+    return affectation
 
 
-def update_affectation(db: Session, affectation_id: int, payload: dict) -> Affectation:
+def update_affectation(
+    db: Session,
+    affectation_id: int,
+    payload: dict,
+    *,
+    if_match: Collection[int] | None = None,
+) -> Affectation:
     affectation = get_affectation_or_404(db, affectation_id)
+    ensure_version(affectation.version_id, if_match)
 
-    next_intervenant_id = payload.get("intervenant_id", affectation.intervenant_id)
-    next_etude_id = payload.get("etude_id", affectation.etude_id)
-    _ensure_refs_exist(db, intervenant_id=next_intervenant_id, etude_id=next_etude_id)
+    previous_link = (affectation.intervenant_id, affectation.etude_id)
+    affects_cost = any(
+        key in payload and payload[key] != getattr(affectation, key) for key in ("intervenant_id", "etude_id", "jeh")
+    )
+    try:
+        if affects_cost:
+            cost_rollup_repo.remove_affectations(db, [affectation.id])
+        affectation = affectation_repo.update_affectation(db, affectation, payload)
+        if affects_cost:
+            cost_rollup_repo.add_affectations(db, [affectation.id])
+        change_repo.record(db, "affectation", "update", [affectation.id])
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise _integrity_error(exc, "Impossible de modifier l'affectation (doublon ou contrainte)") from exc
+    except StaleDataError as exc:
+        db.rollback()
+        raise PreconditionFailedError(STALE_MESSAGE) from exc
+    _invalidate_links(previous_link, (affectation.intervenant_id, affectation.etude_id))
+    return affectation
 
-    if next_intervenant_id != affectation.intervenant_id or next_etude_id != affectation.etude_id:
-        existing = affectation_repo.get_affectation_by_pair(db, next_etude_id, next_intervenant_id)
-        if existing is not None and existing.id != affectation.id:
-            raise ConflictError("Cet intervenant est deja affecte a cette etude")
 
+def _delete_affectation(db: Session, affectation: Affectation) -> None:
+    link = (affectation.intervenant_id, affectation.etude_id)
+    affectation_id = affectation.id
     try:
-        return affectation_repo.update_affectation(db, affectation, payload)
-    except IntegrityError as exc:
+        cost_rollup_repo.remove_affectations(db, [affectation_id])
+        affectation_repo.delete_affectation(db, affectation)
+        change_repo.record(db, "affectation", "delete", [affectation_id])
+        db.commit()
+    except StaleDataError as exc:
         db.rollback()
-        raise ConflictError("Impossible de modifier l'affectation (doublon ou contrainte)") from exc
+        raise PreconditionFailedError(STALE_MESSAGE) from exc
+    _invalidate_links(link)
 
 
 def delete_affectation(db: Session, affectation_id: int) -> None:
     affectation = get_affectation_or_404(db, affectation_id)
-    affectation_repo.delete_affectation(db, affectation)
+    _delete_affectation(db, affectation)
 
 
 def create_affectation_link(db: Session, *, etude_id: int, intervenant_id: int, payload: dict) -> Affectation:
@@ -74,8 +141,102 @@ def create_affectation_link(db: Session, *, etude_id: int, intervenant_id: int,
     )
 
 
+def upsert_affectation_link(
+    db: Session,
+    *,
+    etude_id: int,
+    intervenant_id: int,
+    payload: dict,
+    if_match: Collection[int] | None = None,
+) -> tuple[Affectation, bool]:
+    try:
+        result = affectation_repo.upsert_affectation_link(
+            db, etude_id=etude_id, intervenant_id=intervenant_id, payload=payload, if_match=if_match
+        )
+        # If-Match never matches a link that does not exist yet.
+        if result is None or (result[1] and if_match is not None):
+            db.rollback()
+            raise PreconditionFailedError(STALE_MESSAGE)
+        affectation, inserted, previous_jeh, previous_version_id = result
+        if inserted:
+            cost_rollup_repo.add_affectations(db, [affectation.id])
+        elif previous_version_id is not None and affectation.version_id == previous_version_id + 1:
+            if affectation.jeh != previous_jeh:
+                cost_rollup_repo.apply_jeh_change(
+                    db, etude_id=etude_id, intervenant_id=intervenant_id, delta_jeh=affectation.jeh - previous_jeh
+                )
+        else:
+            # A concurrent write landed between the statement snapshot and the
+            # upsert, so the previous jeh is unknown: recompute the etude total.
+            cost_rollup_repo.resync(db, etude_id)
+        change_repo.record(db, "affectation", "insert" if inserted else "update", [affectation.id])
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise _integrity_error(exc, "Impossible d'enregistrer l'affectation (contrainte)") from exc
+    _invalidate_links((intervenant_id, etude_id))
+    return affectation, inserted
+
+
 def delete_affectation_link(db: Session, *, etude_id: int, intervenant_id: int) -> None:
     affectation = affectation_repo.get_affectation_by_pair(db, etude_id=etude_id, intervenant_id=intervenant_id)
     if affectation is None:
         raise NotFoundError("Affectation introuvable pour ce couple etude/intervenant")
-    affectation_repo.delete_affectation(db, affectation)
+    _delete_affectation(db, affectation)
+
+
+def _create_affectations_bulk(
+    db: Session,
+    payloads: list[dict],
+    *,
+    known_etude_ids: set[int] | None = None,
+) -> tuple[list[Affectation], list[tuple[int, AppError]]]:
+    intervenant_ids = intervenant_repo.existing_ids(db, (item["intervenant_id"] for item in payloads))
+    if known_etude_ids is None:
+        etude_ids = etude_repo.existing_ids(db, (item["etude_id"] for item in payloads))
+    else:
+        etude_ids = known_etude_ids
+    taken_pairs = affectation_repo.existing_pairs(
+        db, {(item["intervenant_id"], item["etude_id"]) for item in payloads}
+    )
+
+    valid: list[dict] = []
+    errors: list[tuple[int, AppError]] = []
+    for index, item in enumerate(payloads):
+        pair = (item["intervenant_id"], item["etude_id"])
+        if item["intervenant_id"] not in intervenant_ids:
+            errors.append((index, NotFoundError("Intervenant introuvable")))
+        elif item["etude_id"] not in etude_ids:
+            errors.append((index, NotFoundError("Etude introuvable")))
+        elif pair in taken_pairs:
+            errors.append((index, ConflictError(DUPLICATE_LINK_MESSAGE)))
+        else:
+            taken_pairs.add(pair)
+            valid.append(item)
+
+    try:
+        created = affectation_repo.create_affectations(db, valid)
+        if created:
+            cost_rollup_repo.add_affectations(db, [affectation.id for affectation in created])
+            change_repo.record(db, "affectation", "insert", [affectation.id for affectation in created])
+            db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise ConflictError("Impossible de creer les affectations (doublon ou contrainte)") from exc
+    _invalidate_links(*((affectation.intervenant_id, affectation.etude_id) for affectation in created))
+    return created, errors
+
+
+def create_affectations_bulk(db: Session, payloads: list[dict]) -> tuple[list[Affectation], list[tuple[int, AppError]]]:
+    return _create_affectations_bulk(db, payloads)
+
+
+def create_affectation_links_bulk(
+    db: Session, *, etude_id: int, payloads: list[dict]
+) -> tuple[list[Affectation], list[tuple[int, AppError]]]:
+    get_etude_or_404(db, etude_id)
+    return _create_affectations_bulk(
+        db,
+        [{**item, "etude_id": etude_id} for item in payloads],
+        known_etude_ids={etude_id},
+    )
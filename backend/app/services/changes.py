@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.repositories import changes as change_repo
+
+
+def list_changes(db: Session, *, since: int | None, limit: int) -> tuple[list[Row], int]:
+    if since is None:
+        changes, next_since = [], change_repo.head(db)
+    else:
+        changes = change_repo.list_changes(db, since=since, limit=limit)
+        next_since = changes[-1].seq if changes else since
+    # Long-polling calls this repeatedly: end the read transaction so that the
+    # connection goes back to the pool between two polls.
+    db.rollback()
+    return changes, next_since
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from itertools import groupby
+
+from sqlalchemy.orm import Session
+
+from app.core.errors import BusinessRuleError
+from app.repositories import affectations as affectation_repo
+from app.services.intervenants import get_intervenant_or_404
+
+ONE_DAY = timedelta(days=1)
+
+
+@dataclass(slots=True, frozen=True)
+class ChargeInterval:
+    etude_id: int
+    date_debut: date
+    date_fin: date
+    jeh: float
+
+    @property
+    def jeh_par_semaine(self) -> float:
+        # The JEH of an affectation are spread evenly over its etude window.
+        return self.jeh * 7 / ((self.date_fin - self.date_debut).days + 1)
+
+
+@dataclass(slots=True)
+class ChargeSegment:
+    date_debut: date
+    date_fin: date
+    jeh_par_semaine: float
+    etude_ids: list[int]
+    depassement: float
+
+
+@dataclass(slots=True)
+class IntervenantCharge:
+    intervenant_id: int
+    nb_jours_disponibles: int
+    segments: list[ChargeSegment] = field(default_factory=list)
+
+
+def sweep_charge(intervals: Iterable[ChargeInterval], capacite: float) -> list[ChargeSegment]:
+    # Sweep-line over the etude windows: each interval opens on date_debut and
+    # closes the day after date_fin, so the concurrent weekly demand is constant
+    # between two consecutive event dates.
+    events: list[tuple[date, int, ChargeInterval]] = []
+    for interval in intervals:
+        events.append((interval.date_debut, 1, interval))
+        events.append((interval.date_fin + ONE_DAY, -1, interval))
+    events.sort(key=lambda event: event[0])
+
+    segments: list[ChargeSegment] = []
+    active: dict[int, float] = {}
+    position = 0
+    while position < len(events):
+        day = events[position][0]
+        while position < len(events) and events[position][0] == day:
+            _, kind, interval = events[position]
+            if kind > 0:
+                active[interval.etude_id] = interval.jeh_par_semaine
+            else:
+                active.pop(interval.etude_id, None)
+            position += 1
+        if active and position < len(events):
+            demand = sum(active.values())
+            segments.append(
+                ChargeSegment(
+                    date_debut=day,
+                    date_fin=events[position][0] - ONE_DAY,
+                    jeh_par_semaine=round(demand, 2),
+                    etude_ids=sorted(active),
+                    depassement=round(max(0.0, demand - capacite), 2),
+                )
+            )
+    return segments
+
+
+def build_charges(rows) -> list[IntervenantCharge]:
+    charges = []
+    for intervenant_id, group in groupby(rows, key=lambda row: row[0]):
+        group = list(group)
+        nb_jours = group[0][1]
+        intervals = [
+            ChargeInterval(etude_id=etude_id, date_debut=date_debut, date_fin=date_fin, jeh=float(jeh))
+            for _, _, etude_id, date_debut, date_fin, jeh in group
+        ]
+        charges.append(IntervenantCharge(intervenant_id, nb_jours, sweep_charge(intervals, nb_jours)))
+    return charges
+
+
+def get_intervenant_charge(db: Session, intervenant_id: int) -> IntervenantCharge:
+    intervenant = get_intervenant_or_404(db, intervenant_id)
+    charges = build_charges(affectation_repo.charge_rows(db, intervenant_id=intervenant_id))
+    return charges[0] if charges else IntervenantCharge(intervenant_id, intervenant.nb_jours_disponibles)
+
+
+def list_charge_conflicts(
+    db: Session,
+    *,
+    date_debut: date | None = None,
+    date_fin: date | None = None,
+) -> list[IntervenantCharge]:
+    if date_debut is not None and date_fin is not None and date_fin < date_debut:
+        raise BusinessRuleError("dateFin doit etre superieure ou egale a dateDebut")
+    conflicts = []
+    for charge in build_charges(affectation_repo.charge_rows(db, date_debut=date_debut, date_fin=date_fin)):
+        charge.segments = [
+            segment
+            for segment in charge.segments
+            if segment.depassement > 0
+            and (date_debut is None or segment.date_fin >= date_debut)
+            and (date_fin is None or segment.date_debut <= date_fin)
+        ]
+        if charge.segments:
+            conflicts.append(charge)
+    return conflicts
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.errors import AppError, ConflictError, NotFoundError
+from app.models import Intervenant, PeriodeDisponibilite
+from app.repositories import changes as change_repo
+from app.repositories import disponibilites as disponibilite_repo
+from app.services.etudes import get_etude_or_404
+from app.services.intervenants import get_intervenant_or_404
+
+
+def list_periodes(db: Session, intervenant_id: int) -> list[PeriodeDisponibilite]:
+    get_intervenant_or_404(db, intervenant_id)
+    return disponibilite_repo.list_periodes(db, intervenant_id)
+
+
+def _integrity_error(exc: IntegrityError) -> AppError:
+    constraint = getattr(getattr(exc.orig, "diag", None), "constraint_name", None)
+    if constraint == "periodes_disponibilite_intervenant_id_fkey":
+        return NotFoundError("Intervenant introuvable")
+    if constraint == "ex_periodes_disponibilite_overlap":
+        return ConflictError("Cette periode chevauche une disponibilite existante")
+    return ConflictError("Impossible d'enregistrer la periode (contrainte)")
+
+
+def create_periode(db: Session, intervenant_id: int, payload: dict) -> PeriodeDisponibilite:
+    try:
+        periode = disponibilite_repo.create_periode(db, intervenant_id, payload["date_debut"], payload["date_fin"])
+        change_repo.record(db, "periode_disponibilite", "insert", [periode.id])
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise _integrity_error(exc) from exc
+    return periode
+
+
+def delete_periode(db: Session, intervenant_id: int, periode_id: int) -> None:
+    periode = disponibilite_repo.get_periode(db, intervenant_id, periode_id)
+    if periode is None:
+        raise NotFoundError("Periode de disponibilite introuvable")
+    disponibilite_repo.delete_periode(db, periode)
+    change_repo.record(db, "periode_disponibilite", "delete", [periode_id])
+    db.commit()
+
+
+def list_free_intervenants(db: Session, etude_id: int, *, min_jours: int) -> list[tuple[Intervenant, int]]:
+    get_etude_or_404(db, etude_id)
+    return disponibilite_repo.free_intervenants_for_etude(db, etude_id, min_jours=min_jours)
+
+
+def free_intervenants_by_etude(
+    db: Session,
+    *,
+    min_jours: int,
+    etude_ids: list[int] | None = None,
+) -> dict[int, list[tuple[int, int]]]:
+    grouped: dict[int, list[tuple[int, int]]] = {etude_id: [] for etude_id in etude_ids or []}
+    for etude_id, intervenant_id, jours in disponibilite_repo.free_days_by_etude(
+        db, min_jours=min_jours, etude_ids=etude_ids
+    ):
+        grouped.setdefault(etude_id, []).append((intervenant_id, jours))
+    return grouped
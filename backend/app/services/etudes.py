@@ -1,40 +1,89 @@
 from __future__ import annotations
 
+from collections.abc import Collection, Sequence
+from datetime import date
+
+from sqlalchemy import ColumnElement, Row
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.core.errors import BusinessRuleError, NotFoundError
+from app.core.cache import invalidate_etudes, invalidate_intervenants
+from app.core.concurrency import STALE_MESSAGE, ensure_version
+from app.core.errors import BusinessRuleError, NotFoundError, PreconditionFailedError
+from app.core.pagination import Page, build_page, decode_cursor
 from app.models import Etude
 from app.repositories import affectations as affectation_repo
+from app.repositories import changes as change_repo
+from app.repositories import cost_rollups as cost_rollup_repo
 from app.repositories import etudes as etude_repo
 
 
-def list_etudes(db: Session) -> list[Etude]:
-    return etude_repo.list_etudes(db)
+def list_etudes(db: Session, *, columns: Sequence[ColumnElement] | None = None) -> list[Etude] | list[Row]:
+    return etude_repo.list_etudes(db, columns=columns)
+
+
+def list_etudes_page(
+    db: Session, *, limit: int, cursor: str | None = None, columns: Sequence[ColumnElement] | None = None
+) -> Page[Etude] | Page[Row]:
+    rows = etude_repo.list_etudes(
+        db, limit=limit + 1, before_id=decode_cursor(cursor) if cursor else None, columns=columns
+    )
+    return build_page(rows, limit)
+
+
+def get_etude_or_404(db: Session, etude_id: int, *, for_update: bool = False) -> Etude:
+    etude = etude_repo.get_etude(db, etude_id, for_update=for_update)
+    if etude is None:
+        raise NotFoundError("Etude introuvable")
+    return etude
 
 
-def get_etude_or_404(db: Session, etude_id: int) -> Etude:
-    etude = etude_repo.get_etude(db, etude_id)
+def get_etude_detail(db: Session, etude_id: int) -> Etude:
+    etude = etude_repo.get_etude_with_affectations(db, etude_id)
     if etude is None:
         raise NotFoundError("Etude introuvable")
     return etude
 
 
 def create_etude(db: Session, payload: dict) -> Etude:
-    return etude_repo.create_etude(db, payload)
+    etude = etude_repo.create_etude(db, payload)
+    change_repo.record(db, "etude", "insert", [etude.id])
+    db.commit()
+    return etude
 
 
-def update_etude(db: Session, etude_id: int, payload: dict) -> Etude:
+def update_etude(db: Session, etude_id: int, payload: dict, *, if_match: Collection[int] | None = None) -> Etude:
     etude = get_etude_or_404(db, etude_id)
+    ensure_version(etude.version_id, if_match)
     next_date_debut = payload.get("date_debut", etude.date_debut)
     next_date_fin = payload.get("date_fin", etude.date_fin)
     if next_date_fin < next_date_debut:
         raise BusinessRuleError("dateFin doit etre superieure ou egale a dateDebut")
-    return etude_repo.update_etude(db, etude, payload)
+    try:
+        etude = etude_repo.update_etude(db, etude, payload)
+        intervenant_ids = affectation_repo.intervenant_ids_for_etude(db, etude.id)
+        change_repo.record(db, "etude", "update", [etude.id])
+        db.commit()
+    except StaleDataError as exc:
+        db.rollback()
+        raise PreconditionFailedError(STALE_MESSAGE) from exc
+    invalidate_intervenants(*intervenant_ids)
+    return etude
 
 
 def delete_etude(db: Session, etude_id: int) -> None:
-    etude = get_etude_or_404(db, etude_id)
-    etude_repo.delete_etude(db, etude)
+    etude = get_etude_or_404(db, etude_id, for_update=True)
+    intervenant_ids = affectation_repo.intervenant_ids_for_etude(db, etude.id)
+    try:
+        deleted = change_repo.cascaded_deletes(db, etude_id=etude.id)
+        etude_repo.delete_etude(db, etude)
+        change_repo.record_deletes(db, [*deleted, ("etude", etude_id)])
+        db.commit()
+    except StaleDataError as exc:
+        db.rollback()
+        raise PreconditionFailedError(STALE_MESSAGE) from exc
+    invalidate_intervenants(*intervenant_ids)
+    invalidate_etudes(etude_id)
 
 
 def list_intervenants_for_etude(db: Session, etude_id: int):
@@ -44,4 +93,16 @@ def list_intervenants_for_etude(db: Session, etude_id: int):
 
 def compute_etude_cost(db: Session, etude_id: int) -> tuple[float, float]:
     get_etude_or_404(db, etude_id)
-    return affectation_repo.etude_cost_totals(db, etude_id)
+    return cost_rollup_repo.get_totals(db, etude_id)
+
+
+def compute_portfolio_costs(
+    db: Session,
+    *,
+    etude_ids: list[int] | None = None,
+    date_debut: date | None = None,
+    date_fin: date | None = None,
+) -> list[tuple[int, float, float]]:
+    if date_debut is not None and date_fin is not None and date_fin < date_debut:
+        raise BusinessRuleError("dateFin doit etre superieure ou egale a dateDebut")
+    return affectation_repo.portfolio_cost_totals(db, etude_ids=etude_ids, date_debut=date_debut, date_fin=date_fin)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import csv
+import enum
+import io
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date
+from typing import Literal
+
+from app.core.database import SessionLocal
+from app.core.errors import BusinessRuleError
+from app.repositories.exports import EXPORT_COLUMNS, export_statement
+from app.services.intervenants import normalize_filters
+
+ExportResource = Literal["intervenants", "etudes", "affectations"]
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_BATCH_SIZE = 1000
+CSV_LIST_SEPARATOR = "|"
+
+
+def _json_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    value = _json_value(value)
+    if isinstance(value, list):
+        return CSV_LIST_SEPARATOR.join(value)
+    return value
+
+
+def encode_csv(header: Sequence[str], batches: Iterable[Sequence[Sequence]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(header)
+    for batch in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def encode_ndjson(header: Sequence[str], batches: Iterable[Sequence[Sequence]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(header, map(_json_value, row))), ensure_ascii=False, separators=(",", ":")) + "\n"
+            for row in batch
+        ).encode()
+
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson}
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def export_filters(
+    resource: ExportResource,
+    *,
+    search: str | None = None,
+    competence: str | None = None,
+    disponibilite: str | None = None,
+) -> dict:
+    filters = {key: value for key, value in normalize_filters(search, competence, disponibilite).items() if value}
+    if filters and resource != "intervenants":
+        raise BusinessRuleError("Les filtres ne s'appliquent qu'a l'export des intervenants")
+    return filters
+
+
+def stream_export(resource: ExportResource, export_format: ExportFormat, filters: dict) -> Iterator[bytes]:
+    # The response outlives the request-scoped session, so the export owns its own
+    # session; yield_per streams rows from a server-side cursor in fixed-size batches.
+    header = [column.key for column in EXPORT_COLUMNS[resource]]
+    stmt = export_statement(resource, filters=filters).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    with SessionLocal() as db:
+        yield from ENCODERS[export_format](header, db.execute(stmt).partitions())
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import csv
+import io
+import time
+from dataclasses import dataclass, field
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.cache import invalidate_etudes
+from app.core.errors import BusinessRuleError, ConflictError
+from app.repositories import affectations as affectation_repo
+from app.repositories import changes as change_repo
+from app.repositories import cost_rollups as cost_rollup_repo
+from app.repositories import intervenants as intervenant_repo
+from app.schemas.intervenant import IntervenantCreate
+from app.services.recommendations import invalidate_competence_index
+
+CSV_LIST_SEPARATOR = "|"
+IMPORT_FIELDS = ("nom", "email", "telephone", "competences", "tjm", "disponibilite", "nbJoursDisponibles")
+REQUIRED_FIELDS = ("nom", "email", "tjm", "disponibilite", "nbJoursDisponibles")
+
+
+@dataclass(slots=True)
+class ImportRowError:
+    line: int
+    message: str
+
+
+@dataclass(slots=True)
+class ImportReport:
+    received: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return round(self.received / (self.duration_ms / 1000), 1) if self.duration_ms else 0.0
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors())
+
+
+def read_intervenant_rows(content: bytes, report: ImportReport) -> list[tuple]:
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise BusinessRuleError("Fichier CSV illisible (encodage UTF-8 attendu)") from exc
+
+    reader = csv.DictReader(io.StringIO(text, newline=""))
+    missing = [name for name in REQUIRED_FIELDS if name not in (reader.fieldnames or [])]
+    if missing:
+        raise BusinessRuleError(f"Colonnes manquantes: {', '.join(missing)}")
+
+    rows: list[tuple] = []
+    email_lines: dict[str, int] = {}
+    for record in reader:
+        report.received += 1
+        line = reader.line_num
+        values = {name: record[name] for name in IMPORT_FIELDS if record.get(name) not in (None, "")}
+        if "competences" in values:
+            values["competences"] = values["competences"].split(CSV_LIST_SEPARATOR)
+        try:
+            intervenant = IntervenantCreate.model_validate(values)
+        except ValidationError as exc:
+            report.errors.append(ImportRowError(line=line, message=_format_validation_error(exc)))
+            continue
+        # The email is the upsert key, compared case-insensitively: a row without
+        # one could never be matched and would be inserted again on every import.
+        if intervenant.email is None:
+            report.errors.append(ImportRowError(line=line, message="email: obligatoire pour l'import"))
+            continue
+        email_key = intervenant.email.lower()
+        if email_key in email_lines:
+            message = f"Email deja present ligne {email_lines[email_key]}"
+            report.errors.append(ImportRowError(line=line, message=message))
+            continue
+        email_lines[email_key] = line
+        rows.append(
+            (
+                intervenant.nom,
+                intervenant.email,
+                intervenant.telephone,
+                intervenant.competences,
+                intervenant.disponibilite,
+                intervenant.nb_jours_disponibles,
+                intervenant.tjm,
+            )
+        )
+    return rows
+
+
+def import_intervenants(db: Session, content: bytes) -> ImportReport:
+    started = time.perf_counter()
+    report = ImportReport()
+    rows = read_intervenant_rows(content, report)
+    if rows:
+        try:
+            intervenant_repo.stage_intervenants(db, rows)
+            written = intervenant_repo.upsert_staged_intervenants(db)
+            inserted_ids = [intervenant_id for intervenant_id, inserted in written if inserted]
+            updated_ids = [intervenant_id for intervenant_id, inserted in written if not inserted]
+            report.inserted = len(inserted_ids)
+            report.updated = len(updated_ids)
+            etude_ids = affectation_repo.etude_ids_for_intervenants(db, updated_ids)
+            if etude_ids:
+                cost_rollup_repo.rebuild(db, etude_ids=etude_ids)
+            change_repo.record(db, "intervenant", "insert", inserted_ids)
+            change_repo.record(db, "intervenant", "update", updated_ids)
+            db.commit()
+        except IntegrityError as exc:
+            db.rollback()
+            raise ConflictError("Impossible d'importer les intervenants (contrainte)") from exc
+        invalidate_etudes(*etude_ids)
+        invalidate_competence_index()
+    report.unchanged = len(rows) - report.inserted - report.updated
+    report.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    return report
@@ -1,10 +1,30 @@
 from __future__ import annotations
 
+from collections.abc import Collection, Sequence
+
+from sqlalchemy import ColumnElement, Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.core.errors import NotFoundError
+from app.core.cache import invalidate_etudes, invalidate_intervenants
+from app.core.concurrency import STALE_MESSAGE, ensure_version
+from app.core.errors import BusinessRuleError, ConflictError, NotFoundError, PreconditionFailedError
+from app.core.pagination import Page, build_page, decode_cursor
 from app.models import Intervenant
+from app.repositories import affectations as affectation_repo
+from app.repositories import changes as change_repo
+from app.repositories import cost_rollups as cost_rollup_repo
 from app.repositories import intervenants as intervenant_repo
+from app.services.recommendations import invalidate_competence_index
+
+
+def normalize_filters(search: str | None, competence: str | None, disponibilite: str | None) -> dict:
+    return {
+        "search": (search or "").strip().lower() or None,
+        "competence": (competence or "").strip().lower() or None,
+        "disponibilite": (disponibilite or "").strip().lower() or None,
+    }
 
 
 def list_intervenants(
@@ -13,52 +33,103 @@ def list_intervenants(
     search: str | None = None,
     competence: str | None = None,
     disponibilite: str | None = None,
-) -> list[Intervenant]:
-    items = intervenant_repo.list_intervenants(db)
-
-    search_value = (search or "").strip().lower()
-    competence_value = (competence or "").strip().lower()
-    disponibilite_value = (disponibilite or "").strip().lower()
-
-    if not any([search_value, competence_value, disponibilite_value]):
-        return items
-
-    def matches(item: Intervenant) -> bool:
-        if disponibilite_value and item.disponibilite.value.lower() != disponibilite_value:
-            return False
-
-        if competence_value and not any(competence_value in c.lower() for c in item.competences):
-            return False
-
-        if search_value:
-            haystack = " ".join([item.nom, item.disponibilite.value, *item.competences]).lower()
-            if search_value not in haystack:
-                return False
-
-        return True
-
-    return [item for item in items if matches(item)]
+    columns: Sequence[ColumnElement] | None = None,
+) -> list[Intervenant] | list[Row]:
+    filters = normalize_filters(search, competence, disponibilite)
+    return intervenant_repo.list_intervenants(db, **filters, columns=columns)
 
 
-def get_intervenant_or_404(db: Session, intervenant_id: int) -> Intervenant:
-    intervenant = intervenant_repo.get_intervenant(db, intervenant_id)
+def list_intervenants_page(
+    db: Session,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    search: str | None = None,
+    competence: str | None = None,
+    disponibilite: str | None = None,
+    columns: Sequence[ColumnElement] | None = None,
+) -> Page[Intervenant] | Page[Row]:
+    rows = intervenant_repo.list_intervenants(
+        db,
+        **normalize_filters(search, competence, disponibilite),
+        limit=limit + 1,
+        before_id=decode_cursor(cursor) if cursor else None,
+        columns=columns,
+    )
+    return build_page(rows, limit)
+
+
+def search_intervenants(db: Session, query: str, *, limit: int) -> list[tuple[Intervenant, float, str]]:
+    query = query.strip()
+    if not query:
+        raise BusinessRuleError("Le terme de recherche est obligatoire")
+    return intervenant_repo.search_intervenants(db, query, limit=limit)
+
+
+def get_intervenant_or_404(db: Session, intervenant_id: int, *, for_update: bool = False) -> Intervenant:
+    intervenant = intervenant_repo.get_intervenant(db, intervenant_id, for_update=for_update)
     if intervenant is None:
         raise NotFoundError("Intervenant introuvable")
     return intervenant
 
 
 def create_intervenant(db: Session, payload: dict) -> Intervenant:
-    return intervenant_repo.create_intervenant(db, payload)
+    try:
+        intervenant = intervenant_repo.create_intervenant(db, payload)
+        change_repo.record(db, "intervenant", "insert", [intervenant.id])
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise ConflictError("Un intervenant avec cet email existe deja") from exc
+    invalidate_competence_index()
+    return intervenant
 
 
-def update_intervenant(db: Session, intervenant_id: int, payload: dict) -> Intervenant:
+def update_intervenant(
+    db: Session,
+    intervenant_id: int,
+    payload: dict,
+    *,
+    if_match: Collection[int] | None = None,
+) -> Intervenant:
     intervenant = get_intervenant_or_404(db, intervenant_id)
-    return intervenant_repo.update_intervenant(db, intervenant, payload)
+    ensure_version(intervenant.version_id, if_match)
+    old_tjm = intervenant.tjm
+    try:
+        intervenant = intervenant_repo.update_intervenant(db, intervenant, payload)
+        if intervenant.tjm != old_tjm:
+            cost_rollup_repo.apply_tjm_change(db, intervenant.id, old_tjm, intervenant.tjm)
+        etude_ids = affectation_repo.etude_ids_for_intervenant(db, intervenant.id)
+        change_repo.record(db, "intervenant", "update", [intervenant.id])
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise ConflictError("Un intervenant avec cet email existe deja") from exc
+    except StaleDataError as exc:
+        db.rollback()
+        raise PreconditionFailedError(STALE_MESSAGE) from exc
+    invalidate_etudes(*etude_ids)
+    invalidate_competence_index()
+    return intervenant
 
 
 def delete_intervenant(db: Session, intervenant_id: int) -> None:
-    intervenant = get_intervenant_or_404(db, intervenant_id)
-    intervenant_repo.delete_intervenant(db, intervenant)
+    # The row lock conflicts with the KEY SHARE lock taken by inserts of child
+    # rows, so none can commit between the rollup decrement, the read of the
+    # children and the cascade; the decremented etudes are those to invalidate.
+    intervenant = get_intervenant_or_404(db, intervenant_id, for_update=True)
+    try:
+        etude_ids = cost_rollup_repo.remove_intervenant(db, intervenant.id)
+        deleted = change_repo.cascaded_deletes(db, intervenant_id=intervenant.id)
+        intervenant_repo.delete_intervenant(db, intervenant)
+        change_repo.record_deletes(db, [*deleted, ("intervenant", intervenant_id)])
+        db.commit()
+    except StaleDataError as exc:
+        db.rollback()
+        raise PreconditionFailedError(STALE_MESSAGE) from exc
+    invalidate_etudes(*etude_ids)
+    invalidate_intervenants(intervenant_id)
+    invalidate_competence_index()
 
 
 def list_etudes_for_intervenant(db: Session, intervenant_id: int):
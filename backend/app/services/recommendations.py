@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models import DisponibiliteEnum
+from app.repositories import affectations as affectation_repo
+from app.repositories import intervenants as intervenant_repo
+from app.services.etudes import get_etude_or_404
+
+DISPONIBILITE_SCORES = {
+    DisponibiliteEnum.disponible: 1.0,
+    DisponibiliteEnum.occupe: 0.5,
+    DisponibiliteEnum.indisponible: 0.0,
+}
+WEIGHT_COMPETENCES = 0.4
+WEIGHT_DISPONIBILITE = 0.2
+WEIGHT_JOURS = 0.15
+WEIGHT_BUDGET = 0.15
+WEIGHT_CHARGE = 0.1
+
+
+@dataclass(slots=True)
+class CompetenceIndex:
+    ids: list[int] = field(default_factory=list)
+    noms: list[str] = field(default_factory=list)
+    tjms: list[float] = field(default_factory=list)
+    nb_jours: list[int] = field(default_factory=list)
+    competences: list[list[str]] = field(default_factory=list)
+    disponibilites: list[DisponibiliteEnum] = field(default_factory=list)
+    # Part of the score that does not depend on the request (disponibilite, nbJours).
+    static_scores: list[float] = field(default_factory=list)
+    postings: dict[str, list[int]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, rows) -> CompetenceIndex:
+        index = cls()
+        for position, (intervenant_id, nom, competences, disponibilite, nb_jours, tjm) in enumerate(rows):
+            disponibilite = DisponibiliteEnum(disponibilite)
+            index.ids.append(intervenant_id)
+            index.noms.append(nom)
+            index.tjms.append(tjm)
+            index.nb_jours.append(nb_jours)
+            index.competences.append(competences)
+            index.disponibilites.append(disponibilite)
+            index.static_scores.append(
+                WEIGHT_DISPONIBILITE * DISPONIBILITE_SCORES[disponibilite] + WEIGHT_JOURS * nb_jours / 7
+            )
+            for competence in {item.strip().lower() for item in competences}:
+                index.postings.setdefault(competence, []).append(position)
+        return index
+
+
+@dataclass(slots=True)
+class Recommendation:
+    intervenant_id: int
+    nom: str
+    score: float
+    competences_matchees: list[str]
+    disponibilite: DisponibiliteEnum
+    nb_jours_disponibles: int
+    tjm: float
+    charge_jeh: float
+
+
+_index: CompetenceIndex | None = None
+_index_built_at = 0.0
+_index_generation = 0
+_index_lock = Lock()
+
+
+def invalidate_competence_index() -> None:
+    global _index, _index_generation
+    with _index_lock:
+        _index = None
+        _index_generation += 1
+
+
+def get_competence_index(db: Session) -> CompetenceIndex:
+    global _index, _index_built_at
+    index = _index
+    if index is not None and time.monotonic() - _index_built_at < get_settings().recommendation_index_ttl_seconds:
+        return index
+    # The rows are loaded without holding the lock: under DATABASE_ASYNC this runs
+    # on the event loop, where blocking on a lock held across I/O would deadlock.
+    generation = _index_generation
+    built = CompetenceIndex.build(intervenant_repo.list_recommendation_rows(db))
+    with _index_lock:
+        if _index_generation == generation:
+            _index = built
+            _index_built_at = time.monotonic()
+    return built
+
+
+def rank_intervenants(
+    index: CompetenceIndex,
+    *,
+    competences: list[str],
+    budget: float | None,
+    charges: dict[int, float],
+    semaines: float,
+    excluded_ids: set[int],
+    limit: int,
+) -> list[Recommendation]:
+    wanted = list(dict.fromkeys(item.strip().lower() for item in competences if item.strip()))
+    matches: dict[int, int] = {}
+    for competence in wanted:
+        for position in index.postings.get(competence, ()):
+            matches[position] = matches.get(position, 0) + 1
+    candidates = matches.keys() if wanted else range(len(index.ids))
+
+    # Hot loop over up to every intervenant: the index columns are bound to locals,
+    # the score is inlined and only the current best `limit` entries are kept.
+    ids = index.ids
+    static_scores = index.static_scores
+    tjms = index.tjms
+    nb_jours = index.nb_jours
+    competence_weight = WEIGHT_COMPETENCES / len(wanted) if wanted else 0.0
+    budget_limit = float("inf") if budget is None else budget
+    best: list[tuple[float, int, int]] = []
+    for position in candidates:
+        intervenant_id = ids[position]
+        if intervenant_id in excluded_ids:
+            continue
+        value = static_scores[position]
+        if wanted:
+            value += competence_weight * matches[position]
+        tjm = tjms[position]
+        value += WEIGHT_BUDGET if tjm <= budget_limit else WEIGHT_BUDGET * budget_limit / tjm
+        capacite = nb_jours[position] * semaines
+        if capacite > 0:
+            remaining = 1 - charges.get(intervenant_id, 0.0) / capacite
+            if remaining > 0:
+                value += WEIGHT_CHARGE * remaining
+        if len(best) < limit:
+            heapq.heappush(best, (value, -intervenant_id, position))
+        elif value >= best[0][0]:
+            heapq.heappushpop(best, (value, -intervenant_id, position))
+    best.sort(reverse=True)
+
+    recommendations = []
+    for value, _, position in best:
+        intervenant_id = index.ids[position]
+        recommendations.append(
+            Recommendation(
+                intervenant_id=intervenant_id,
+                nom=index.noms[position],
+                score=round(value, 4),
+                competences_matchees=[item for item in index.competences[position] if item.strip().lower() in wanted],
+                disponibilite=index.disponibilites[position],
+                nb_jours_disponibles=index.nb_jours[position],
+                tjm=index.tjms[position],
+                charge_jeh=charges.get(intervenant_id, 0.0),
+            )
+        )
+    return recommendations
+
+
+def recommend_intervenants(
+    db: Session,
+    etude_id: int,
+    *,
+    competences: list[str],
+    budget: float | None = None,
+    limit: int = 10,
+) -> list[Recommendation]:
+    etude = get_etude_or_404(db, etude_id)
+    index = get_competence_index(db)
+    charges = affectation_repo.jeh_by_intervenant_between(db, etude.date_debut, etude.date_fin)
+    return rank_intervenants(
+        index,
+        competences=competences,
+        budget=budget,
+        charges=charges,
+        semaines=max(1.0, ((etude.date_fin - etude.date_debut).days + 1) / 7),
+        excluded_ids=set(affectation_repo.intervenant_ids_for_etude(db, etude_id)),
+        limit=limit,
+    )
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator, Sequence
+from datetime import date, timedelta
+
+from sqlalchemy import Integer, any_, func, literal, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from app.models import Affectation, DisponibiliteEnum
+from app.repositories import changes as change_repo
+from app.repositories import cost_rollups as cost_rollup_repo
+from app.repositories.bulk import allocate_ids, copy_rows
+
+PRENOMS = (
+    "Ines", "Yanis", "Sarah", "Mehdi", "Clara", "Amine", "Lea", "Hugo", "Camille", "Lucas", "Chloe", "Nathan",
+    "Manon", "Adam", "Emma", "Rayan", "Jade", "Louis", "Lina", "Gabriel", "Zoe", "Theo", "Nour", "Paul",
+)
+NOMS = (
+    "Martin", "Diallo", "Benali", "Khelifi", "Moreau", "Bensaid", "Garnier", "Perrin", "Bernard", "Dubois",
+    "Nguyen", "Lefebvre", "Traore", "Roux", "Fournier", "Haddad", "Girard", "Mercier", "Lambert", "Faure",
+)
+# Ordered from most to least common: picks follow a Zipf-like distribution.
+COMPETENCES = (
+    "SQL", "Python", "React", "Excel", "JavaScript", "Power BI", "Java", "TypeScript", "Node.js", "UX",
+    "Data", "FastAPI", "Docker", "PostgreSQL", "Spring", "Product", "Recueil besoin", "Tests API", "DevOps",
+    "CI/CD", "Cypress", "Kubernetes", "Figma", "Machine Learning", "Go", "Rust", "Terraform", "SEO",
+)
+COMPETENCE_WEIGHTS = tuple(1 / rank for rank in range(1, len(COMPETENCES) + 1))
+THEMES = ("Audit", "Refonte", "Dashboard", "Migration", "Automatisation", "Portail", "Etude de marche", "BI")
+DOMAINES = ("CRM", "RH", "Finance", "Alumni", "Facturation", "Intranet", "Logistique", "Achats", "Marketing")
+PHASES = (
+    "Cadrage", "Ateliers besoins", "Conception", "Developpement", "API CRUD", "Modelisation base de donnees",
+    "Tests", "Recette", "Deploiement", "Formation",
+)
+DISPONIBILITES = (DisponibiliteEnum.disponible, DisponibiliteEnum.occupe, DisponibiliteEnum.indisponible)
+DISPONIBILITE_WEIGHTS = (0.6, 0.25, 0.15)
+PERIODE_DEBUT = date(2024, 1, 1)
+PERIODE_JOURS = 3 * 365
+
+INTERVENANT_COLUMNS = ("id", "nom", "email", "telephone", "competences", "disponibilite", "nb_jours_disponibles", "tjm")
+ETUDE_COLUMNS = ("id", "nom", "description", "date_debut", "date_fin")
+AFFECTATION_COLUMNS = ("intervenant_id", "etude_id", "jeh", "phases")
+
+
+def _competences(rng: random.Random) -> list[str]:
+    count = rng.choices((1, 2, 3, 4, 5), weights=(10, 30, 30, 20, 10))[0]
+    picked: dict[str, None] = {}
+    while len(picked) < count:
+        picked[rng.choices(COMPETENCES, weights=COMPETENCE_WEIGHTS)[0]] = None
+    return list(picked)
+
+
+def generate_intervenants(rng: random.Random, ids: Sequence[int]) -> Iterator[tuple]:
+    for intervenant_id in ids:
+        prenom, nom = rng.choice(PRENOMS), rng.choice(NOMS)
+        disponibilite = rng.choices(DISPONIBILITES, weights=DISPONIBILITE_WEIGHTS)[0]
+        if disponibilite is DisponibiliteEnum.indisponible:
+            nb_jours = 0
+        elif disponibilite is DisponibiliteEnum.occupe:
+            nb_jours = rng.randint(1, 3)
+        else:
+            nb_jours = rng.randint(2, 7)
+        yield (
+            intervenant_id,
+            f"{prenom} {nom}",
+            f"{prenom.lower()}.{nom.lower()}.{intervenant_id}@example.org",
+            f"06{rng.randrange(10**8):08d}",
+            _competences(rng),
+            disponibilite.value,
+            nb_jours,
+            float(min(900, max(250, round(rng.gauss(470, 90), -1)))),
+        )
+
+
+def generate_etudes(rng: random.Random, ids: Sequence[int]) -> Iterator[tuple]:
+    for etude_id in ids:
+        theme, domaine = rng.choice(THEMES), rng.choice(DOMAINES)
+        date_debut = PERIODE_DEBUT + timedelta(days=rng.randrange(PERIODE_JOURS))
+        yield (
+            etude_id,
+            f"{theme} {domaine} {etude_id}",
+            f"{theme} du perimetre {domaine}.",
+            date_debut,
+            date_debut + timedelta(weeks=rng.randint(2, 26)),
+        )
+
+
+def generate_affectations(
+    rng: random.Random,
+    etude_ids: Sequence[int],
+    intervenant_ids: Sequence[int],
+    per_etude: int,
+) -> Iterator[tuple]:
+    per_etude = min(per_etude, len(intervenant_ids))
+    for etude_id in etude_ids:
+        for intervenant_id in rng.sample(intervenant_ids, per_etude):
+            yield (
+                intervenant_id,
+                etude_id,
+                rng.randint(2, 30) / 2,
+                rng.sample(PHASES, rng.randint(1, 3)),
+            )
+
+
+def _record_inserts(db: Session, intervenant_ids: list[int], etude_ids: list[int]) -> None:
+    # COPY bypasses the services, so the seeded rows are logged here for the change feed.
+    for entity, ids in (("intervenant", intervenant_ids), ("etude", etude_ids)):
+        if ids:
+            change_repo.record_selected(db, entity, "insert", select(func.unnest(literal(ids, ARRAY(Integer)))))
+    if etude_ids:
+        affectations = select(Affectation.id).where(Affectation.etude_id == any_(literal(etude_ids, ARRAY(Integer))))
+        change_repo.record_selected(db, "affectation", "insert", affectations)
+
+
+def seed_synthetic(
+    db: Session,
+    *,
+    intervenants: int,
+    etudes: int,
+    affectations_per_etude: int,
+    seed: int,
+    reset: bool = False,
+) -> dict[str, int]:
+    rng = random.Random(seed)
+    if reset:
+        # The change feed restarts with the data: its consumers resync from since=0.
+        db.execute(
+            text(
+                "TRUNCATE affectations, etude_cost_rollup, periodes_disponibilite, etudes, intervenants, change_log"
+                " RESTART IDENTITY"
+            )
+        )
+
+    intervenant_ids = allocate_ids(db, "intervenants", intervenants) if intervenants else []
+    etude_ids = allocate_ids(db, "etudes", etudes) if etudes else []
+    copy_rows(db, "intervenants", INTERVENANT_COLUMNS, generate_intervenants(rng, intervenant_ids))
+    copy_rows(db, "etudes", ETUDE_COLUMNS, generate_etudes(rng, etude_ids))
+    affectations = 0
+    if intervenant_ids and affectations_per_etude > 0:
+        rows = generate_affectations(rng, etude_ids, intervenant_ids, affectations_per_etude)
+        copy_rows(db, "affectations", AFFECTATION_COLUMNS, rows)
+        affectations = len(etude_ids) * min(affectations_per_etude, len(intervenant_ids))
+    cost_rollup_repo.rebuild(db)
+    _record_inserts(db, intervenant_ids, etude_ids)
+    db.commit()
+    return {"intervenants": len(intervenant_ids), "etudes": len(etude_ids), "affectations": affectations}
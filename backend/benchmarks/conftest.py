@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import statistics
+import time
+import warnings
+from collections.abc import Callable, Generator
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+# The application engine is built at import time from DATABASE_URL, so the
+# benchmark database has to be selected before anything under app/ is imported.
+if os.environ.get('BENCH_DATABASE_URL'):
+    os.environ['DATABASE_URL'] = os.environ['BENCH_DATABASE_URL']
+
+from sqlalchemy import Engine, func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+BASELINES_PATH = Path(__file__).with_name('baselines.json')
+BENCH_INTERVENANTS = int(os.environ.get('BENCH_INTERVENANTS', '50000'))
+BENCH_ETUDES = int(os.environ.get('BENCH_ETUDES', '10000'))
+BENCH_AFFECTATIONS_PER_ETUDE = int(os.environ.get('BENCH_AFFECTATIONS_PER_ETUDE', '5'))
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup('benchmarks')
+    group.addoption('--update-baselines', action='store_true', help='ecrit les p95 mesures dans baselines.json')
+    group.addoption(
+        '--regression-threshold',
+        type=float,
+        default=float(os.environ.get('BENCH_REGRESSION_THRESHOLD', '0.25')),
+        help='hausse relative du p95 toleree par rapport a la baseline (defaut 0.25)',
+    )
+    group.addoption(
+        '--allow-missing-baselines',
+        action='store_true',
+        help='avertit au lieu d\'echouer quand un benchmark n\'a pas de baseline',
+    )
+
+
+@dataclass(slots=True)
+class BenchResult:
+    name: str
+    samples_ms: list[float]
+
+    @property
+    def p50(self) -> float:
+        return statistics.median(self.samples_ms)
+
+    @property
+    def p95(self) -> float:
+        ordered = sorted(self.samples_ms)
+        return ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)]
+
+
+results_key = pytest.StashKey[dict[str, BenchResult]]()
+
+
+def measure(name: str, fn: Callable[[], object], *, rounds: int, warmup: int) -> BenchResult:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return BenchResult(name=name, samples_ms=samples)
+
+
+class BenchSession:
+    def __init__(self, baselines: dict[str, float], threshold: float):
+        self.baselines = baselines
+        self.threshold = threshold
+        self.results: dict[str, BenchResult] = {}
+
+    def run(self, name: str, fn: Callable[[], object], *, rounds: int = 50, warmup: int = 5) -> BenchResult:
+        result = measure(name, fn, rounds=rounds, warmup=warmup)
+        self.results[name] = result
+        return result
+
+    def regression(self, result: BenchResult) -> str | None:
+        baseline = self.baselines.get(result.name)
+        if baseline is None:
+            return f'{result.name}: aucune baseline dans {BASELINES_PATH.name}, lancer avec --update-baselines'
+        if result.p95 <= baseline * (1 + self.threshold):
+            return None
+        return f'{result.name}: p95 {result.p95:.2f} ms > baseline {baseline:.2f} ms (+{self.threshold:.0%} tolere)'
+
+
+@pytest.fixture(scope='session')
+def bench_session(pytestconfig: pytest.Config) -> Generator[BenchSession, None, None]:
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    session = BenchSession(baselines, pytestconfig.getoption('regression_threshold'))
+    yield session
+    if pytestconfig.getoption('update_baselines') and session.results:
+        baselines.update({name: round(result.p95, 3) for name, result in session.results.items()})
+        BASELINES_PATH.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + '\n')
+    pytestconfig.stash[results_key] = session.results
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest, bench_session: BenchSession) -> Callable[..., BenchResult]:
+    def run(fn: Callable[[], object], *, rounds: int = 50, warmup: int = 5) -> BenchResult:
+        result = bench_session.run(request.node.name, fn, rounds=rounds, warmup=warmup)
+        failure = None if request.config.getoption('update_baselines') else bench_session.regression(result)
+        missing = result.name not in bench_session.baselines
+        if failure and missing and request.config.getoption('allow_missing_baselines'):
+            warnings.warn(failure, pytest.PytestWarning, stacklevel=2)
+        elif failure:
+            pytest.fail(failure)
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    results = config.stash.get(results_key, {})
+    if not results:
+        return
+    terminalreporter.section('benchmarks (ms)')
+    terminalreporter.write_line(f"{'nom':<48} {'p50':>10} {'p95':>10} {'tours':>6}")
+    for name, result in sorted(results.items()):
+        terminalreporter.write_line(f'{name:<48} {result.p50:>10.2f} {result.p95:>10.2f} {len(result.samples_ms):>6}')
+
+
+@pytest.fixture(scope='session')
+def bench_engine() -> Engine:
+    if not os.environ.get('BENCH_DATABASE_URL'):
+        pytest.skip('BENCH_DATABASE_URL non defini: benchmarks PostgreSQL ignores')
+    from app.core.database import engine
+    from app.models import Intervenant
+    from app.synthetic_data import seed_synthetic
+
+    with Session(engine) as db:
+        if db.scalar(select(func.count(Intervenant.id))) < BENCH_INTERVENANTS:
+            seed_synthetic(
+                db,
+                intervenants=BENCH_INTERVENANTS,
+                etudes=BENCH_ETUDES,
+                affectations_per_etude=BENCH_AFFECTATIONS_PER_ETUDE,
+                seed=42,
+                reset=True,
+            )
+    return engine
+
+
+@pytest.fixture
+def bench_db(bench_engine: Engine) -> Generator[Session, None, None]:
+    # Writes made by a benchmark are rolled back so every run sees the same dataset.
+    with bench_engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(bind=connection, join_transaction_mode='create_savepoint', expire_on_commit=False)
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
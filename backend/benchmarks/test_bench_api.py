@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import Engine, select
+from sqlalchemy.orm import Session
+
+from app.models import Etude
+from app.schemas.intervenant import IntervenantRead
+from app.synthetic_data import INTERVENANT_COLUMNS, generate_intervenants
+
+IntervenantList = TypeAdapter(list[IntervenantRead])
+
+
+@pytest.fixture(scope='module')
+def client(bench_engine: Engine) -> TestClient:
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize('size', [1000, 10000])
+def test_serialize_intervenant_read_list(benchmark, size: int) -> None:
+    generated = generate_intervenants(random.Random(42), range(1, size + 1))
+    rows = [{**dict(zip(INTERVENANT_COLUMNS, row)), 'version_id': 1} for row in generated]
+    benchmark(lambda: IntervenantList.dump_json(IntervenantList.validate_python(rows)), rounds=20, warmup=2)
+
+
+@pytest.mark.parametrize(
+    'path',
+    [
+        '/intervenants?limit=100',
+        '/intervenants?limit=100&competence=python',
+        '/etudes?limit=100',
+        '/affectations?limit=100',
+    ],
+    ids=['intervenants', 'intervenants-competence', 'etudes', 'affectations'],
+)
+def test_list_endpoint(benchmark, client: TestClient, path: str) -> None:
+    benchmark(lambda: client.get(path).raise_for_status())
+
+
+def test_etude_detail_endpoint(benchmark, client: TestClient, bench_engine: Engine) -> None:
+    with Session(bench_engine) as db:
+        etude_ids = list(db.scalars(select(Etude.id).limit(200)))
+    rng = random.Random(1)
+    benchmark(lambda: client.get(f'/etudes/{rng.choice(etude_ids)}/detail').raise_for_status())
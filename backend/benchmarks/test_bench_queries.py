@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import Affectation, Etude, Intervenant
+from app.repositories import affectations as affectation_repo
+from app.repositories import intervenants as intervenant_repo
+from app.services import affectations as affectation_service
+from app.services import etudes as etude_service
+from app.services import intervenants as intervenant_service
+from app.services.recommendations import CompetenceIndex, rank_intervenants
+
+RANK_TARGET_MS = 50
+
+
+@pytest.mark.parametrize(
+    'filters',
+    [
+        {'search': 'martin'},
+        {'competence': 'react'},
+        {'disponibilite': 'disponible'},
+        {'search': 'nguyen', 'competence': 'sql', 'disponibilite': 'occupé'},
+    ],
+    ids=['search', 'competence', 'disponibilite', 'combined'],
+)
+def test_list_intervenants_filtered_page(benchmark, bench_db: Session, filters: dict) -> None:
+    benchmark(lambda: intervenant_service.list_intervenants_page(bench_db, limit=50, **filters))
+
+
+def test_list_intervenants_filtered_full(benchmark, bench_db: Session) -> None:
+    benchmark(lambda: intervenant_service.list_intervenants(bench_db, competence='rust'), rounds=20)
+
+
+def test_etude_cost_totals(benchmark, bench_db: Session) -> None:
+    etude_ids = list(bench_db.scalars(select(Etude.id).order_by(func.random()).limit(200)))
+    rng = random.Random(1)
+    benchmark(lambda: affectation_repo.etude_cost_totals(bench_db, rng.choice(etude_ids)))
+
+
+def test_compute_etude_cost_from_rollup(benchmark, bench_db: Session) -> None:
+    etude_ids = list(bench_db.scalars(select(Etude.id).order_by(func.random()).limit(200)))
+    rng = random.Random(1)
+    benchmark(lambda: etude_service.compute_etude_cost(bench_db, rng.choice(etude_ids)))
+
+
+def test_create_affectation(benchmark, bench_db: Session) -> None:
+    etude = etude_service.create_etude(
+        bench_db, {'nom': 'Benchmark', 'date_debut': '2026-01-01', 'date_fin': '2026-03-31'}
+    )
+    assigned = select(Affectation.intervenant_id).where(Affectation.etude_id == etude.id)
+    candidates = iter(bench_db.scalars(select(Intervenant.id).where(Intervenant.id.not_in(assigned)).limit(200)))
+    benchmark(
+        lambda: affectation_service.create_affectation(
+            bench_db, {'intervenant_id': next(candidates), 'etude_id': etude.id, 'jeh': 2, 'phases': []}
+        ),
+        rounds=150,
+        warmup=10,
+    )
+
+
+@pytest.mark.parametrize(
+    'competences', [['react', 'sql'], ['python', 'docker', 'kubernetes'], []], ids=['common', 'rare', 'none']
+)
+def test_rank_intervenants(benchmark, bench_db: Session, competences: list[str]) -> None:
+    # In-memory ranking over every intervenant of the dataset, the index and the
+    # charges being those recommend_intervenants has already loaded.
+    index = CompetenceIndex.build(intervenant_repo.list_recommendation_rows(bench_db))
+    etude = bench_db.scalars(select(Etude).order_by(Etude.id).limit(1)).one()
+    charges = affectation_repo.jeh_by_intervenant_between(bench_db, etude.date_debut, etude.date_fin)
+    excluded_ids = set(affectation_repo.intervenant_ids_for_etude(bench_db, etude.id))
+
+    result = benchmark(
+        lambda: rank_intervenants(
+            index,
+            competences=competences,
+            budget=450,
+            charges=charges,
+            semaines=8,
+            excluded_ids=excluded_ids,
+            limit=10,
+        )
+    )
+
+    assert result.p95 < RANK_TARGET_MS
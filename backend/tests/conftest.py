@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Generator
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope='session')
+def pg_engine() -> Generator[Engine, None, None]:
+    url = os.environ.get('TEST_DATABASE_URL')
+    if not url:
+        pytest.skip('TEST_DATABASE_URL non defini: tests PostgreSQL ignores')
+
+    engine = create_engine(url)
+    config = Config(str(BACKEND_DIR / 'alembic.ini'))
+    config.set_main_option('script_location', str(BACKEND_DIR / 'alembic'))
+    with engine.begin() as connection:
+        config.attributes['connection'] = connection
+        command.upgrade(config, 'head')
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(pg_engine: Engine) -> Generator[Session, None, None]:
+    # Every test runs inside an outer transaction rolled back at the end; commits
+    # issued by the repositories only release savepoints.
+    with pg_engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(
+            bind=connection,
+            join_transaction_mode='create_savepoint',
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+
+
+@pytest.fixture
+def recorded_statements(db_session: Session) -> Generator[list[str], None, None]:
+    statements: list[str] = []
+    connection = db_session.connection()
+
+    def record(_conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+        if not statement.lstrip().upper().startswith(('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')):
+            statements.append(statement)
+
+    event.listen(connection, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, 'before_cursor_execute', record)
+
+
+@pytest.fixture
+def violation() -> Callable[[str], IntegrityError]:
+    # IntegrityError as raised by psycopg for the named constraint, for the
+    # services that map violations to API errors.
+    def build(constraint: str) -> IntegrityError:
+        orig = SimpleNamespace(diag=SimpleNamespace(constraint_name=constraint))
+        return IntegrityError('INSERT ...', {}, orig)
+
+    return build
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.errors import NotFoundError
+from app.main import app
+from app.repositories import affectations as affectation_repo
+from app.repositories import cost_rollups as cost_rollup_repo
+from app.repositories import etudes as etude_repo
+from app.repositories import intervenants as intervenant_repo
+from app.services import affectations as affectation_service
+from app.services import etudes as etude_service
+from app.services import intervenants as intervenant_service
+
+
+def _not_found_body(lookup, monkeypatch: pytest.MonkeyPatch) -> dict:
+    monkeypatch.setattr(intervenant_repo, 'get_intervenant', lambda _db, _id, **_kwargs: None)
+    monkeypatch.setattr(etude_repo, 'get_etude', lambda _db, _id, **_kwargs: None)
+    with pytest.raises(NotFoundError) as error:
+        lookup(None, 1)
+    return {'message': error.value.message, 'code': error.value.code}
+
+
+@pytest.mark.parametrize(
+    ('constraint', 'lookup'),
+    [
+        ('affectations_intervenant_id_fkey', intervenant_service.get_intervenant_or_404),
+        ('affectations_etude_id_fkey', etude_service.get_etude_or_404),
+    ],
+)
+def test_foreign_key_violations_answer_like_the_existence_checks(
+    constraint: str, lookup, violation, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def insert(_db, _payload):
+        raise violation(constraint)
+
+    def upsert(_db, **_kwargs):
+        raise violation(constraint)
+
+    monkeypatch.setattr(affectation_repo, 'insert_affectation_if_absent', insert)
+    monkeypatch.setattr(affectation_repo, 'upsert_affectation_link', upsert)
+    expected = _not_found_body(lookup, monkeypatch)
+    client = TestClient(app)
+
+    created = client.post('/affectations', json={'intervenantId': 998, 'etudeId': 999, 'jeh': 2})
+    linked = client.post('/etudes/999/intervenants/998', json={'jeh': 2})
+    upserted = client.put('/etudes/999/intervenants/998', json={'jeh': 2})
+
+    for response in (created, linked, upserted):
+        assert response.status_code == 404
+        assert response.json() == expected
+
+
+@pytest.mark.parametrize(
+    ('constraint', 'lookup', 'payload'),
+    [
+        ('affectations_intervenant_id_fkey', intervenant_service.get_intervenant_or_404, {'intervenantId': 998}),
+        ('affectations_etude_id_fkey', etude_service.get_etude_or_404, {'etudeId': 999}),
+    ],
+)
+def test_update_to_an_unknown_parent_answers_like_the_existence_checks(
+    constraint: str, lookup, payload: dict, violation, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    affectation = SimpleNamespace(id=5, version_id=1, intervenant_id=1, etude_id=2, jeh=2)
+
+    def update(_db, _affectation, _payload):
+        raise violation(constraint)
+
+    monkeypatch.setattr(affectation_repo, 'get_affectation', lambda _db, _id: affectation)
+    monkeypatch.setattr(cost_rollup_repo, 'remove_affectations', lambda _db, _ids: None)
+    monkeypatch.setattr(affectation_repo, 'update_affectation', update)
+    expected = _not_found_body(lookup, monkeypatch)
+
+    response = TestClient(app).put('/affectations/5', json=payload)
+
+    assert response.status_code == 404
+    assert response.json() == expected
+
+
+def test_duplicate_link_violation_is_a_conflict(violation, monkeypatch: pytest.MonkeyPatch) -> None:
+    def insert(_db, _payload):
+        raise violation('uq_affectations_intervenant_etude')
+
+    monkeypatch.setattr(affectation_repo, 'insert_affectation_if_absent', insert)
+
+    response = TestClient(app).post('/affectations', json={'intervenantId': 1, 'etudeId': 2, 'jeh': 2})
+
+    assert response.status_code == 409
+    assert response.json() == {'message': 'Cet intervenant est deja affecte a cette etude', 'code': 'conflict'}
+
+
+def test_missing_etude_is_reported_from_the_foreign_key(db_session: Session) -> None:
+    intervenant = intervenant_service.create_intervenant(
+        db_session,
+        {'nom': 'Lea Garnier', 'disponibilite': 'Disponible', 'nb_jours_disponibles': 4, 'tjm': 410},
+    )
+
+    with pytest.raises(NotFoundError, match='Etude introuvable'):
+        affectation_service.create_affectation(
+            db_session, {'intervenant_id': intervenant.id, 'etude_id': 2_000_000_000, 'jeh': 1, 'phases': []}
+        )
+
+
+@pytest.mark.parametrize(
+    ('field', 'message'),
+    [('intervenant_id', 'Intervenant introuvable'), ('etude_id', 'Etude introuvable')],
+)
+def test_update_to_a_missing_parent_is_reported_from_the_foreign_key(
+    db_session: Session, field: str, message: str
+) -> None:
+    intervenant = intervenant_service.create_intervenant(
+        db_session,
+        {'nom': 'Lea Garnier', 'disponibilite': 'Disponible', 'nb_jours_disponibles': 4, 'tjm': 410},
+    )
+    etude = etude_service.create_etude(
+        db_session, {'nom': 'Audit CRM', 'date_debut': date(2026, 2, 1), 'date_fin': date(2026, 4, 15)}
+    )
+    affectation = affectation_service.create_affectation(
+        db_session, {'intervenant_id': intervenant.id, 'etude_id': etude.id, 'jeh': 1, 'phases': []}
+    )
+
+    with pytest.raises(NotFoundError, match=message):
+        affectation_service.update_affectation(db_session, affectation.id, {field: 2_000_000_000})
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.errors import AppError, ConflictError, NotFoundError
+from app.main import app
+from app.repositories import affectations as affectation_repo
+from app.repositories import changes as change_repo
+from app.repositories import cost_rollups as cost_rollup_repo
+from app.services import affectations as affectation_service
+from app.services import etudes as etude_service
+from app.services import intervenants as intervenant_service
+
+UNKNOWN_ID = 999_999
+
+
+@pytest.fixture
+def staffing(db_session: Session) -> dict:
+    ines = intervenant_service.create_intervenant(
+        db_session,
+        {'nom': 'Ines Martin', 'disponibilite': 'Disponible', 'nb_jours_disponibles': 4, 'tjm': 450},
+    )
+    yanis = intervenant_service.create_intervenant(
+        db_session,
+        {'nom': 'Yanis Diallo', 'disponibilite': 'Occupé', 'nb_jours_disponibles': 1, 'tjm': 500},
+    )
+    crm = etude_service.create_etude(
+        db_session,
+        {'nom': 'Audit CRM', 'date_debut': date(2026, 2, 1), 'date_fin': date(2026, 4, 15)},
+    )
+    bi = etude_service.create_etude(
+        db_session,
+        {'nom': 'BI Finance', 'date_debut': date(2026, 2, 15), 'date_fin': date(2026, 5, 31)},
+    )
+    affectation_service.create_affectation(
+        db_session, {'intervenant_id': ines.id, 'etude_id': crm.id, 'jeh': 3, 'phases': []}
+    )
+    return {'ines': ines.id, 'yanis': yanis.id, 'crm': crm.id, 'bi': bi.id}
+
+
+def _unit_error(db: Session, payload: dict) -> AppError:
+    with pytest.raises(AppError) as error:
+        affectation_service.create_affectation(db, payload)
+    return error.value
+
+
+def test_bulk_reports_invalid_items_by_index_like_the_unit_endpoint(db_session: Session, staffing: dict) -> None:
+    payloads = [
+        {'intervenant_id': staffing['yanis'], 'etude_id': staffing['crm'], 'jeh': 2, 'phases': []},
+        {'intervenant_id': UNKNOWN_ID, 'etude_id': staffing['crm'], 'jeh': 1, 'phases': []},
+        {'intervenant_id': staffing['ines'], 'etude_id': UNKNOWN_ID, 'jeh': 1, 'phases': []},
+        {'intervenant_id': staffing['ines'], 'etude_id': staffing['crm'], 'jeh': 1, 'phases': []},
+        {'intervenant_id': staffing['yanis'], 'etude_id': staffing['bi'], 'jeh': 4, 'phases': ['Cadrage']},
+        {'intervenant_id': staffing['yanis'], 'etude_id': staffing['bi'], 'jeh': 5, 'phases': []},
+    ]
+    since = change_repo.head(db_session)
+
+    created, errors = affectation_service.create_affectations_bulk(db_session, payloads)
+
+    assert [(item.intervenant_id, item.etude_id, item.jeh) for item in created] == [
+        (staffing['yanis'], staffing['crm'], 2),
+        (staffing['yanis'], staffing['bi'], 4),
+    ]
+    assert [(index, type(error), error.code, error.message) for index, error in errors] == [
+        (1, NotFoundError, 'not_found', 'Intervenant introuvable'),
+        (2, NotFoundError, 'not_found', 'Etude introuvable'),
+        (3, ConflictError, 'conflict', affectation_service.DUPLICATE_LINK_MESSAGE),
+        (5, ConflictError, 'conflict', affectation_service.DUPLICATE_LINK_MESSAGE),
+    ]
+    changes = change_repo.list_changes(db_session, since=since, limit=10)
+    assert [(change.entity, change.entity_id, change.operation) for change in changes] == [
+        ('affectation', item.id, 'insert') for item in created
+    ]
+    for etude_id in (staffing['crm'], staffing['bi']):
+        totals = cost_rollup_repo.get_totals(db_session, etude_id)
+        assert totals == pytest.approx(affectation_repo.etude_cost_totals(db_session, etude_id))
+    assert cost_rollup_repo.get_totals(db_session, staffing['bi']) == pytest.approx((4, 2000))
+
+    for index, error in errors:
+        unit = _unit_error(db_session, payloads[index])
+        assert (unit.code, unit.message) == (error.code, error.message)
+
+
+def test_bulk_checks_each_table_once_and_inserts_in_one_statement(
+    db_session: Session, staffing: dict, recorded_statements: list[str]
+) -> None:
+    recorded_statements.clear()
+
+    affectation_service.create_affectations_bulk(
+        db_session,
+        [
+            {'intervenant_id': staffing['yanis'], 'etude_id': staffing['crm'], 'jeh': 2, 'phases': []},
+            {'intervenant_id': staffing['yanis'], 'etude_id': staffing['bi'], 'jeh': 4, 'phases': []},
+            {'intervenant_id': staffing['ines'], 'etude_id': staffing['bi'], 'jeh': 1, 'phases': []},
+        ],
+    )
+
+    assert recorded_statements[0].startswith('SELECT intervenants.id')
+    assert recorded_statements[1].startswith('SELECT etudes.id')
+    assert recorded_statements[2].startswith('SELECT affectations.intervenant_id, affectations.etude_id')
+    assert recorded_statements[3].startswith('INSERT INTO affectations')
+    assert 'RETURNING' in recorded_statements[3]
+    for marker in ('intervenants.id IN', 'etudes.id IN', 'INSERT INTO affectations'):
+        assert sum(marker in statement for statement in recorded_statements) == 1
+
+
+def test_bulk_links_reuse_the_path_etude(db_session: Session, staffing: dict, recorded_statements: list[str]) -> None:
+    recorded_statements.clear()
+
+    created, errors = affectation_service.create_affectation_links_bulk(
+        db_session,
+        etude_id=staffing['bi'],
+        payloads=[
+            {'intervenant_id': staffing['ines'], 'jeh': 2, 'phases': []},
+            {'intervenant_id': UNKNOWN_ID, 'jeh': 1, 'phases': []},
+        ],
+    )
+
+    assert [(item.intervenant_id, item.etude_id) for item in created] == [(staffing['ines'], staffing['bi'])]
+    assert [(index, error.message) for index, error in errors] == [(1, 'Intervenant introuvable')]
+    assert not any('etudes.id IN' in statement for statement in recorded_statements)
+    assert sum(statement.startswith('INSERT INTO affectations') for statement in recorded_statements) == 1
+    with pytest.raises(NotFoundError):
+        affectation_service.create_affectation_links_bulk(db_session, etude_id=UNKNOWN_ID, payloads=[])
+
+
+@pytest.mark.parametrize(
+    ('path', 'service', 'item'),
+    [
+        ('/affectations/bulk', 'create_affectations_bulk', {'intervenantId': 1, 'etudeId': 2, 'jeh': 2}),
+        ('/etudes/2/intervenants/bulk', 'create_affectation_links_bulk', {'intervenantId': 1, 'jeh': 2}),
+    ],
+)
+def test_bulk_routes_answer_created_rows_and_indexed_errors(
+    path: str, service: str, item: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def create(_db, *_args, **_kwargs):
+        return [], [(1, NotFoundError('Intervenant introuvable'))]
+
+    monkeypatch.setattr(affectation_service, service, create)
+
+    response = TestClient(app).post(path, json={'items': [item, item]})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        'created': [],
+        'errors': [{'index': 1, 'code': 'not_found', 'message': 'Intervenant introuvable'}],
+    }
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import cache as cache_module
+from app.core.cache import InMemoryCache, etude_cout_total_key, invalidate_etudes
+from app.main import app
+from app.services import etudes as etude_service
+
+
+def test_in_memory_cache_expires_and_evicts_least_recently_used() -> None:
+    cache = InMemoryCache(max_entries=2)
+    cache.set('a', b'1', ttl=60)
+    cache.set('b', b'2', ttl=60)
+    assert cache.get('a') == b'1'
+
+    cache.set('c', b'3', ttl=60)
+    cache.set('d', b'4', ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is None
+    assert cache.get('c') == b'3'
+    assert cache.get('d') is None
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+@pytest.fixture
+def cout_total_calls(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+
+    def compute_etude_cost(_db, etude_id: int) -> tuple[float, float]:
+        calls.append(etude_id)
+        return 7.0, 3250.0
+
+    monkeypatch.setattr(cache_module, 'cache', InMemoryCache())
+    monkeypatch.setattr(etude_service, 'compute_etude_cost', compute_etude_cost)
+    return calls
+
+
+def test_cout_total_is_cached_and_revalidated_with_etag(cout_total_calls: list[int]) -> None:
+    client = TestClient(app)
+
+    first = client.get('/etudes/12/cout-total')
+    second = client.get('/etudes/12/cout-total', headers={'If-None-Match': first.headers['etag']})
+
+    assert first.status_code == 200
+    assert first.json() == {'etudeId': 12, 'totalJeh': 7.0, 'coutTotal': 3250.0, 'devise': 'EUR'}
+    assert second.status_code == 304
+    assert second.content == b''
+    assert cout_total_calls == [12]
+    assert cache_module.cache.get(etude_cout_total_key(12)) is not None
+
+
+def test_writes_invalidate_cached_entries(cout_total_calls: list[int]) -> None:
+    client = TestClient(app)
+    client.get('/etudes/12/cout-total')
+
+    invalidate_etudes(12)
+    client.get('/etudes/12/cout-total')
+
+    assert cout_total_calls == [12, 12]
+
+
+def test_entry_invalidated_during_load_is_not_stored(monkeypatch: pytest.MonkeyPatch) -> None:
+    def compute_etude_cost(_db, etude_id: int) -> tuple[float, float]:
+        invalidate_etudes(etude_id)
+        return 7.0, 3250.0
+
+    monkeypatch.setattr(cache_module, 'cache', InMemoryCache())
+    monkeypatch.setattr(etude_service, 'compute_etude_cost', compute_etude_cost)
+
+    response = TestClient(app).get('/etudes/12/cout-total')
+
+    assert response.status_code == 200
+    assert cache_module.cache.get(etude_cout_total_key(12)) is None
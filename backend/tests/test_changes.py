@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections import namedtuple
+from datetime import date, datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.main import app
+from app.repositories import changes as change_repo
+from app.services import affectations as affectation_service
+from app.services import changes as change_service
+from app.services import etudes as etude_service
+from app.services import intervenants as intervenant_service
+
+Change = namedtuple('Change', ['seq', 'entity', 'entity_id', 'operation', 'changed_at'])
+CHANGED_AT = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def polls(monkeypatch: pytest.MonkeyPatch) -> list[int | None]:
+    calls: list[int | None] = []
+
+    def list_changes(_db, *, since: int | None, limit: int):
+        calls.append(since)
+        if since is None:
+            return [], 41
+        if len(calls) < 3:
+            return [], since
+        return [Change(since + 1, 'affectation', 7, 'update', CHANGED_AT)], since + 1
+
+    monkeypatch.setattr(change_service, 'list_changes', list_changes)
+    monkeypatch.setattr(get_settings(), 'changes_poll_interval_seconds', 0.01)
+    return calls
+
+
+def test_changes_without_since_returns_the_current_position(polls: list[int | None]) -> None:
+    response = TestClient(app).get('/changes', params={'wait': 5})
+
+    assert response.json() == {'changes': [], 'nextSince': 41}
+    assert polls == [None]
+
+
+def test_changes_long_poll_until_a_change_is_committed(polls: list[int | None]) -> None:
+    response = TestClient(app).get('/changes', params={'since': 41, 'wait': 5})
+
+    assert response.json() == {
+        'changes': [
+            {
+                'seq': 42,
+                'entity': 'affectation',
+                'entityId': 7,
+                'operation': 'update',
+                'changedAt': '2026-10-18T09:30:00Z',
+            }
+        ],
+        'nextSince': 42,
+    }
+    assert polls == [41, 41, 41]
+
+
+def test_changes_without_wait_answers_immediately(polls: list[int | None]) -> None:
+    response = TestClient(app).get('/changes', params={'since': 41})
+
+    assert response.json() == {'changes': [], 'nextSince': 41}
+    assert polls == [41]
+
+
+def test_service_writes_append_ordered_changes(db_session: Session) -> None:
+    since = change_repo.head(db_session)
+    intervenant = intervenant_service.create_intervenant(
+        db_session,
+        {'nom': 'Clara Moreau', 'disponibilite': 'Disponible', 'nb_jours_disponibles': 3, 'tjm': 430},
+    )
+    etude = etude_service.create_etude(
+        db_session,
+        {'nom': 'Portail Alumni', 'date_debut': date(2026, 3, 10), 'date_fin': date(2026, 5, 10)},
+    )
+    affectation = affectation_service.create_affectation(
+        db_session, {'intervenant_id': intervenant.id, 'etude_id': etude.id, 'jeh': 3, 'phases': []}
+    )
+    etude_service.delete_etude(db_session, etude.id)
+
+    changes = change_repo.list_changes(db_session, since=since, limit=10)
+
+    assert [(change.entity, change.entity_id, change.operation) for change in changes] == [
+        ('intervenant', intervenant.id, 'insert'),
+        ('etude', etude.id, 'insert'),
+        ('affectation', affectation.id, 'insert'),
+        ('affectation', affectation.id, 'delete'),
+        ('etude', etude.id, 'delete'),
+    ]
+    assert [change.seq for change in changes] == sorted(change.seq for change in changes)
+
+
+def test_deletes_lock_the_parent_before_collecting_cascaded_children(
+    db_session: Session, recorded_statements: list[str]
+) -> None:
+    intervenant = intervenant_service.create_intervenant(
+        db_session,
+        {'nom': 'Lea Garnier', 'disponibilite': 'Disponible', 'nb_jours_disponibles': 4, 'tjm': 410},
+    )
+    etude = etude_service.create_etude(
+        db_session,
+        {'nom': 'Audit SI', 'date_debut': date(2026, 1, 5), 'date_fin': date(2026, 2, 20)},
+    )
+    affectation_service.create_affectation(
+        db_session, {'intervenant_id': intervenant.id, 'etude_id': etude.id, 'jeh': 2, 'phases': []}
+    )
+
+    for delete, table in (
+        (etude_service.delete_etude, 'etudes'),
+        (intervenant_service.delete_intervenant, 'intervenants'),
+    ):
+        recorded_statements.clear()
+        delete(db_session, etude.id if table == 'etudes' else intervenant.id)
+
+        assert recorded_statements[0].startswith('SELECT')
+        assert f'FROM {table}' in recorded_statements[0]
+        assert recorded_statements[0].rstrip().endswith('FOR UPDATE')
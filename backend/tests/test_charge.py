@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import date
+
+from app.services.charge import ChargeInterval, build_charges, sweep_charge
+
+
+def test_sweep_charge_sums_concurrent_weekly_demand() -> None:
+    intervals = [
+        ChargeInterval(etude_id=1, date_debut=date(2026, 3, 2), date_fin=date(2026, 3, 15), jeh=6),
+        ChargeInterval(etude_id=2, date_debut=date(2026, 3, 9), date_fin=date(2026, 3, 22), jeh=4),
+    ]
+
+    segments = sweep_charge(intervals, capacite=4)
+
+    assert [(s.date_debut, s.date_fin, s.jeh_par_semaine, s.etude_ids, s.depassement) for s in segments] == [
+        (date(2026, 3, 2), date(2026, 3, 8), 3.0, [1], 0.0),
+        (date(2026, 3, 9), date(2026, 3, 15), 5.0, [1, 2], 1.0),
+        (date(2026, 3, 16), date(2026, 3, 22), 2.0, [2], 0.0),
+    ]
+
+
+def test_sweep_charge_skips_gaps_and_handles_back_to_back_etudes() -> None:
+    intervals = [
+        ChargeInterval(etude_id=3, date_debut=date(2026, 4, 6), date_fin=date(2026, 4, 12), jeh=2),
+        ChargeInterval(etude_id=1, date_debut=date(2026, 3, 2), date_fin=date(2026, 3, 8), jeh=1),
+        ChargeInterval(etude_id=2, date_debut=date(2026, 3, 9), date_fin=date(2026, 3, 15), jeh=1),
+    ]
+
+    segments = sweep_charge(intervals, capacite=2)
+
+    assert [(s.date_debut, s.date_fin, s.etude_ids) for s in segments] == [
+        (date(2026, 3, 2), date(2026, 3, 8), [1]),
+        (date(2026, 3, 9), date(2026, 3, 15), [2]),
+        (date(2026, 4, 6), date(2026, 4, 12), [3]),
+    ]
+    assert all(segment.depassement == 0 for segment in segments)
+
+
+def test_build_charges_groups_rows_by_intervenant() -> None:
+    rows = [
+        (1, 2, 10, date(2026, 3, 2), date(2026, 3, 8), 3),
+        (1, 2, 11, date(2026, 3, 2), date(2026, 3, 8), 1),
+        (2, 5, 10, date(2026, 3, 2), date(2026, 3, 8), 3),
+    ]
+
+    charges = build_charges(rows)
+
+    assert [(charge.intervenant_id, charge.nb_jours_disponibles) for charge in charges] == [(1, 2), (2, 5)]
+    assert [segment.depassement for segment in charges[0].segments] == [2.0]
+    assert [segment.depassement for segment in charges[1].segments] == [0.0]
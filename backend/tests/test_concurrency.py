@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api.caching import if_match_versions
+from app.main import app
+from app.models import Etude
+from app.services import etudes as etude_service
+
+
+def _request(if_match: str | None) -> Request:
+    headers = [(b'if-match', if_match.encode())] if if_match is not None else []
+    return Request({'type': 'http', 'method': 'PUT', 'headers': headers})
+
+
+def test_if_match_versions_uses_strong_comparison() -> None:
+    assert if_match_versions(_request(None)) is None
+    assert if_match_versions(_request('*')) is None
+    assert if_match_versions(_request('"3", "5"')) == {3, 5}
+    assert if_match_versions(_request('W/"3", "abc"')) == set()
+
+
+@pytest.fixture
+def stored_etude(monkeypatch: pytest.MonkeyPatch) -> Etude:
+    etude = Etude(id=12, version_id=3, nom='Audit CRM', date_debut=date(2026, 2, 1), date_fin=date(2026, 4, 15))
+    monkeypatch.setattr(etude_service, 'get_etude_or_404', lambda _db, _etude_id: etude)
+    return etude
+
+
+def test_get_exposes_version_as_etag(stored_etude: Etude) -> None:
+    response = TestClient(app).get('/etudes/12')
+
+    assert response.headers['etag'] == '"3"'
+    assert response.json()['versionId'] == 3
+
+
+def test_put_with_stale_if_match_is_rejected(stored_etude: Etude) -> None:
+    response = TestClient(app).put('/etudes/12', json={'nom': 'Audit CRM v2'}, headers={'If-Match': '"2"'})
+
+    assert response.status_code == 412
+    assert response.json()['code'] == 'precondition_failed'
+    assert stored_etude.nom == 'Audit CRM'
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core import cache as cache_module
+from app.core.cache import InMemoryCache, etude_cout_total_key
+from app.core.errors import ConflictError, PreconditionFailedError
+from app.repositories import affectations as affectation_repo
+from app.repositories import cost_rollups as cost_rollup_repo
+from app.services import affectations as affectation_service
+from app.services import etudes as etude_service
+from app.services import intervenants as intervenant_service
+
+
+@pytest.fixture
+def staffing(db_session: Session) -> dict:
+    ines = intervenant_service.create_intervenant(
+        db_session,
+        {'nom': 'Ines Martin', 'disponibilite': 'Disponible', 'nb_jours_disponibles': 4, 'tjm': 450},
+    )
+    yanis = intervenant_service.create_intervenant(
+        db_session,
+        {'nom': 'Yanis Diallo', 'disponibilite': 'Occupé', 'nb_jours_disponibles': 1, 'tjm': 500},
+    )
+    etude = etude_service.create_etude(
+        db_session,
+        {'nom': 'Audit CRM', 'date_debut': date(2026, 2, 1), 'date_fin': date(2026, 4, 15)},
+    )
+    return {'ines': ines, 'yanis': yanis, 'etude': etude}
+
+
+def _assert_rollup_matches(db: Session, etude_id: int) -> tuple[float, float]:
+    totals = cost_rollup_repo.get_totals(db, etude_id)
+    assert totals == pytest.approx(affectation_repo.etude_cost_totals(db, etude_id))
+    return totals
+
+
+def test_rollup_follows_affectation_writes_and_tjm_changes(db_session: Session, staffing: dict) -> None:
+    etude_id = staffing['etude'].id
+    first = affectation_service.create_affectation(
+        db_session, {'intervenant_id': staffing['ines'].id, 'etude_id': etude_id, 'jeh': 5, 'phases': []}
+    )
+    affectation_service.create_affectation(
+        db_session, {'intervenant_id': staffing['yanis'].id, 'etude_id': etude_id, 'jeh': 2, 'phases': []}
+    )
+    assert _assert_rollup_matches(db_session, etude_id) == pytest.approx((7, 3250))
+
+    affectation_service.update_affectation(db_session, first.id, {'jeh': 3})
+    assert _assert_rollup_matches(db_session, etude_id) == pytest.approx((5, 2350))
+
+    intervenant_service.update_intervenant(db_session, staffing['yanis'].id, {'tjm': 600})
+    assert _assert_rollup_matches(db_session, etude_id) == pytest.approx((5, 2550))
+
+    intervenant_service.delete_intervenant(db_session, staffing['yanis'].id)
+    assert _assert_rollup_matches(db_session, etude_id) == pytest.approx((3, 1350))
+
+    affectation_service.delete_affectation(db_session, first.id)
+    assert _assert_rollup_matches(db_session, etude_id) == pytest.approx((0, 0))
+
+
+def test_rebuild_recomputes_every_etude(db_session: Session, staffing: dict) -> None:
+    affectation_repo.insert_affectation_if_absent(
+        db_session, {'intervenant_id': staffing['ines'].id, 'etude_id': staffing['etude'].id, 'jeh': 4}
+    )
+
+    cost_rollup_repo.rebuild(db_session)
+
+    assert cost_rollup_repo.get_totals(db_session, staffing['etude'].id) == pytest.approx((4, 1800))
+
+
+def test_link_upsert_is_idempotent_and_applies_jeh_delta(db_session: Session, staffing: dict) -> None:
+    link = {'etude_id': staffing['etude'].id, 'intervenant_id': staffing['ines'].id}
+
+    created, inserted = affectation_service.upsert_affectation_link(
+        db_session, **link, payload={'jeh': 4, 'phases': ['Cadrage']}
+    )
+    assert inserted
+    assert _assert_rollup_matches(db_session, link['etude_id']) == pytest.approx((4, 1800))
+
+    updated, inserted = affectation_service.upsert_affectation_link(
+        db_session, **link, payload={'jeh': 6, 'phases': ['Cadrage', 'Recette']}
+    )
+    assert not inserted
+    assert (updated.id, updated.version_id, updated.phases) == (created.id, 2, ['Cadrage', 'Recette'])
+    assert _assert_rollup_matches(db_session, link['etude_id']) == pytest.approx((6, 2700))
+
+    with pytest.raises(ConflictError):
+        affectation_service.create_affectation(db_session, {**link, 'jeh': 1, 'phases': []})
+
+
+def test_rollup_deltas_lock_intervenant_and_match_live_totals_after_tjm_change(
+    db_session: Session, staffing: dict, recorded_statements: list[str]
+) -> None:
+    etude_id = staffing['etude'].id
+    first = affectation_service.create_affectation(
+        db_session, {'intervenant_id': staffing['ines'].id, 'etude_id': etude_id, 'jeh': 2, 'phases': []}
+    )
+    intervenant_service.update_intervenant(db_session, staffing['ines'].id, {'tjm': 500})
+    affectation_service.update_affectation(db_session, first.id, {'jeh': 3})
+    affectation_service.create_affectation(
+        db_session, {'intervenant_id': staffing['yanis'].id, 'etude_id': etude_id, 'jeh': 1, 'phases': []}
+    )
+
+    assert _assert_rollup_matches(db_session, etude_id) == pytest.approx((4, 2000))
+    rollup_writes = [statement for statement in recorded_statements if 'INTO etude_cost_rollup' in statement]
+    assert len(rollup_writes) == 4
+    assert all('FOR SHARE' in statement for statement in rollup_writes)
+
+
+def test_link_upsert_honors_if_match(db_session: Session, staffing: dict) -> None:
+    link = {'etude_id': staffing['etude'].id, 'intervenant_id': staffing['ines'].id}
+
+    with pytest.raises(PreconditionFailedError):
+        affectation_service.upsert_affectation_link(db_session, **link, payload={'jeh': 4, 'phases': []}, if_match={1})
+    created, _ = affectation_service.upsert_affectation_link(db_session, **link, payload={'jeh': 4, 'phases': []})
+    with pytest.raises(PreconditionFailedError):
+        affectation_service.upsert_affectation_link(db_session, **link, payload={'jeh': 6, 'phases': []}, if_match={2})
+    updated, inserted = affectation_service.upsert_affectation_link(
+        db_session, **link, payload={'jeh': 6, 'phases': []}, if_match={created.version_id}
+    )
+
+    assert not inserted
+    assert (updated.jeh, updated.version_id) == (6, 2)
+    assert _assert_rollup_matches(db_session, link['etude_id']) == pytest.approx((6, 2700))
+
+
+def test_intervenant_delete_invalidates_the_decremented_etudes(
+    db_session: Session, staffing: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    etude_id = staffing['etude'].id
+    affectation_service.create_affectation(
+        db_session, {'intervenant_id': staffing['yanis'].id, 'etude_id': etude_id, 'jeh': 2, 'phases': []}
+    )
+    monkeypatch.setattr(cache_module, 'cache', InMemoryCache())
+    cache_module.cache.set(etude_cout_total_key(etude_id), b'{}', ttl=60)
+
+    intervenant_service.delete_intervenant(db_session, staffing['yanis'].id)
+
+    assert cache_module.cache.get(etude_cout_total_key(etude_id)) is None
+    assert _assert_rollup_matches(db_session, etude_id) == pytest.approx((0, 0))
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import Database, SessionLocal
+
+
+def _echo(db: Session, value: int, *, label: str) -> tuple[Session, int, str]:
+    return db, value, label
+
+
+def test_database_runs_sync_services_with_sync_session() -> None:
+    session = SessionLocal()
+    try:
+        result = asyncio.run(Database(session).run(_echo, 3, label='sync'))
+    finally:
+        session.close()
+
+    assert result == (session, 3, 'sync')
+
+
+def test_database_runs_sync_services_through_async_session() -> None:
+    async def scenario() -> tuple[Session, int, str]:
+        engine = create_async_engine(get_settings().database_url)
+        try:
+            async with AsyncSession(bind=engine) as session:
+                db, value, label = await Database(session).run(_echo, 4, label='async')
+                assert db is session.sync_session
+                return db, value, label
+        finally:
+            await engine.dispose()
+
+    _, value, label = asyncio.run(scenario())
+
+    assert (value, label) == (4, 'async')
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.repositories import disponibilites as disponibilite_repo
+
+
+@pytest.mark.parametrize(
+    ('constraint', 'status_code', 'body'),
+    [
+        (
+            'periodes_disponibilite_intervenant_id_fkey',
+            404,
+            {'message': 'Intervenant introuvable', 'code': 'not_found'},
+        ),
+        (
+            'ex_periodes_disponibilite_overlap',
+            409,
+            {'message': 'Cette periode chevauche une disponibilite existante', 'code': 'conflict'},
+        ),
+    ],
+)
+def test_periode_violations_are_mapped_by_constraint(
+    constraint: str, status_code: int, body: dict, violation, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def create_periode(_db, _intervenant_id, _date_debut, _date_fin):
+        raise violation(constraint)
+
+    monkeypatch.setattr(disponibilite_repo, 'create_periode', create_periode)
+
+    response = TestClient(app).post(
+        '/intervenants/7/disponibilites', json={'dateDebut': '2026-03-01', 'dateFin': '2026-03-10'}
+    )
+
+    assert response.status_code == status_code
+    assert response.json() == body
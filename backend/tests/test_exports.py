@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+
+import pytest
+
+from app.core.errors import BusinessRuleError
+from app.models import DisponibiliteEnum
+from app.services import exports as export_service
+
+HEADER = ['id', 'nom', 'competences', 'disponibilite', 'dateDebut']
+BATCHES = [
+    [(1, 'Ines, Martin', ['React', 'SQL'], DisponibiliteEnum.occupe, date(2026, 2, 1))],
+    [(2, 'Hugo', [], DisponibiliteEnum.disponible, None)],
+]
+
+
+def test_csv_export_yields_one_chunk_per_batch() -> None:
+    chunks = list(export_service.encode_csv(HEADER, BATCHES))
+
+    assert len(chunks) == 2
+    assert b''.join(chunks).decode() == (
+        'id,nom,competences,disponibilite,dateDebut\n'
+        '1,"Ines, Martin",React|SQL,Occupé,2026-02-01\n'
+        '2,Hugo,,Disponible,\n'
+    )
+
+
+def test_csv_export_of_empty_table_keeps_header() -> None:
+    assert b''.join(export_service.encode_csv(HEADER, [])) == b'id,nom,competences,disponibilite,dateDebut\n'
+
+
+def test_ndjson_export_writes_one_object_per_line() -> None:
+    lines = b''.join(export_service.encode_ndjson(HEADER, BATCHES)).decode().splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        {
+            'id': 1,
+            'nom': 'Ines, Martin',
+            'competences': ['React', 'SQL'],
+            'disponibilite': 'Occupé',
+            'dateDebut': '2026-02-01',
+        },
+        {'id': 2, 'nom': 'Hugo', 'competences': [], 'disponibilite': 'Disponible', 'dateDebut': None},
+    ]
+
+
+def test_filters_are_only_accepted_for_intervenants() -> None:
+    assert export_service.export_filters('intervenants', competence=' React ') == {'competence': 'react'}
+    assert export_service.export_filters('etudes', search='  ') == {}
+    with pytest.raises(BusinessRuleError):
+        export_service.export_filters('affectations', search='audit')
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+from collections import namedtuple
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.api.fast_json import RowSerializer, json_response
+from app.core.pagination import build_page
+from app.models import Affectation, DisponibiliteEnum, Etude, Intervenant
+from app.schemas.affectation import AffectationRead
+from app.schemas.common import CursorPage
+from app.schemas.etude import EtudeRead
+from app.schemas.intervenant import IntervenantRead
+
+INTERVENANTS = [
+    {
+        'id': 2,
+        'version_id': 3,
+        'nom': 'Yanis Diallo',
+        'email': None,
+        'telephone': '0605060708',
+        'competences': ['Python', 'SQL'],
+        'disponibilite': DisponibiliteEnum.occupe,
+        'nb_jours_disponibles': 1,
+        'tjm': 520.0,
+    },
+    {
+        'id': 1,
+        'version_id': 1,
+        'nom': 'Ines "Martin"',
+        'email': 'ines.martin@example.org',
+        'telephone': None,
+        'competences': [],
+        'disponibilite': DisponibiliteEnum.disponible,
+        'nb_jours_disponibles': 4,
+        'tjm': 450.5,
+    },
+]
+ETUDES = [
+    {
+        'id': 3,
+        'version_id': 1,
+        'nom': 'Audit CRM',
+        'description': 'Refonte du suivi client é',
+        'date_debut': date(2026, 2, 1),
+        'date_fin': date(2026, 4, 15),
+    },
+    {
+        'id': 1,
+        'version_id': 2,
+        'nom': 'BI',
+        'description': None,
+        'date_debut': date(2025, 12, 1),
+        'date_fin': date(2026, 2, 5),
+    },
+]
+AFFECTATIONS = [
+    {'id': 5, 'version_id': 2, 'intervenant_id': 2, 'etude_id': 3, 'jeh': 2.5, 'phases': ['Cadrage', 'Recette']},
+    {'id': 4, 'version_id': 1, 'intervenant_id': 1, 'etude_id': 3, 'jeh': 4.0, 'phases': []},
+]
+CASES = [
+    (IntervenantRead, Intervenant, INTERVENANTS),
+    (EtudeRead, Etude, ETUDES),
+    (AffectationRead, Affectation, AFFECTATIONS),
+]
+
+
+def _client(schema, model, values: list[dict]) -> TestClient:
+    serializer = RowSerializer(schema, model)
+    row_type = namedtuple('Row', [column.key for column in serializer.columns])
+    rows = [row_type(**{column.key: item[column.key] for column in serializer.columns}) for item in values]
+    app = FastAPI()
+
+    @app.get('/orm', response_model=list[schema] | CursorPage[schema])
+    def orm(paged: bool = False):
+        objects = [model(**item) for item in values]
+        if paged:
+            page = build_page(objects, 1)
+            return CursorPage[schema](items=page.items, next_cursor=page.next_cursor)
+        return objects
+
+    @app.get('/rows', response_model=list[schema] | CursorPage[schema])
+    async def fast(paged: bool = False):
+        if paged:
+            return await serializer.page_response(build_page(rows, 1))
+        return await serializer.response(rows)
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(('schema', 'model', 'values'), CASES, ids=['intervenants', 'etudes', 'affectations'])
+@pytest.mark.parametrize('paged', [False, True])
+def test_row_serialization_is_byte_identical_to_schema_validation(schema, model, values, paged: bool) -> None:
+    client = _client(schema, model, values)
+
+    expected = client.get('/orm', params={'paged': paged})
+    actual = client.get('/rows', params={'paged': paged})
+
+    assert actual.content == expected.content
+    assert actual.headers['content-type'] == expected.headers['content-type']
+
+
+def test_json_response_builds_and_validates_off_the_event_loop() -> None:
+    threads = {}
+    app = FastAPI()
+
+    @app.get('/intervenants', response_model=list[IntervenantRead])
+    async def intervenants():
+        threads['endpoint'] = threading.get_ident()
+
+        def build() -> list[dict]:
+            threads['build'] = threading.get_ident()
+            return INTERVENANTS
+
+        return await json_response(TypeAdapter(list[IntervenantRead]), build)
+
+    response = TestClient(app).get('/intervenants')
+
+    assert response.json()[0]['nbJoursDisponibles'] == 1
+    assert threads['build'] != threads['endpoint']
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.errors import BusinessRuleError
+from app.repositories import intervenants as intervenant_repo
+from app.schemas.intervenant import IntervenantImportResult
+from app.services import imports as import_service
+from app.services import intervenants as intervenant_service
+
+CSV = (
+    'nom,email,telephone,competences,tjm,disponibilite,nbJoursDisponibles\n'
+    'Ines Martin,ines@example.org,,React|SQL,450,Disponible,4\n'
+    'Sans Tjm,sans@example.org,,,,Disponible,2\n'
+    'Ines Bis,Ines@Example.org,,,500,Disponible,3\n'
+    'Hugo Petit,,0600000000, Python ,380,Occupé,1\n'
+    'Lea Garnier,lea@example.org,,,410,Disponible,3\n'
+).encode()
+
+
+def test_rows_are_validated_and_duplicate_or_missing_emails_rejected() -> None:
+    report = import_service.ImportReport()
+
+    rows = import_service.read_intervenant_rows(CSV, report)
+
+    assert rows == [
+        ('Ines Martin', 'ines@example.org', None, ['React', 'SQL'], 'Disponible', 4, 450.0),
+        ('Lea Garnier', 'lea@example.org', None, [], 'Disponible', 3, 410.0),
+    ]
+    assert report.received == 5
+    assert [(error.line, error.message.split(':')[0]) for error in report.errors] == [
+        (3, 'tjm'),
+        (4, 'Email deja present ligne 2'),
+        (5, 'email'),
+    ]
+
+
+def test_missing_required_columns_are_reported() -> None:
+    with pytest.raises(BusinessRuleError, match='nbJoursDisponibles'):
+        import_service.read_intervenant_rows(
+            b'nom,tjm,disponibilite\nInes,450,Disponible\n', import_service.ImportReport()
+        )
+
+
+def test_report_serializes_throughput() -> None:
+    report = import_service.ImportReport(received=2000, inserted=2000, duration_ms=500.0)
+
+    payload = IntervenantImportResult.model_validate(report).model_dump(by_alias=True)
+
+    assert payload['rowsPerSecond'] == 4000.0
+    assert payload['errors'] == []
+
+
+def test_import_upserts_on_email(db_session: Session) -> None:
+    existing = intervenant_service.create_intervenant(
+        db_session,
+        {
+            'nom': 'Ines',
+            'email': 'INES@example.org',
+            'disponibilite': 'Disponible',
+            'nb_jours_disponibles': 2,
+            'tjm': 400,
+        },
+    )
+
+    report = import_service.import_intervenants(db_session, CSV)
+
+    assert (report.inserted, report.updated, report.unchanged, len(report.errors)) == (1, 1, 0, 3)
+    db_session.expire_all()
+    assert intervenant_repo.get_intervenant(db_session, existing.id).tjm == 450
+
+    again = import_service.import_intervenants(db_session, CSV)
+
+    assert (again.inserted, again.updated, again.unchanged) == (0, 0, 2)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories import intervenants as intervenant_repo
+
+
+def _compile(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+
+
+def test_contains_pattern_escapes_like_wildcards() -> None:
+    assert intervenant_repo._contains_pattern('react') == '%react%'
+    assert intervenant_repo._contains_pattern('100%_sql\\') == '%100\\%\\_sql\\\\%'
+
+
+def test_search_filter_uses_indexed_search_expression() -> None:
+    executed = []
+
+    class RecordingSession:
+        def scalars(self, stmt):
+            executed.append(_compile(stmt))
+            return []
+
+    intervenant_repo.list_intervenants(RecordingSession(), search='ines', limit=20)
+
+    sql = executed[0]
+    search_text = 'intervenant_search_text(intervenants.nom, intervenants.disponibilite, intervenants.competences)'
+    assert f'WHERE {search_text} LIKE' in sql
+    assert "ESCAPE '\\'" in sql
+
+
+def test_ranked_search_uses_generated_document_and_name_trigrams() -> None:
+    executed = []
+
+    class RecordingSession:
+        def execute(self, stmt):
+            executed.append(_compile(stmt))
+            return []
+
+    intervenant_repo.search_intervenants(RecordingSession(), 'developpeur python', limit=5)
+
+    sql = executed[0]
+    assert "intervenants.search_document @@ websearch_to_tsquery('french_unaccent'::regconfig" in sql
+    assert 'intervenant_name_key(intervenants.nom) %' in sql
+    assert 'ORDER BY score DESC' in sql
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core.cache import InMemoryCache
+from app.core.metrics import RequestMetrics
+from app.core.prometheus import render_cache, render_requests
+from app.main import app
+
+
+def test_request_metrics_render_counters_and_histograms() -> None:
+    metrics = RequestMetrics()
+    metrics.observe('GET', '/etudes/{etude_id}/cout-total', 200, 0.003)
+    metrics.observe('GET', '/etudes/{etude_id}/cout-total', 404, 0.02)
+    metrics.count_error('not_found')
+
+    lines = render_requests(metrics)
+
+    labels = 'method="GET",route="/etudes/{etude_id}/cout-total"'
+    assert f'http_requests_total{{{labels},status="404"}} 1' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in lines
+    assert f'http_request_duration_seconds_count{{{labels}}} 2' in lines
+    assert 'app_errors_total{code="not_found"} 1' in lines
+    assert 'http_requests_in_flight 0' in lines
+
+
+def test_cache_hit_ratio() -> None:
+    backend = InMemoryCache()
+    backend.set('k', b'v', ttl=60)
+    backend.get('k')
+    backend.get('k')
+    backend.get('absent')
+
+    lines = render_cache(backend)
+
+    assert 'cache_hits_total 2' in lines
+    assert 'cache_hit_ratio 0.6666666666666666' in lines
+
+
+def test_metrics_endpoint_uses_route_templates_and_counts_app_errors() -> None:
+    client = TestClient(app)
+    client.get('/exports/etudes.csv', params={'search': 'audit'})
+    client.get('/introuvable/123')
+
+    response = client.get('/metrics')
+
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    body = response.text
+    assert 'route="/exports/{resource}.{export_format}",status="400"' in body
+    assert 'route="unmatched",status="404"' in body
+    assert 'app_errors_total{code="business_rule"}' in body
+    assert 'db_pool_checked_out{pool="sync"} 0' in body
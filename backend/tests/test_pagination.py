@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.errors import BusinessRuleError
+from app.core.pagination import build_page, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    cursor = encode_cursor(42)
+
+    assert '42' not in cursor
+    assert decode_cursor(cursor) == 42
+
+
+@pytest.mark.parametrize('cursor', ['', 'not-a-cursor', encode_cursor(0), 'aWQ6YWJj'])
+def test_decode_cursor_rejects_invalid_values(cursor: str) -> None:
+    with pytest.raises(BusinessRuleError):
+        decode_cursor(cursor)
+
+
+def test_build_page_sets_next_cursor_only_when_more_rows_exist() -> None:
+    rows = [SimpleNamespace(id=value) for value in (9, 8, 7)]
+
+    page = build_page(rows, limit=2)
+    last_page = build_page(rows, limit=3)
+
+    assert [item.id for item in page.items] == [9, 8]
+    assert decode_cursor(page.next_cursor) == 8
+    assert len(last_page.items) == 3
+    assert last_page.next_cursor is None
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.metrics import Histogram
+from app.core.pool import InstrumentedQueuePool, instrument_pool, pool_metrics
+
+
+def test_histogram_snapshot_is_cumulative() -> None:
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot['buckets'] == [(0.1, 2), (1.0, 3)]
+    assert snapshot['count'] == 4
+    assert snapshot['sum'] == pytest.approx(2.65)
+
+
+def test_instrumented_pool_reports_checkouts_waits_and_timeouts() -> None:
+    engine = create_engine('sqlite://', poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01)
+    metrics = instrument_pool(engine.pool, 'test')
+
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+        assert metrics.snapshot()['checked_out'] == 1
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    snapshot = metrics.snapshot()
+    assert snapshot['checked_out'] == 0
+    assert snapshot['connections_created'] == 1
+    assert snapshot['checkouts'] == 1
+    assert snapshot['timeouts'] == 1
+    assert snapshot['wait_seconds']['count'] == 2
+
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert metrics.snapshot()['checkouts'] == 2
+    pool_metrics.pop('test')
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.config import get_settings
+from app.core.query_stats import QueryStats, current_query_stats, instrument_queries
+from app.main import app
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    instrument_queries(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_queries_are_counted_in_the_current_request(engine) -> None:
+    stats = QueryStats(scope={'path': '/etudes/1'})
+    token = current_query_stats.set(stats)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+            connection.execute(text('SELECT 2'))
+    finally:
+        current_query_stats.reset(token)
+
+    assert stats.count == 2
+    assert stats.duration > 0
+
+
+def test_failed_queries_do_not_leak_timers(engine) -> None:
+    with engine.connect() as connection:
+        with pytest.raises(Exception):
+            connection.execute(text('SELECT * FROM missing'))
+        connection.execute(text('SELECT 1'))
+        assert connection.info['query_started'] == []
+
+
+def test_slow_queries_are_logged_with_their_route(engine, monkeypatch, caplog) -> None:
+    monkeypatch.setattr(get_settings(), 'slow_query_threshold_ms', 0.0)
+    token = current_query_stats.set(QueryStats(scope={'path': '/etudes/1/detail'}))
+    try:
+        with caplog.at_level(logging.WARNING, logger='app.sql'), engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+    finally:
+        current_query_stats.reset(token)
+
+    assert caplog.records[0].route == '/etudes/1/detail'
+    assert caplog.records[0].statement == 'SELECT 1'
+
+
+def test_responses_carry_server_timing_and_route_template(caplog) -> None:
+    with caplog.at_level(logging.INFO, logger='app.sql'):
+        response = TestClient(app).get('/health')
+
+    assert response.headers['server-timing'].startswith('db;dur=0.00;desc="0 queries", app;dur=')
+    record = next(record for record in caplog.records if record.getMessage().startswith('request '))
+    assert (record.route, record.status, record.queries) == ('/health', 200, 0)
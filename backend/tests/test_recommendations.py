@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+
+from app.models import DisponibiliteEnum
+from app.repositories import intervenants as intervenant_repo
+from app.services import recommendations
+from app.services.recommendations import CompetenceIndex, rank_intervenants
+
+ROWS = [
+    (1, 'Ines', ['React', 'SQL'], DisponibiliteEnum.disponible, 5, 400.0),
+    (2, 'Hugo', ['react'], DisponibiliteEnum.occupe, 2, 300.0),
+    (3, 'Lea', ['Python'], DisponibiliteEnum.disponible, 7, 350.0),
+    (4, 'Marc', ['SQL', 'react'], DisponibiliteEnum.indisponible, 0, 900.0),
+]
+
+
+def _rank(**kwargs):
+    options = {
+        'competences': ['react', 'sql'],
+        'budget': None,
+        'charges': {},
+        'semaines': 1.0,
+        'excluded_ids': set(),
+        'limit': 10,
+    }
+    options.update(kwargs)
+    return rank_intervenants(CompetenceIndex.build(ROWS), **options)
+
+
+def test_index_postings_are_case_insensitive() -> None:
+    index = CompetenceIndex.build(ROWS)
+
+    assert index.postings['react'] == [0, 1, 3]
+    assert index.postings['sql'] == [0, 3]
+    assert index.disponibilites[1] is DisponibiliteEnum.occupe
+
+
+def test_only_matching_intervenants_are_ranked_best_first() -> None:
+    ranked = _rank()
+
+    assert [item.intervenant_id for item in ranked] == [1, 2, 4]
+    assert ranked[0].competences_matchees == ['React', 'SQL']
+    assert ranked[0].score == 0.9571
+
+
+def test_budget_load_exclusion_and_limit() -> None:
+    ranked = _rank(budget=450.0, charges={1: 5.0}, excluded_ids={2}, limit=1)
+
+    assert [item.intervenant_id for item in ranked] == [1]
+    assert ranked[0].charge_jeh == 5.0
+    assert ranked[0].score == 0.8571
+
+
+def test_no_competence_ranks_everyone() -> None:
+    ranked = _rank(competences=[], limit=2)
+
+    assert [item.intervenant_id for item in ranked] == [3, 1]
+
+
+def test_index_invalidated_during_rebuild_is_not_installed(monkeypatch: pytest.MonkeyPatch) -> None:
+    loads = []
+
+    def list_recommendation_rows(_db):
+        loads.append(len(loads))
+        if len(loads) == 1:
+            recommendations.invalidate_competence_index()
+        return ROWS
+
+    monkeypatch.setattr(intervenant_repo, 'list_recommendation_rows', list_recommendation_rows)
+    recommendations.invalidate_competence_index()
+
+    first = recommendations.get_competence_index(None)
+    second = recommendations.get_competence_index(None)
+    third = recommendations.get_competence_index(None)
+
+    assert first.ids == [1, 2, 3, 4]
+    assert second is third
+    assert loads == [0, 1]
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.errors import PreconditionFailedError
+from app.models import DisponibiliteEnum
+from app.repositories import affectations as affectation_repo
+from app.repositories import disponibilites as disponibilite_repo
+from app.repositories import etudes as etude_repo
+from app.repositories import intervenants as intervenant_repo
+from app.schemas.etude import EtudeDetail
+from app.services import etudes as etude_service
+
+
+def test_create_intervenant_is_a_single_insert_returning(db_session: Session, recorded_statements: list[str]) -> None:
+    intervenant = intervenant_repo.create_intervenant(
+        db_session,
+        {
+            'nom': 'Ines Martin',
+            'competences': ['React'],
+            'disponibilite': DisponibiliteEnum.disponible,
+            'nb_jours_disponibles': 4,
+            'tjm': 450,
+        },
+    )
+
+    assert intervenant.created_at is not None
+    assert intervenant.updated_at is not None
+    assert len(recorded_statements) == 1
+    assert recorded_statements[0].startswith('INSERT INTO intervenants')
+    assert 'RETURNING' in recorded_statements[0]
+
+
+def test_update_etude_is_a_single_update_returning(db_session: Session, recorded_statements: list[str]) -> None:
+    etude = etude_repo.create_etude(
+        db_session,
+        {'nom': 'Audit CRM', 'date_debut': date(2026, 2, 1), 'date_fin': date(2026, 4, 15)},
+    )
+    recorded_statements.clear()
+
+    updated = etude_repo.update_etude(db_session, etude, {'nom': 'Audit CRM v2'})
+
+    assert updated.updated_at is not None
+    assert updated.version_id == 2
+    assert len(recorded_statements) == 1
+    assert recorded_statements[0].startswith('UPDATE etudes')
+    assert 'RETURNING' in recorded_statements[0]
+
+
+def test_insert_affectation_is_a_single_insert_returning(db_session: Session, recorded_statements: list[str]) -> None:
+    intervenant = intervenant_repo.create_intervenant(
+        db_session,
+        {'nom': 'Yanis Diallo', 'disponibilite': DisponibiliteEnum.occupe, 'nb_jours_disponibles': 1, 'tjm': 520},
+    )
+    etude = etude_repo.create_etude(
+        db_session,
+        {'nom': 'BI Finance', 'date_debut': date(2026, 2, 15), 'date_fin': date(2026, 5, 31)},
+    )
+    recorded_statements.clear()
+
+    affectation = affectation_repo.insert_affectation_if_absent(
+        db_session,
+        {'intervenant_id': intervenant.id, 'etude_id': etude.id, 'jeh': 4, 'phases': ['API']},
+    )
+
+    assert affectation.created_at is not None
+    assert len(recorded_statements) == 1
+    assert recorded_statements[0].startswith('INSERT INTO affectations')
+
+
+def test_portfolio_cost_totals_aggregates_every_etude_in_one_query(
+    db_session: Session, recorded_statements: list[str]
+) -> None:
+    intervenant = intervenant_repo.create_intervenant(
+        db_session,
+        {'nom': 'Clara Moreau', 'disponibilite': DisponibiliteEnum.disponible, 'nb_jours_disponibles': 3, 'tjm': 400},
+    )
+    staffed = etude_repo.create_etude(
+        db_session,
+        {'nom': 'Portail Alumni', 'date_debut': date(2026, 3, 10), 'date_fin': date(2026, 5, 10)},
+    )
+    empty = etude_repo.create_etude(
+        db_session,
+        {'nom': 'Refonte Intranet', 'date_debut': date(2025, 12, 1), 'date_fin': date(2026, 2, 5)},
+    )
+    affectation_repo.insert_affectation_if_absent(
+        db_session,
+        {'intervenant_id': intervenant.id, 'etude_id': staffed.id, 'jeh': 2.5},
+    )
+    recorded_statements.clear()
+
+    totals = affectation_repo.portfolio_cost_totals(db_session, etude_ids=[staffed.id, empty.id])
+    in_march = affectation_repo.portfolio_cost_totals(
+        db_session, etude_ids=[staffed.id, empty.id], date_debut=date(2026, 3, 1), date_fin=date(2026, 3, 31)
+    )
+
+    assert totals == [(empty.id, 0.0, 0.0), (staffed.id, 2.5, 1000.0)]
+    assert in_march == [(staffed.id, 2.5, 1000.0)]
+    assert len(recorded_statements) == 2
+
+
+def test_etude_detail_loads_affectations_and_intervenants_in_two_queries(
+    db_session: Session, recorded_statements: list[str]
+) -> None:
+    etude = etude_repo.create_etude(
+        db_session,
+        {'nom': 'Audit SI', 'date_debut': date(2026, 1, 5), 'date_fin': date(2026, 2, 20)},
+    )
+    for index, tjm in enumerate((300, 450, 500)):
+        intervenant = intervenant_repo.create_intervenant(
+            db_session,
+            {
+                'nom': f'Intervenant {index}',
+                'disponibilite': DisponibiliteEnum.disponible,
+                'nb_jours_disponibles': 2,
+                'tjm': tjm,
+            },
+        )
+        affectation_repo.insert_affectation_if_absent(
+            db_session,
+            {'intervenant_id': intervenant.id, 'etude_id': etude.id, 'jeh': 2},
+        )
+    recorded_statements.clear()
+
+    detail = EtudeDetail.model_validate(etude_repo.get_etude_with_affectations(db_session, etude.id))
+
+    assert [ligne.cout for ligne in detail.affectations] == [600.0, 900.0, 1000.0]
+    assert (detail.total_jeh, detail.cout_total) == (6.0, 2500.0)
+    assert len(recorded_statements) == 2
+
+
+def test_search_ranks_accent_insensitive_matches_with_highlights(db_session: Session) -> None:
+    for nom, competences in (('Hélène Durand', ['Python', 'Développement web']), ('Marc Petit', ['Excel'])):
+        intervenant_repo.create_intervenant(
+            db_session,
+            {
+                'nom': nom,
+                'competences': competences,
+                'disponibilite': DisponibiliteEnum.disponible,
+                'nb_jours_disponibles': 3,
+                'tjm': 400,
+            },
+        )
+
+    by_competence = intervenant_repo.search_intervenants(db_session, 'developpement', limit=10)
+    by_fuzzy_name = intervenant_repo.search_intervenants(db_session, 'helene durant', limit=10)
+
+    assert [intervenant.nom for intervenant, _, _ in by_competence] == ['Hélène Durand']
+    assert '<mark>Développement</mark>' in by_competence[0][2]
+    assert by_fuzzy_name[0][0].nom == 'Hélène Durand'
+
+
+def test_free_days_counts_calendar_overlap_inside_etude_window(
+    db_session: Session, recorded_statements: list[str]
+) -> None:
+    etude = etude_repo.create_etude(
+        db_session,
+        {'nom': 'Dashboard RH', 'date_debut': date(2026, 3, 2), 'date_fin': date(2026, 3, 13)},
+    )
+    intervenants = [
+        intervenant_repo.create_intervenant(
+            db_session,
+            {'nom': nom, 'disponibilite': DisponibiliteEnum.disponible, 'nb_jours_disponibles': 5, 'tjm': 400},
+        )
+        for nom in ('Lea Garnier', 'Hugo Perrin', 'Ines Martin')
+    ]
+    lea, hugo, ines = intervenants
+    disponibilite_repo.create_periode(db_session, lea.id, date(2026, 2, 25), date(2026, 3, 4))
+    disponibilite_repo.create_periode(db_session, lea.id, date(2026, 3, 10), date(2026, 3, 20))
+    disponibilite_repo.create_periode(db_session, hugo.id, date(2026, 3, 5), date(2026, 3, 6))
+    disponibilite_repo.create_periode(db_session, ines.id, date(2026, 4, 1), date(2026, 4, 30))
+    recorded_statements.clear()
+
+    totals = disponibilite_repo.free_days_by_etude(db_session, min_jours=2, etude_ids=[etude.id])
+    free = disponibilite_repo.free_intervenants_for_etude(db_session, etude.id, min_jours=3)
+
+    assert totals == [(etude.id, lea.id, 7), (etude.id, hugo.id, 2)]
+    assert [(intervenant.nom, jours) for intervenant, jours in free] == [('Lea Garnier', 7)]
+    assert len(recorded_statements) == 2
+
+
+def test_overlapping_periodes_are_rejected_by_exclusion_constraint(db_session: Session) -> None:
+    intervenant = intervenant_repo.create_intervenant(
+        db_session,
+        {'nom': 'Mehdi Khelifi', 'disponibilite': DisponibiliteEnum.disponible, 'nb_jours_disponibles': 5, 'tjm': 600},
+    )
+    disponibilite_repo.create_periode(db_session, intervenant.id, date(2026, 3, 1), date(2026, 3, 10))
+
+    with pytest.raises(IntegrityError):
+        disponibilite_repo.create_periode(db_session, intervenant.id, date(2026, 3, 10), date(2026, 3, 12))
+
+
+def test_update_etude_rejects_write_based_on_stale_version(db_session: Session) -> None:
+    etude = etude_repo.create_etude(
+        db_session,
+        {'nom': 'Audit CRM', 'date_debut': date(2026, 2, 1), 'date_fin': date(2026, 4, 15)},
+    )
+    db_session.execute(text('UPDATE etudes SET version_id = version_id + 1 WHERE id = :id'), {'id': etude.id})
+
+    with pytest.raises(PreconditionFailedError):
+        etude_service.update_etude(db_session, etude.id, {'nom': 'Audit CRM v2'})
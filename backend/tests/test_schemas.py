@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from datetime import date
+
 import pytest
 from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import Range
 
-from app.schemas.etude import EtudeCreate
+from app.models import PeriodeDisponibilite
+from app.schemas.disponibilite import PeriodeDisponibiliteCreate, PeriodeDisponibiliteRead
+from app.schemas.etude import EtudeCreate, EtudeDetail
 from app.schemas.intervenant import IntervenantCreate
 
 
@@ -45,3 +50,52 @@ def test_etude_create_rejects_invalid_date_range() -> None:
             dateDebut='2026-03-10',
             dateFin='2026-03-01',
         )
+
+
+def test_etude_detail_serializes_line_costs_and_totals() -> None:
+    detail = EtudeDetail(
+        id=1,
+        versionId=2,
+        nom='Audit SI',
+        dateDebut='2026-01-05',
+        dateFin='2026-02-20',
+        affectations=[
+            {
+                'id': 7,
+                'versionId': 1,
+                'intervenantId': 3,
+                'etudeId': 1,
+                'jeh': 2.5,
+                'intervenant': {
+                    'id': 3,
+                    'versionId': 5,
+                    'nom': 'Ines Martin',
+                    'tjm': 450,
+                    'disponibilite': 'Disponible',
+                    'nbJoursDisponibles': 4,
+                },
+            }
+        ],
+    )
+
+    payload = detail.model_dump(by_alias=True)
+
+    assert payload['affectations'][0]['cout'] == 1125.0
+    assert (payload['totalJeh'], payload['coutTotal'], payload['devise']) == (2.5, 1125.0, 'EUR')
+
+
+def test_periode_disponibilite_rejects_invalid_date_range() -> None:
+    with pytest.raises(ValidationError):
+        PeriodeDisponibiliteCreate(dateDebut='2026-03-10', dateFin='2026-03-09')
+
+
+def test_periode_disponibilite_read_exposes_inclusive_end_date() -> None:
+    periode = PeriodeDisponibilite(
+        id=3,
+        intervenant_id=7,
+        periode=Range(date(2026, 3, 2), date(2026, 3, 7), bounds='[)'),
+    )
+
+    payload = PeriodeDisponibiliteRead.model_validate(periode).model_dump(by_alias=True, mode='json')
+
+    assert payload == {'dateDebut': '2026-03-02', 'dateFin': '2026-03-06', 'id': 3, 'intervenantId': 7}
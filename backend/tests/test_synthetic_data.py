@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import random
+
+from sqlalchemy.orm import Session
+
+from app.repositories import changes as change_repo
+from app.schemas.intervenant import IntervenantCreate
+from app.synthetic_data import (
+    INTERVENANT_COLUMNS,
+    generate_affectations,
+    generate_etudes,
+    generate_intervenants,
+    seed_synthetic,
+)
+
+
+def test_generation_is_deterministic_for_a_seed() -> None:
+    first = list(generate_intervenants(random.Random(42), range(1, 51)))
+    second = list(generate_intervenants(random.Random(42), range(1, 51)))
+
+    assert first == second
+    assert first != list(generate_intervenants(random.Random(7), range(1, 51)))
+
+
+def test_generated_intervenants_pass_api_validation() -> None:
+    rows = list(generate_intervenants(random.Random(1), range(1, 501)))
+
+    for row in rows:
+        values = dict(zip(INTERVENANT_COLUMNS, row))
+        values.pop('id')
+        IntervenantCreate.model_validate(values)
+    assert len({row[2] for row in rows}) == len(rows)
+
+
+def test_generated_etudes_and_affectations_respect_constraints() -> None:
+    rng = random.Random(3)
+    etudes = list(generate_etudes(rng, range(1, 101)))
+    affectations = list(generate_affectations(rng, [etude[0] for etude in etudes], list(range(1, 21)), 5))
+
+    assert all(etude[4] >= etude[3] for etude in etudes)
+    assert len(affectations) == 500
+    assert len({(row[0], row[1]) for row in affectations}) == 500
+    assert all(row[2] > 0 for row in affectations)
+
+
+def test_reset_seed_restarts_the_change_log_with_the_seeded_rows(db_session: Session) -> None:
+    seed_synthetic(db_session, intervenants=5, etudes=2, affectations_per_etude=2, seed=1)
+
+    counts = seed_synthetic(db_session, intervenants=4, etudes=3, affectations_per_etude=2, seed=2, reset=True)
+
+    changes = change_repo.list_changes(db_session, since=0, limit=100)
+    assert [change.seq for change in changes] == list(range(1, len(changes) + 1))
+    assert [(change.entity, change.operation) for change in changes] == (
+        [('intervenant', 'insert')] * counts['intervenants']
+        + [('etude', 'insert')] * counts['etudes']
+        + [('affectation', 'insert')] * counts['affectations']
+    )
+    assert [change.entity_id for change in changes[:7]] == [1, 2, 3, 4, 1, 2, 3]